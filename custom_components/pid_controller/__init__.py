@@ -2,11 +2,94 @@
 
 from typing import TYPE_CHECKING
 
-from .const import PLATFORMS
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.components.number import ATTR_VALUE
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ENTITY_MATCH_ALL,
+    EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+
+from .const import (
+    ATTR_ENABLE,
+    DATA_ENTITIES,
+    DATA_GOVERNOR,
+    DATA_HASS_CONFIG,
+    DOMAIN,
+    PLATFORMS,
+    SERVICE_BULK_UPDATE,
+)
+from .governor import LoadGovernor
+from .pid_shared.const import CONF_PID_KD, CONF_PID_KI, CONF_PID_KP
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import Event, HomeAssistant, ServiceCall
+    from homeassistant.helpers.typing import ConfigType
+
+CONFIG_SCHEMA = cv.platform_only_config_schema(DOMAIN)
+
+BULK_UPDATE_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            vol.Optional(CONF_PID_KP): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_PID_KI): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_PID_KD): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(ATTR_VALUE): vol.Coerce(float),
+            vol.Optional(ATTR_ENABLE): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key(
+        CONF_PID_KP, CONF_PID_KI, CONF_PID_KD, ATTR_VALUE, ATTR_ENABLE
+    ),
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the domain services of the PID Controller."""
+    hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ENTITIES, {})
+    # For the sensors of controllers set up from YAML
+    hass.data[DOMAIN][DATA_HASS_CONFIG] = config
+    governor = hass.data[DOMAIN].setdefault(DATA_GOVERNOR, LoadGovernor())
+    governor.start(hass.loop)
+
+    @callback
+    def _stop_governor(_event: Event) -> None:
+        """Stop probing the event loop when Home Assistant stops."""
+        governor.stop()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _stop_governor)
+
+    async def _async_bulk_update(call: ServiceCall) -> None:
+        """Update many controllers in one pass, one state write per controller."""
+        entities = hass.data[DOMAIN][DATA_ENTITIES]
+        if call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL:
+            targets = list(entities.values())
+        else:
+            selected = async_extract_referenced_entity_ids(hass, call)
+            if unknown := sorted(selected.referenced - entities.keys()):
+                msg = f"No PID controllers: {', '.join(unknown)}"
+                raise ServiceValidationError(msg)
+            # Areas and devices also hold other entities, e.g. the sensors
+            targets = [
+                entities[eid]
+                for eid in sorted(selected.referenced | selected.indirectly_referenced)
+                if eid in entities
+            ]
+        # Validate all targets first, so an update is applied to all or none
+        for entity in targets:
+            entity.validate_bulk_update(call.data)
+        for entity in targets:
+            await entity.async_bulk_update(call.data)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BULK_UPDATE, _async_bulk_update, schema=BULK_UPDATE_SCHEMA
+    )
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
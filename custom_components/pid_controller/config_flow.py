@@ -17,28 +17,48 @@ from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.const import CONF_MAXIMUM, CONF_MINIMUM, CONF_MODE, CONF_NAME
 from homeassistant.helpers import selector
 from homeassistant.helpers.schema_config_entry_flow import (
+    SchemaCommonFlowHandler,
     SchemaConfigFlowHandler,
+    SchemaFlowError,
     SchemaFlowFormStep,
 )
 
 from .const import (
+    CONF_DERIVATIVE_FILTER,
+    CONF_DERIVATIVE_ON,
     CONF_INPUT1,
     CONF_INPUT2,
     CONF_OUTPUT,
     CONF_PID_DIR,
+    CONF_PRESETS,
+    CONF_PRIORITY,
+    CONF_SETPOINT_RAMP_RATE,
+    CONF_SETPOINT_WEIGHT_D,
+    CONF_SETPOINT_WEIGHT_P,
     CONF_STEP,
     DEFAULT_CYCLE_TIME,
+    DEFAULT_DERIVATIVE_FILTER,
+    DEFAULT_DERIVATIVE_ON,
     DEFAULT_MODE,
     DEFAULT_PID_DIR,
     DEFAULT_PID_KD,
     DEFAULT_PID_KI,
     DEFAULT_PID_KP,
+    DEFAULT_PRIORITY,
+    DEFAULT_SETPOINT_RAMP_RATE,
+    DEFAULT_SETPOINT_WEIGHT_P,
+    DERIVATIVE_ON_ERROR,
+    DERIVATIVE_ON_MEASUREMENT,
     DOMAIN,
     MODE_AUTO,
     MODE_BOX,
     MODE_SLIDER,
     PID_DIR_DIRECT,
     PID_DIR_REVERSE,
+    PRIORITY_CRITICAL,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
 )
 from .pid_shared.const import (
     CONF_CYCLE_TIME,
@@ -46,6 +66,7 @@ from .pid_shared.const import (
     CONF_PID_KI,
     CONF_PID_KP,
 )
+from .preset import PRESETS_SCHEMA
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
@@ -64,6 +85,18 @@ _PID_DIRECTIONS = [
     selector.SelectOptionDict(value=PID_DIR_REVERSE, label="Reverse"),
 ]
 
+_DERIVATIVE_ON = [
+    selector.SelectOptionDict(value=DERIVATIVE_ON_MEASUREMENT, label="Measurement"),
+    selector.SelectOptionDict(value=DERIVATIVE_ON_ERROR, label="Error"),
+]
+
+_PRIORITIES = [
+    selector.SelectOptionDict(value=PRIORITY_LOW, label="Low"),
+    selector.SelectOptionDict(value=PRIORITY_NORMAL, label="Normal"),
+    selector.SelectOptionDict(value=PRIORITY_HIGH, label="High"),
+    selector.SelectOptionDict(value=PRIORITY_CRITICAL, label="Critical"),
+]
+
 OPTIONS_BASE_SCHEMA_PART1 = vol.Schema(
     {
         vol.Required(CONF_OUTPUT): selector.EntitySelector(
@@ -93,6 +126,32 @@ OPTIONS_BASE_SCHEMA_PART2 = vol.Schema(
                 min=0, step=0.001, mode=selector.NumberSelectorMode.BOX
             ),
         ),
+        vol.Optional(
+            CONF_DERIVATIVE_ON, default=DEFAULT_DERIVATIVE_ON
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=_DERIVATIVE_ON, translation_key=CONF_DERIVATIVE_ON
+            ),
+        ),
+        vol.Optional(
+            CONF_DERIVATIVE_FILTER, default=DEFAULT_DERIVATIVE_FILTER
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0, step=0.001, mode=selector.NumberSelectorMode.BOX
+            ),
+        ),
+        vol.Optional(
+            CONF_SETPOINT_WEIGHT_P, default=DEFAULT_SETPOINT_WEIGHT_P
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0, max=1, step=0.01, mode=selector.NumberSelectorMode.BOX
+            ),
+        ),
+        vol.Optional(CONF_SETPOINT_WEIGHT_D): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0, max=1, step=0.01, mode=selector.NumberSelectorMode.BOX
+            ),
+        ),
         vol.Optional(CONF_PID_DIR, default=DEFAULT_PID_DIR): selector.SelectSelector(
             selector.SelectSelectorConfig(
                 options=_PID_DIRECTIONS, translation_key=CONF_PID_DIR
@@ -107,6 +166,19 @@ OPTIONS_BASE_SCHEMA_PART2 = vol.Schema(
         vol.Optional(
             CONF_CYCLE_TIME, default=DEFAULT_CYCLE_TIME
         ): selector.DurationSelector(),
+        vol.Optional(
+            CONF_SETPOINT_RAMP_RATE, default=DEFAULT_SETPOINT_RAMP_RATE
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0, step=0.01, mode=selector.NumberSelectorMode.BOX
+            ),
+        ),
+        vol.Optional(CONF_PRIORITY, default=DEFAULT_PRIORITY): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=_PRIORITIES, translation_key=CONF_PRIORITY
+            ),
+        ),
+        vol.Optional(CONF_PRESETS): selector.ObjectSelector(),
         vol.Optional(CONF_STEP, default=DEFAULT_STEP): selector.NumberSelector(
             selector.NumberSelectorConfig(
                 min=0.1, mode=selector.NumberSelectorMode.BOX
@@ -140,12 +212,27 @@ CONFIG_SCHEMA = vol.Schema(
 ).extend(OPTIONS_PID_SCHEMA.schema)
 
 
+async def _validate_presets(
+    _handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
+) -> dict[str, Any]:
+    """Check the presets, entered as an object of presets by name."""
+    if CONF_PRESETS in user_input:
+        try:
+            user_input[CONF_PRESETS] = PRESETS_SCHEMA(user_input[CONF_PRESETS])
+        except vol.Invalid as ex:
+            msg = "invalid_presets"
+            raise SchemaFlowError(msg) from ex
+    return user_input
+
+
 CONFIG_FLOW = {
-    "user": SchemaFlowFormStep(CONFIG_SCHEMA),
+    "user": SchemaFlowFormStep(CONFIG_SCHEMA, validate_user_input=_validate_presets),
 }
 
 OPTIONS_FLOW = {
-    "init": SchemaFlowFormStep(OPTIONS_PID_SCHEMA),
+    "init": SchemaFlowFormStep(
+        OPTIONS_PID_SCHEMA, validate_user_input=_validate_presets
+    ),
 }
 
 
@@ -2,12 +2,49 @@
 
 from homeassistant.const import Platform
 
+# The constants of the control core, which runs without Home Assistant
+from .pid_core.const import (  # noqa: F401
+    DEFAULT_DERIVATIVE_FILTER,
+    DEFAULT_DERIVATIVE_ON,
+    DEFAULT_PID_KD,
+    DEFAULT_PID_KI,
+    DEFAULT_PID_KP,
+    DEFAULT_SETPOINT_RAMP_RATE,
+    DEFAULT_SETPOINT_WEIGHT_P,
+    DERIVATIVE_ON_ERROR,
+    DERIVATIVE_ON_MEASUREMENT,
+    PID_DIR_DIRECT,
+    PID_DIR_REVERSE,
+)
+
 DOMAIN = "pid_controller"
-PLATFORMS = [Platform.NUMBER]
+PLATFORMS = [Platform.NUMBER, Platform.SELECT, Platform.SENSOR]
 
 ATTR_INPUT1 = "input1"
 ATTR_INPUT2 = "input2"
 ATTR_OUTPUT = "output"
+ATTR_ALGORITHM = "algorithm"
+ATTR_MPC_FALLBACKS = "mpc_fallbacks"
+ATTR_ACTIVE_SETPOINT = "active_setpoint"
+ATTR_SETPOINT_PROFILE_END = "setpoint_profile_end"
+ATTR_PROFILE = "profile"
+ATTR_OFFSET = "offset"
+ATTR_ENABLE = "enable"
+ATTR_IAE = "iae"
+ATTR_ISE = "ise"
+ATTR_OVERSHOOT = "overshoot"
+ATTR_SETTLING_TIME = "settling_time"
+ATTR_OSCILLATION_PERIOD = "oscillation_period"
+ATTR_CYCLE_PERIOD = "cycle_period"
+ATTR_PROBLEMS = "problems"
+ATTR_SATURATION_DURATION = "saturation_duration"
+ATTR_PROBLEM = "problem"
+ATTR_ACTIVE = "active"
+ATTR_PRIORITY = "priority"
+ATTR_DEFERRED_CYCLES = "deferred_cycles"
+ATTR_PRESET = "preset"
+ATTR_OVERRUNS = "overruns"
+ATTR_SKIPPED_CYCLES = "skipped_cycles"
 
 CONF_NUMBERS = "numbers"
 CONF_INPUT1 = "input1"
@@ -15,6 +52,55 @@ CONF_INPUT2 = "input2"
 CONF_OUTPUT = "output"
 CONF_STEP = "step"
 CONF_PID_DIR = "direction"
+CONF_ALGORITHM = "algorithm"
+CONF_MODEL = "model"
+CONF_MODEL_GAIN = "gain"
+CONF_MODEL_TIME_CONSTANT = "time_constant"
+CONF_MODEL_DEAD_TIME = "dead_time"
+CONF_MPC_HORIZON = "mpc_horizon"
+CONF_MPC_MOVE_SUPPRESSION = "mpc_move_suppression"
+CONF_OUTPUT_COMBINE = "output_combine"
+CONF_OUTPUT_WEIGHT = "output_weight"
+CONF_SETPOINT_RAMP_RATE = "setpoint_ramp_rate"
+CONF_DIRECT_OUTPUT = "direct_output"
+CONF_DERIVATIVE_ON = "derivative_on"
+CONF_DERIVATIVE_FILTER = "derivative_filter"
+CONF_SETPOINT_WEIGHT_P = "setpoint_weight_p"
+CONF_SETPOINT_WEIGHT_D = "setpoint_weight_d"
+CONF_SPLIT_RANGE = "split_range"
+CONF_RANGE_START = "start"
+CONF_RANGE_END = "end"
+CONF_REVERSE = "reverse"
+CONF_MIN_CYCLE_TIME = "min_cycle_time"
+CONF_MAX_CYCLE_TIME = "max_cycle_time"
+CONF_ADAPTIVE_ERROR = "adaptive_error_threshold"
+CONF_ADAPTIVE_RATE = "adaptive_rate_threshold"
+CONF_RESPONSE_TIMEOUT = "response_timeout"
+CONF_SATURATION_TIMEOUT = "saturation_timeout"
+CONF_MQTT = "mqtt"
+CONF_INPUT1_TOPIC = "input1_topic"
+CONF_INPUT2_TOPIC = "input2_topic"
+CONF_OUTPUT_TOPIC = "output_topic"
+CONF_QOS = "qos"
+CONF_RETAIN = "retain"
+CONF_MIRROR_INTERVAL = "mirror_interval"
+CONF_MAX_AGE = "max_age"
+CONF_PRIORITY = "priority"
+CONF_CONTROLLER_KEY = "controller_key"
+CONF_MIN_MOVE = "min_move"
+CONF_REVERSAL_HYSTERESIS = "reversal_hysteresis"
+CONF_PRESETS = "presets"
+CONF_SETPOINT = "setpoint"
+CONF_OVERRUN_POLICY = "overrun_policy"
+
+DATA_GROUPS = "groups"
+DATA_ENTITIES = "entities"
+DATA_GOVERNOR = "governor"
+DATA_HASS_CONFIG = "hass_config"
+
+SIGNAL_CONTROLLER_ADDED = "pid_controller_added_{}"
+
+EVENT_HEALTH = "pid_controller_health"
 
 MODE_SLIDER = "slider"
 MODE_BOX = "box"
@@ -23,14 +109,61 @@ MODE_AUTO = "auto"
 SERVICE_SET_KI = "set_ki"
 SERVICE_SET_KP = "set_kp"
 SERVICE_SET_KD = "set_kd"
+SERVICE_SET_SETPOINT_PROFILE = "set_setpoint_profile"
+SERVICE_BULK_UPDATE = "bulk_update"
+SERVICE_SET_MANUAL_OUTPUT = "set_manual_output"
+SERVICE_SET_PRESET = "set_preset"
+
+ALGORITHM_PID = "pid"
+ALGORITHM_MPC = "mpc"
+ALGORITHM_SMITH = "smith_predictor"
 
-PID_DIR_DIRECT = "direct"
-PID_DIR_REVERSE = "reverse"
+COMBINE_NONE = "none"
+COMBINE_MAX = "max"
+COMBINE_MIN = "min"
+COMBINE_SUM = "sum"
+COMBINE_AVERAGE = "weighted_average"
+
+PROBLEM_UNRESPONSIVE = "unresponsive"
+PROBLEM_SATURATED = "saturated"
+
+PRIORITY_LOW = "low"
+PRIORITY_NORMAL = "normal"
+PRIORITY_HIGH = "high"
+PRIORITY_CRITICAL = "critical"
+
+OVERRUN_SKIP = "skip"
+OVERRUN_QUEUE_LATEST = "queue_latest"
+OVERRUN_RUN = "run"
+
+WEAR_TRAVEL = "travel"
+WEAR_REVERSALS = "reversals"
+WEAR_WRITES_PER_HOUR = "writes_per_hour"
 
 DEFAULT_MODE = MODE_SLIDER
 DEFAULT_CYCLE_TIME = {"seconds": 30}
 
 DEFAULT_PID_DIR = PID_DIR_DIRECT
-DEFAULT_PID_KI = 1.0
-DEFAULT_PID_KP = 0.1
-DEFAULT_PID_KD = 0.0
+
+DEFAULT_ALGORITHM = ALGORITHM_PID
+DEFAULT_MODEL_DEAD_TIME = {"seconds": 0}
+DEFAULT_MPC_HORIZON = 20
+DEFAULT_MPC_MOVE_SUPPRESSION = 0.1
+DEFAULT_OUTPUT_COMBINE = COMBINE_NONE
+DEFAULT_OUTPUT_WEIGHT = 1.0
+DEFAULT_DIRECT_OUTPUT = True
+DEFAULT_ADAPTIVE_ERROR = 1.0
+DEFAULT_ADAPTIVE_RATE = 0.1
+DEFAULT_RESPONSE_TIMEOUT = {"minutes": 5}
+DEFAULT_SATURATION_TIMEOUT = {"hours": 6}
+DEFAULT_QOS = 0
+DEFAULT_RETAIN = False
+DEFAULT_MIRROR_INTERVAL = {"seconds": 30}
+# Without a max_age, an MQTT input is used for this many (maximum) cycle times
+DEFAULT_MAX_AGE_CYCLES = 3
+DEFAULT_PRIORITY = PRIORITY_NORMAL
+DEFAULT_OVERRUN_POLICY = OVERRUN_SKIP
+DEFAULT_MIN_MOVE = 0.0
+DEFAULT_REVERSAL_HYSTERESIS = 0.0
+# Part of the cycle time the MPC solver may use before the PID output is taken
+MPC_TIMEOUT_FRACTION = 0.5
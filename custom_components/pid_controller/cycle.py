@@ -0,0 +1,64 @@
+"""Adaptive cycle time for the PID controller."""
+
+from __future__ import annotations
+
+import math
+
+# Factor by which a settled loop lengthens its period every cycle
+PERIOD_GROWTH = 1.5
+# Part of the thresholds below which the loop counts as settled
+SETTLED_FRACTION = 0.5
+
+
+class AdaptiveCycle:
+    """
+    Cycle period between a minimum and a maximum, following the loop.
+
+    When the error or its rate of change exceed their thresholds, the loop
+    is in a transient and runs at the minimum period. When both are well
+    below the thresholds the loop is settled and the period grows step by
+    step to the maximum. In between the period is kept.
+    """
+
+    __slots__ = (
+        "_last_error",
+        "error_threshold",
+        "maximum",
+        "minimum",
+        "period",
+        "rate_threshold",
+    )
+
+    def __init__(
+        self,
+        minimum: float,
+        maximum: float,
+        error_threshold: float,
+        rate_threshold: float,
+    ) -> None:
+        """Initialize at the minimum period, to settle a starting loop quickly."""
+        self.minimum = minimum
+        self.maximum = maximum
+        self.error_threshold = error_threshold
+        self.rate_threshold = rate_threshold
+        self.period = minimum
+        self._last_error = math.nan
+
+    def speed_up(self) -> None:
+        """Go to the minimum period, e.g. after a setpoint change."""
+        self.period = self.minimum
+
+    def update(self, error: float, elapsed: float) -> float:
+        """Return the period until the next cycle, from the last error."""
+        rate = 0.0
+        if not math.isnan(self._last_error) and elapsed > 0:
+            rate = abs(error - self._last_error) / elapsed
+        self._last_error = error
+        if abs(error) > self.error_threshold or rate > self.rate_threshold:
+            self.period = self.minimum
+        elif (
+            abs(error) <= SETTLED_FRACTION * self.error_threshold
+            and rate <= SETTLED_FRACTION * self.rate_threshold
+        ):
+            self.period = min(self.period * PERIOD_GROWTH, self.maximum)
+        return self.period
@@ -0,0 +1,38 @@
+"""Diagnostics of the PID controller."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
+from .const import DATA_ENTITIES, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the configuration and a snapshot of each controller of the entry."""
+    entities = hass.data.get(DOMAIN, {}).get(DATA_ENTITIES, {})
+    return {
+        "config": dict(entry.options),
+        "controllers": [
+            _json_safe(entity.diagnostics())
+            for entity in entities.values()
+            if entity.controller_key == entry.entry_id
+        ],
+    }
+
+
+def _json_safe(value: Any) -> Any:
+    """Replace NaN and infinity, which JSON cannot hold, by None."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_json_safe(item) for item in value]
+    return value
@@ -0,0 +1,76 @@
+"""
+Entities that belong to a PID controller, on other platforms than number.
+
+A controller announces itself with a dispatcher signal when it is added.
+The platform of the child entities creates them then, or at once for the
+controllers that were added before the platform was set up.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+
+from .const import DATA_ENTITIES, DOMAIN, SIGNAL_CONTROLLER_ADDED
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity import DeviceInfo
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+    from .number import PidEntity
+
+
+@callback
+def async_setup_child_entities(
+    hass: HomeAssistant,
+    key: str,
+    create: Callable[[PidEntity], Iterable[Entity]],
+    async_add_entities: AddEntitiesCallback,
+) -> Callable[[], None]:
+    """Add the child entities of the controllers with a key; return unsubscribe."""
+
+    @callback
+    def _async_add(controller: PidEntity) -> None:
+        async_add_entities(create(controller))
+
+    unsubscribe = async_dispatcher_connect(
+        hass, SIGNAL_CONTROLLER_ADDED.format(key), _async_add
+    )
+    for controller in hass.data.get(DOMAIN, {}).get(DATA_ENTITIES, {}).values():
+        if controller.controller_key == key:
+            _async_add(controller)
+    return unsubscribe
+
+
+class PidChildEntity(Entity):
+    """Entity on the device of a PID controller, updated by the controller."""
+
+    _attr_should_poll = False
+
+    def __init__(self, controller: PidEntity, name: str, key: str) -> None:
+        """Initialize the entity named and keyed after its controller."""
+        self.controller = controller
+        self._attr_name = f"{controller.name} {name}"
+        if controller.unique_id:
+            self._attr_unique_id = f"{controller.unique_id}_{key}"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device of the controller."""
+        return self.controller.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the controller, and leave together with it."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.controller.async_add_child(self))
+
+    @callback
+    def async_controller_updated(self) -> None:
+        """Write the state after a cycle of the controller."""
+        self.async_write_ha_state()
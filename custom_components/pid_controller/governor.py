@@ -0,0 +1,116 @@
+"""
+Load governor shared by all PID controllers.
+
+When Home Assistant is busy, e.g. at startup or during a recorder purge,
+the event loop lags and timer ticks of hundreds of controllers fire late and
+together, adding to the lag. The governor measures the lag of the event
+loop with a periodic probe, and the share of the loop time spent in
+controller cycles. Under pressure, cycles of controllers with a low
+priority are deferred, so critical loops keep their timing. A deferred
+controller runs again after a few deferrals at most, over the full elapsed
+time, so no loop is starved.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from .const import (
+    PRIORITY_CRITICAL,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+)
+
+if TYPE_CHECKING:
+    import asyncio
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rank of each priority: a cycle is deferred while the pressure exceeds it
+PRIORITY_RANKS = {
+    PRIORITY_LOW: 0,
+    PRIORITY_NORMAL: 1,
+    PRIORITY_HIGH: 2,
+    PRIORITY_CRITICAL: 3,
+}
+# Seconds between two probes of the event loop
+PROBE_INTERVAL = 1.0
+# Event loop lag in seconds from which low, normal and high priority wait
+LAG_THRESHOLDS = (0.05, 0.2, 0.5)
+# Part of the loop time the controllers may use before low priority waits
+CPU_BUDGET = 0.1
+# Decay of the lag estimate per probe: fast up, slowly down
+LAG_DECAY = 0.5
+# Cycles in a row a controller may be deferred before it runs anyway
+MAX_DEFERRALS = 4
+
+
+class LoadGovernor:
+    """Event loop lag, controller load and the resulting pressure."""
+
+    __slots__ = ("_busy", "_due", "_handle", "_loop", "deferred", "lag", "load")
+
+    def __init__(self) -> None:
+        """Initialize an idle governor."""
+        self.lag = 0.0
+        self.load = 0.0
+        # Cycles deferred by all controllers together
+        self.deferred = 0
+        self._busy = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._due = 0.0
+
+    @property
+    def pressure(self) -> int:
+        """Return the number of priorities that are deferred."""
+        level = sum(self.lag >= threshold for threshold in LAG_THRESHOLDS)
+        if self.load > CPU_BUDGET:
+            level = max(level, 1)
+        return level
+
+    def admit(self, priority: str, deferrals: int) -> bool:
+        """Return whether a cycle may run; deferrals is the count in a row."""
+        if deferrals >= MAX_DEFERRALS or PRIORITY_RANKS[priority] >= self.pressure:
+            return True
+        self.deferred += 1
+        return False
+
+    def account(self, seconds: float) -> None:
+        """Add the time one controller cycle took."""
+        self._busy += seconds
+
+    def record(self, lag: float, interval: float) -> None:
+        """Take the result of one probe of the event loop."""
+        pressure = self.pressure
+        self.lag = max(lag, self.lag * LAG_DECAY)
+        self.load = self._busy / interval if interval > 0 else 0.0
+        self._busy = 0.0
+        if self.pressure != pressure:
+            _LOGGER.info(
+                "PID controllers under pressure %s: event loop lag %.3f s, load %.1f%%",
+                self.pressure,
+                self.lag,
+                100 * self.load,
+            )
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start probing the event loop."""
+        self._loop = loop
+        self._due = loop.time() + PROBE_INTERVAL
+        self._handle = loop.call_at(self._due, self._probe)
+
+    def stop(self) -> None:
+        """Stop probing the event loop."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+
+    def _probe(self) -> None:
+        """Measure how late the probe runs, and schedule the next one."""
+        now = self._loop.time()
+        self.record(now - self._due, PROBE_INTERVAL + now - self._due)
+        self._due = now + PROBE_INTERVAL
+        self._handle = self._loop.call_at(self._due, self._probe)
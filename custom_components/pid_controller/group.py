@@ -0,0 +1,120 @@
+"""
+Output groups for PID controllers driving a shared actuator.
+
+All controllers that write the same output entity with an output combine
+function configured form one group. Each controller submits its own output
+every cycle; once every active member delivered a fresh value, the group
+combines them into a single value that is written to the actuator once.
+
+A member is active from the moment its controller is enabled. A member that
+stops reporting, e.g. because its input is unavailable, expires after
+STALE_PERIODS of its cycle time, so the round completes with the members
+that still report. Its next report makes it active again.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .const import (
+    COMBINE_AVERAGE,
+    COMBINE_MAX,
+    COMBINE_MIN,
+    COMBINE_SUM,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+# Cycle times after which a member that did not report leaves the round
+STALE_PERIODS = 2.0
+
+
+@dataclass(slots=True)
+class _Member:
+    """Contribution of one controller to the group."""
+
+    weight: float
+    period: float
+    value: float | None = None
+    active: bool = False
+    reported: float = -math.inf
+
+
+def _weighted_average(members: list[_Member]) -> float:
+    total = sum(member.weight for member in members)
+    if total <= 0:
+        return sum(member.value for member in members) / len(members)
+    return sum(member.weight * member.value for member in members) / total
+
+
+COMBINE_FUNCTIONS: dict[str, Callable[[list[_Member]], float]] = {
+    COMBINE_MAX: lambda members: max(member.value for member in members),
+    COMBINE_MIN: lambda members: min(member.value for member in members),
+    COMBINE_SUM: lambda members: sum(member.value for member in members),
+    COMBINE_AVERAGE: _weighted_average,
+}
+
+
+class OutputGroup:
+    """Combines the outputs of the controllers sharing one output entity."""
+
+    def __init__(self, output: str, function: str) -> None:
+        """Initialize an empty group."""
+        self.output = output
+        self.function = function
+        self._combine = COMBINE_FUNCTIONS[function]
+        self._members: dict[Hashable, _Member] = {}
+
+    def __len__(self) -> int:
+        """Return the number of members."""
+        return len(self._members)
+
+    def add(self, member: Hashable, weight: float, period: float) -> None:
+        """Add a (disabled) controller with its longest cycle time."""
+        self._members[member] = _Member(weight, period)
+
+    def activate(self, member: Hashable, now: float) -> None:
+        """Let an enabled controller take part in the rounds from now on."""
+        state = self._members[member]
+        state.active = True
+        state.reported = now
+
+    def remove(self, member: Hashable) -> None:
+        """Remove a controller from the group."""
+        self._members.pop(member, None)
+
+    def withdraw(self, member: Hashable) -> None:
+        """Stop a (disabled) controller from contributing to the group."""
+        if state := self._members.get(member):
+            state.active = False
+            state.value = None
+
+    def submit(self, member: Hashable, value: float, now: float) -> float | None:
+        """
+        Submit the output of a controller.
+
+        Returns the combined output when this value completes the round,
+        otherwise None: one of the other active members still has to report.
+        """
+        state = self._members[member]
+        state.active = True
+        state.value = value
+        state.reported = now
+        active = []
+        for other in self._members.values():
+            if not other.active:
+                continue
+            if other.value is None:
+                if now - other.reported <= STALE_PERIODS * other.period:
+                    return None
+                # Stopped reporting: the round goes on without it
+                other.active = False
+                continue
+            active.append(other)
+        combined = self._combine(active)
+        for state in active:
+            state.value = None
+        return combined
@@ -0,0 +1,73 @@
+"""
+Health watchdog for the output of the PID controller.
+
+An actuator that ignores its commands, or a loop that has been pinned at an
+output limit for hours, looks fine from the controller: it keeps computing
+and writing. The watchdog compares how long a written output has not been
+reported back by the output entity, and how long the output has been at a
+limit, against timeouts.
+"""
+
+from __future__ import annotations
+
+from .const import PROBLEM_SATURATED, PROBLEM_UNRESPONSIVE
+
+
+class HealthMonitor:
+    """
+    Problems of one controller output, with their start and end.
+
+    A timeout of 0 disables the check.
+    """
+
+    __slots__ = (
+        "_saturated_since",
+        "problems",
+        "response_timeout",
+        "saturation_timeout",
+    )
+
+    def __init__(self, response_timeout: float, saturation_timeout: float) -> None:
+        """Initialize a healthy monitor."""
+        self.response_timeout = response_timeout
+        self.saturation_timeout = saturation_timeout
+        self.problems: frozenset[str] = frozenset()
+        self._saturated_since: float | None = None
+
+    def saturation_duration(self, now: float) -> float:
+        """Return how long the output has been at a limit."""
+        if self._saturated_since is None:
+            return 0.0
+        return now - self._saturated_since
+
+    def update(
+        self, now: float, *, pending_since: float | None, saturated: bool
+    ) -> list[tuple[str, bool]]:
+        """
+        Check the output; return the problems that started or ended.
+
+        pending_since is the time of the oldest write that the output entity
+        did not report back yet, saturated whether the output is at a limit.
+        """
+        if not saturated:
+            self._saturated_since = None
+        elif self._saturated_since is None:
+            self._saturated_since = now
+        problems = set()
+        if (
+            self.response_timeout > 0
+            and pending_since is not None
+            and now - pending_since >= self.response_timeout
+        ):
+            problems.add(PROBLEM_UNRESPONSIVE)
+        if (
+            self.saturation_timeout > 0
+            and self.saturation_duration(now) >= self.saturation_timeout
+        ):
+            problems.add(PROBLEM_SATURATED)
+        changes = [
+            (problem, problem in problems)
+            for problem in sorted(problems.symmetric_difference(self.problems))
+        ]
+        self.problems = frozenset(problems)
+        return changes
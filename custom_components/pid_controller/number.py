@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
+import sys
+import time
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
 import voluptuous as vol
 from dvg_pid_controller import Constants as PIDConst
+from homeassistant.components import mqtt
 from homeassistant.components.number import (
+    ATTR_VALUE,
     DEFAULT_MAX_VALUE,
     DEFAULT_MIN_VALUE,
     DEFAULT_STEP,
@@ -18,6 +24,7 @@ from homeassistant.components.number import (
     RestoreNumber,
 )
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
     CONF_MAXIMUM,
     CONF_MINIMUM,
     CONF_MODE,
@@ -28,35 +35,164 @@ from homeassistant.const import (
     SERVICE_TURN_ON,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
+    Platform,
 )
 from homeassistant.core import CoreState, HomeAssistant, callback
-from homeassistant.helpers import entity_platform
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import discovery, entity_platform
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_entity_registry_updated_event,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.reload import async_setup_reload_service
 
 from .const import (
+    ALGORITHM_MPC,
+    ALGORITHM_PID,
+    ALGORITHM_SMITH,
+    ATTR_ACTIVE,
+    ATTR_ACTIVE_SETPOINT,
+    ATTR_ALGORITHM,
+    ATTR_CYCLE_PERIOD,
+    ATTR_DEFERRED_CYCLES,
+    ATTR_ENABLE,
+    ATTR_IAE,
     ATTR_INPUT1,
     ATTR_INPUT2,
+    ATTR_ISE,
+    ATTR_MPC_FALLBACKS,
+    ATTR_OFFSET,
+    ATTR_OSCILLATION_PERIOD,
     ATTR_OUTPUT,
+    ATTR_OVERRUNS,
+    ATTR_OVERSHOOT,
+    ATTR_PRESET,
+    ATTR_PRIORITY,
+    ATTR_PROBLEM,
+    ATTR_PROBLEMS,
+    ATTR_PROFILE,
+    ATTR_SATURATION_DURATION,
+    ATTR_SETPOINT_PROFILE_END,
+    ATTR_SETTLING_TIME,
+    ATTR_SKIPPED_CYCLES,
+    COMBINE_AVERAGE,
+    COMBINE_MAX,
+    COMBINE_MIN,
+    COMBINE_NONE,
+    COMBINE_SUM,
+    CONF_ADAPTIVE_ERROR,
+    CONF_ADAPTIVE_RATE,
+    CONF_ALGORITHM,
+    CONF_CONTROLLER_KEY,
+    CONF_DERIVATIVE_FILTER,
+    CONF_DERIVATIVE_ON,
+    CONF_DIRECT_OUTPUT,
     CONF_INPUT1,
+    CONF_INPUT1_TOPIC,
     CONF_INPUT2,
+    CONF_INPUT2_TOPIC,
+    CONF_MAX_AGE,
+    CONF_MAX_CYCLE_TIME,
+    CONF_MIN_CYCLE_TIME,
+    CONF_MIN_MOVE,
+    CONF_MIRROR_INTERVAL,
+    CONF_MODEL,
+    CONF_MODEL_DEAD_TIME,
+    CONF_MODEL_GAIN,
+    CONF_MODEL_TIME_CONSTANT,
+    CONF_MPC_HORIZON,
+    CONF_MPC_MOVE_SUPPRESSION,
+    CONF_MQTT,
     CONF_OUTPUT,
+    CONF_OUTPUT_COMBINE,
+    CONF_OUTPUT_TOPIC,
+    CONF_OUTPUT_WEIGHT,
+    CONF_OVERRUN_POLICY,
     CONF_PID_DIR,
+    CONF_PRESETS,
+    CONF_PRIORITY,
+    CONF_QOS,
+    CONF_RANGE_END,
+    CONF_RANGE_START,
+    CONF_RESPONSE_TIMEOUT,
+    CONF_RETAIN,
+    CONF_REVERSAL_HYSTERESIS,
+    CONF_REVERSE,
+    CONF_SATURATION_TIMEOUT,
+    CONF_SETPOINT_RAMP_RATE,
+    CONF_SETPOINT_WEIGHT_D,
+    CONF_SETPOINT_WEIGHT_P,
+    CONF_SPLIT_RANGE,
     CONF_STEP,
+    DATA_ENTITIES,
+    DATA_GOVERNOR,
+    DATA_GROUPS,
+    DATA_HASS_CONFIG,
+    DEFAULT_ADAPTIVE_ERROR,
+    DEFAULT_ADAPTIVE_RATE,
+    DEFAULT_ALGORITHM,
     DEFAULT_CYCLE_TIME,
+    DEFAULT_DERIVATIVE_FILTER,
+    DEFAULT_DERIVATIVE_ON,
+    DEFAULT_DIRECT_OUTPUT,
+    DEFAULT_MAX_AGE_CYCLES,
+    DEFAULT_MIN_MOVE,
+    DEFAULT_MIRROR_INTERVAL,
     DEFAULT_MODE,
+    DEFAULT_MODEL_DEAD_TIME,
+    DEFAULT_MPC_HORIZON,
+    DEFAULT_MPC_MOVE_SUPPRESSION,
+    DEFAULT_OUTPUT_COMBINE,
+    DEFAULT_OUTPUT_WEIGHT,
+    DEFAULT_OVERRUN_POLICY,
     DEFAULT_PID_DIR,
     DEFAULT_PID_KD,
     DEFAULT_PID_KI,
     DEFAULT_PID_KP,
+    DEFAULT_PRIORITY,
+    DEFAULT_QOS,
+    DEFAULT_RESPONSE_TIMEOUT,
+    DEFAULT_RETAIN,
+    DEFAULT_REVERSAL_HYSTERESIS,
+    DEFAULT_SATURATION_TIMEOUT,
+    DEFAULT_SETPOINT_RAMP_RATE,
+    DEFAULT_SETPOINT_WEIGHT_P,
+    DERIVATIVE_ON_ERROR,
+    DERIVATIVE_ON_MEASUREMENT,
     DOMAIN,
+    EVENT_HEALTH,
     MODE_AUTO,
     MODE_BOX,
     MODE_SLIDER,
+    MPC_TIMEOUT_FRACTION,
+    OVERRUN_QUEUE_LATEST,
+    OVERRUN_RUN,
+    OVERRUN_SKIP,
     PID_DIR_DIRECT,
     PID_DIR_REVERSE,
-    PLATFORMS,
+    SERVICE_SET_KD,
+    SERVICE_SET_KI,
+    SERVICE_SET_KP,
+    SERVICE_SET_MANUAL_OUTPUT,
+    SERVICE_SET_PRESET,
+    SERVICE_SET_SETPOINT_PROFILE,
+    SIGNAL_CONTROLLER_ADDED,
 )
+from .cycle import AdaptiveCycle
+from .governor import PRIORITY_RANKS
+from .group import OutputGroup
+from .health import HealthMonitor
+from .output import OutputChannel, SplitRange
+from .pid_core.core import ControllerCore, measurement_of
+from .pid_core.derivative import DerivativeTerm
+from .pid_core.mpc import ModelPredictiveController, PlantModel
+from .pid_core.mpc import solve as mpc_solve
+from .pid_core.setpoint import SetpointProfile
+from .pid_core.smith import SmithPredictor
 from .pid_shared import PidBaseClass
 from .pid_shared.const import (
     ATTR_PID_ENABLE,
@@ -65,12 +201,84 @@ from .pid_shared.const import (
     CONF_PID_KI,
     CONF_PID_KP,
 )
+from .preset import PRESETS_SCHEMA, Preset, parse_presets
+from .trace import CycleTrace
+from .transport import MirrorRate, MqttTransport
+from .wear import ActuatorWear
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
     from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import Event, EventStateChangedData, State
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.entity_registry import EventEntityRegistryUpdatedData
     from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
+    from .entity import PidChildEntity
+
+MODEL_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_MODEL_GAIN): vol.Coerce(float),
+        vol.Required(CONF_MODEL_TIME_CONSTANT): cv.time_period,
+        vol.Optional(
+            CONF_MODEL_DEAD_TIME, default=DEFAULT_MODEL_DEAD_TIME
+        ): cv.time_period,
+    }
+)
+
+PROFILE_POINT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_OFFSET): cv.time_period,
+        vol.Required(ATTR_VALUE): vol.Coerce(float),
+    }
+)
+
+
+def _finite(value: float) -> float:
+    """Check that a value is a number, not NaN or infinity."""
+    if not math.isfinite(value):
+        msg = f"{value} is not a finite number"
+        raise vol.Invalid(msg)
+    return value
+
+
+def _valid_range(value: dict[str, Any]) -> dict[str, Any]:
+    """Check that a split range is not empty."""
+    if value[CONF_RANGE_START] >= value[CONF_RANGE_END]:
+        msg = f"{CONF_RANGE_START} must be below {CONF_RANGE_END}"
+        raise vol.Invalid(msg)
+    return value
+
+
+SPLIT_RANGE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(CONF_OUTPUT): cv.entity_id,
+            vol.Required(CONF_RANGE_START): vol.Coerce(float),
+            vol.Required(CONF_RANGE_END): vol.Coerce(float),
+            vol.Optional(CONF_REVERSE, default=False): cv.boolean,
+        }
+    ),
+    _valid_range,
+)
+
+MQTT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_INPUT1_TOPIC): mqtt.valid_subscribe_topic,
+        vol.Optional(CONF_INPUT2_TOPIC): mqtt.valid_subscribe_topic,
+        vol.Optional(CONF_OUTPUT_TOPIC): mqtt.valid_publish_topic,
+        vol.Optional(CONF_QOS, default=DEFAULT_QOS): vol.All(
+            vol.Coerce(int), vol.In([0, 1, 2])
+        ),
+        vol.Optional(CONF_RETAIN, default=DEFAULT_RETAIN): cv.boolean,
+        vol.Optional(
+            CONF_MIRROR_INTERVAL, default=DEFAULT_MIRROR_INTERVAL
+        ): cv.time_period,
+        vol.Optional(CONF_MAX_AGE): cv.time_period,
+    }
+)
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Required(CONF_NAME): cv.string,
@@ -91,6 +299,67 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
             [MODE_BOX, MODE_SLIDER, MODE_AUTO]
         ),
         vol.Optional(CONF_UNIQUE_ID): cv.string,
+        vol.Optional(CONF_ALGORITHM, default=DEFAULT_ALGORITHM): vol.In(
+            [ALGORITHM_PID, ALGORITHM_MPC, ALGORITHM_SMITH]
+        ),
+        vol.Optional(CONF_MODEL): MODEL_SCHEMA,
+        vol.Optional(CONF_MPC_HORIZON, default=DEFAULT_MPC_HORIZON): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=200)
+        ),
+        vol.Optional(
+            CONF_MPC_MOVE_SUPPRESSION, default=DEFAULT_MPC_MOVE_SUPPRESSION
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_OUTPUT_COMBINE, default=DEFAULT_OUTPUT_COMBINE): vol.In(
+            [COMBINE_NONE, COMBINE_MAX, COMBINE_MIN, COMBINE_SUM, COMBINE_AVERAGE]
+        ),
+        vol.Optional(CONF_OUTPUT_WEIGHT, default=DEFAULT_OUTPUT_WEIGHT): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(
+            CONF_SETPOINT_RAMP_RATE, default=DEFAULT_SETPOINT_RAMP_RATE
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_DIRECT_OUTPUT, default=DEFAULT_DIRECT_OUTPUT): cv.boolean,
+        vol.Optional(CONF_MIN_CYCLE_TIME): cv.time_period,
+        vol.Optional(CONF_MAX_CYCLE_TIME): cv.time_period,
+        vol.Optional(CONF_ADAPTIVE_ERROR, default=DEFAULT_ADAPTIVE_ERROR): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(CONF_ADAPTIVE_RATE, default=DEFAULT_ADAPTIVE_RATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(CONF_SPLIT_RANGE): vol.All(cv.ensure_list, [SPLIT_RANGE_SCHEMA]),
+        vol.Optional(
+            CONF_RESPONSE_TIMEOUT, default=DEFAULT_RESPONSE_TIMEOUT
+        ): cv.time_period,
+        vol.Optional(
+            CONF_SATURATION_TIMEOUT, default=DEFAULT_SATURATION_TIMEOUT
+        ): cv.time_period,
+        vol.Optional(CONF_MQTT): MQTT_SCHEMA,
+        vol.Optional(CONF_PRIORITY, default=DEFAULT_PRIORITY): vol.In(
+            list(PRIORITY_RANKS)
+        ),
+        vol.Optional(CONF_PRESETS): PRESETS_SCHEMA,
+        vol.Optional(CONF_OVERRUN_POLICY, default=DEFAULT_OVERRUN_POLICY): vol.In(
+            [OVERRUN_SKIP, OVERRUN_QUEUE_LATEST, OVERRUN_RUN]
+        ),
+        vol.Optional(CONF_MIN_MOVE, default=DEFAULT_MIN_MOVE): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(
+            CONF_REVERSAL_HYSTERESIS, default=DEFAULT_REVERSAL_HYSTERESIS
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_DERIVATIVE_ON, default=DEFAULT_DERIVATIVE_ON): vol.In(
+            [DERIVATIVE_ON_MEASUREMENT, DERIVATIVE_ON_ERROR]
+        ),
+        vol.Optional(
+            CONF_DERIVATIVE_FILTER, default=DEFAULT_DERIVATIVE_FILTER
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(
+            CONF_SETPOINT_WEIGHT_P, default=DEFAULT_SETPOINT_WEIGHT_P
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+        vol.Optional(CONF_SETPOINT_WEIGHT_D): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
     }
 )
 
@@ -98,6 +367,72 @@ _LOGGER = logging.getLogger(__name__)
 DEBUG_PID = False
 
 
+def _as_seconds(value: timedelta | dict[str, float] | float) -> float:
+    """Return a duration from YAML (timedelta) or the config flow (dict)."""
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, dict):
+        return timedelta(**value).total_seconds()
+    return float(value)
+
+
+def _configured_preset(config: Any) -> Preset:
+    """Return the gains and limits of the configuration, as a preset."""
+    return Preset(
+        kp=config.get(CONF_PID_KP, DEFAULT_PID_KP),
+        ki=config.get(CONF_PID_KI, DEFAULT_PID_KI),
+        kd=config.get(CONF_PID_KD, DEFAULT_PID_KD),
+        minimum=config.get(CONF_MINIMUM, DEFAULT_MIN_VALUE),
+        maximum=config.get(CONF_MAXIMUM, DEFAULT_MAX_VALUE),
+    )
+
+
+def _renamed(
+    config: Mapping[str, Any], old_entity_id: str, entity_id: str
+) -> dict[str, Any]:
+    """Return the configuration with the inputs and outputs renamed."""
+
+    def rename(value: Any) -> Any:
+        return entity_id if value == old_entity_id else value
+
+    renamed = {
+        key: rename(value) if key in (CONF_INPUT1, CONF_INPUT2, CONF_OUTPUT) else value
+        for key, value in config.items()
+    }
+    if CONF_SPLIT_RANGE in renamed:
+        renamed[CONF_SPLIT_RANGE] = [
+            {**item, CONF_OUTPUT: rename(item[CONF_OUTPUT])}
+            for item in renamed[CONF_SPLIT_RANGE]
+        ]
+    return renamed
+
+
+def _create_channels(config: Any) -> tuple[OutputChannel, ...]:
+    """Return the output channels: the main output, then the split ranges."""
+    direct = config.get(CONF_DIRECT_OUTPUT, DEFAULT_DIRECT_OUTPUT)
+    min_move = config.get(CONF_MIN_MOVE, DEFAULT_MIN_MOVE)
+    hysteresis = config.get(CONF_REVERSAL_HYSTERESIS, DEFAULT_REVERSAL_HYSTERESIS)
+    main = OutputChannel(
+        config[CONF_OUTPUT],
+        direct=direct,
+        wear=ActuatorWear(min_move=min_move, hysteresis=hysteresis),
+    )
+    split_channels = [
+        OutputChannel(
+            item[CONF_OUTPUT],
+            direct=direct,
+            split=SplitRange(
+                item[CONF_RANGE_START],
+                item[CONF_RANGE_END],
+                item.get(CONF_REVERSE, False),
+            ),
+            wear=ActuatorWear(min_move=min_move, hysteresis=hysteresis),
+        )
+        for item in config.get(CONF_SPLIT_RANGE, [])
+    ]
+    return (main, *split_channels)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001
     config_entry: ConfigEntry,
@@ -105,7 +440,7 @@ async def async_setup_entry(
 ) -> None:
     """Initialize PID Controller config entry."""
     async_add_entities([PidEntity(config_entry.options, config_entry.entry_id)])
-    await _async_register_enable_service()
+    await _async_register_services()
 
 
 async def async_setup_platform(
@@ -115,38 +450,135 @@ async def async_setup_platform(
     discovery_info: DiscoveryInfoType | None = None,  # noqa: ARG001
 ) -> None:
     """Set up the number platform."""
-    await async_setup_reload_service(hass, DOMAIN, PLATFORMS)
+    await async_setup_reload_service(hass, DOMAIN, [Platform.NUMBER])
     async_add_entities([PidEntity(config, config.get(CONF_UNIQUE_ID))])
-    await _async_register_enable_service()
+    await _async_register_services()
+    # The wear sensors of the outputs, and the preset select
+    platforms = [Platform.SENSOR]
+    if config.get(CONF_PRESETS):
+        platforms.append(Platform.SELECT)
+    for platform in platforms:
+        hass.async_create_task(
+            discovery.async_load_platform(
+                hass,
+                platform,
+                DOMAIN,
+                {CONF_CONTROLLER_KEY: config.get(CONF_UNIQUE_ID) or config[CONF_NAME]},
+                hass.data[DOMAIN][DATA_HASS_CONFIG],
+            )
+        )
 
 
-async def _async_register_enable_service() -> None:
-    """Register the enable-regulator service."""
+async def _async_register_services() -> None:
+    """Register the entity services of the regulator."""
     platform = entity_platform.async_get_current_platform()
 
     platform.async_register_entity_service(SERVICE_TURN_ON, None, "async_turn_on")
     platform.async_register_entity_service(SERVICE_TURN_OFF, None, "async_turn_off")
+    platform.async_register_entity_service(
+        SERVICE_SET_SETPOINT_PROFILE,
+        {
+            vol.Required(ATTR_PROFILE): vol.All(
+                cv.ensure_list, vol.Length(min=1), [PROFILE_POINT_SCHEMA]
+            )
+        },
+        "async_set_setpoint_profile",
+    )
+    for service, method in (
+        (SERVICE_SET_KP, "async_set_kp"),
+        (SERVICE_SET_KI, "async_set_ki"),
+        (SERVICE_SET_KD, "async_set_kd"),
+    ):
+        platform.async_register_entity_service(
+            service,
+            {vol.Required(ATTR_VALUE): vol.All(vol.Coerce(float), vol.Range(min=0))},
+            method,
+        )
+    platform.async_register_entity_service(
+        SERVICE_SET_MANUAL_OUTPUT,
+        {vol.Required(ATTR_VALUE): vol.All(vol.Coerce(float), _finite)},
+        "async_set_manual_output",
+    )
+    platform.async_register_entity_service(
+        SERVICE_SET_PRESET, {vol.Required(ATTR_PRESET): cv.string}, "async_set_preset"
+    )
 
 
 class PidEntity(RestoreNumber, PidBaseClass):
     """Representation of a PID Controller number."""
 
+    _attr_timed_output = ("", 0.0)
+
     # pylint: disable=too-many-instance-attributes
     def __init__(self, config: Any, unique_id: str | None) -> None:
         """Initialize the PID Controller number."""
-        self._config = config
+        self._name: str = config[CONF_NAME]
+        self._output_combine = config.get(CONF_OUTPUT_COMBINE, DEFAULT_OUTPUT_COMBINE)
+        self._output_weight = config.get(CONF_OUTPUT_WEIGHT, DEFAULT_OUTPUT_WEIGHT)
         self._attr_native_min_value = config.get(CONF_MINIMUM, DEFAULT_MIN_VALUE)
         self._attr_native_max_value = config.get(CONF_MAXIMUM, DEFAULT_MAX_VALUE)
         self._attr_native_step = config.get(CONF_STEP, DEFAULT_STEP)
         self._attr_mode = config.get(CONF_MODE, DEFAULT_MODE)
         self._attr_last_cycle_start = str(dt_util.utcnow().replace(microsecond=0))
-        self._attr_timed_output = ("", 0.0)
-        self._output = config[CONF_OUTPUT]
-        self._output_domain = None
-        self._input_1 = config[CONF_INPUT1]
-        self._input_2 = config.get(CONF_INPUT2, "")
+        self._channels = _create_channels(config)
+        self._channel = self._channels[0]
+        # Interned: many controllers share their inputs and outputs
+        self._input_1 = sys.intern(config[CONF_INPUT1])
+        self._input_2 = sys.intern(config.get(CONF_INPUT2, ""))
         self._attr_unique_id = unique_id
-        self._output_step = 0.01
+        self._unsub_bindings: list[Callable[[], None]] = []
+        # Entities on other platforms that follow this controller
+        self._children: list[PidChildEntity] = []
+        self._cycle_seconds = _as_seconds(
+            config.get(CONF_CYCLE_TIME, DEFAULT_CYCLE_TIME)
+        )
+        self._algorithm = config.get(CONF_ALGORITHM, DEFAULT_ALGORITHM)
+        self._mpc = self._create_mpc(config)
+        smith_predictor = self._create_smith_predictor(config)
+        self._mpc_job: asyncio.Future[float] | None = None
+        self._mpc_fallbacks = 0
+        self._adaptive = self._create_adaptive_cycle(config)
+        self._unsub_cycle: Callable[[], None] | None = None
+        self._group: OutputGroup | None = None
+        self._setpoint_profile: SetpointProfile | None = None
+        self._last_cycle_time = time.monotonic()
+        self._priority = config.get(CONF_PRIORITY, DEFAULT_PRIORITY)
+        self._presets = parse_presets(config.get(CONF_PRESETS))
+        # What a preset does not set returns to the configuration
+        self._configured = _configured_preset(config)
+        self._preset: str | None = None
+        self._deferred_cycles = 0
+        self._deferrals = 0
+        self._overrun_policy = config.get(CONF_OVERRUN_POLICY, DEFAULT_OVERRUN_POLICY)
+        self._cycle_lock = asyncio.Lock()
+        self._cycle_queued = False
+        self._overruns = 0
+        self._skipped_cycles = 0
+        self._trace = CycleTrace()
+        self._mqtt: MqttTransport | None = None
+        self._mirror: MirrorRate | None = None
+        if mqtt_config := config.get(CONF_MQTT):
+            self._mqtt = MqttTransport(
+                mqtt_config.get(CONF_INPUT1_TOPIC),
+                mqtt_config.get(CONF_INPUT2_TOPIC),
+                mqtt_config.get(CONF_OUTPUT_TOPIC),
+                qos=mqtt_config.get(CONF_QOS, DEFAULT_QOS),
+                retain=mqtt_config.get(CONF_RETAIN, DEFAULT_RETAIN),
+                max_age=self._mqtt_max_age(mqtt_config),
+            )
+            if self._mqtt.output_topic:
+                # The output goes on MQTT: the entities are only mirrored
+                self._mirror = MirrorRate(
+                    _as_seconds(
+                        mqtt_config.get(CONF_MIRROR_INTERVAL, DEFAULT_MIRROR_INTERVAL)
+                    )
+                )
+        self._health = HealthMonitor(
+            _as_seconds(config.get(CONF_RESPONSE_TIMEOUT, DEFAULT_RESPONSE_TIMEOUT)),
+            _as_seconds(
+                config.get(CONF_SATURATION_TIMEOUT, DEFAULT_SATURATION_TIMEOUT)
+            ),
+        )
         # Use super to create _pid
         super().__init__(
             config.get(CONF_PID_KP, DEFAULT_PID_KP),
@@ -157,57 +589,364 @@ class PidEntity(RestoreNumber, PidBaseClass):
             else PIDConst.REVERSE,
             config.get(CONF_CYCLE_TIME, DEFAULT_CYCLE_TIME),
         )
+        self._core = ControllerCore(
+            self._pid,
+            # Setpoint ramp rate in units per second
+            ramp_rate=config.get(CONF_SETPOINT_RAMP_RATE, DEFAULT_SETPOINT_RAMP_RATE)
+            / 60.0,
+            derivative=DerivativeTerm(
+                config.get(CONF_DERIVATIVE_FILTER, DEFAULT_DERIVATIVE_FILTER),
+                config.get(CONF_DERIVATIVE_ON, DEFAULT_DERIVATIVE_ON),
+                config.get(CONF_SETPOINT_WEIGHT_D),
+            ),
+            predictor=smith_predictor,
+            setpoint_weight=config.get(
+                CONF_SETPOINT_WEIGHT_P, DEFAULT_SETPOINT_WEIGHT_P
+            ),
+        )
         # setpoint initial to minimum value
         self._pid.setpoint = self._attr_native_min_value
         self._attr_native_value = self._pid.setpoint
-        self._attr_extra_state_attributes = super().pid_state_attributes
-        self._attr_extra_state_attributes[ATTR_INPUT1] = self.input_1
-        self._attr_extra_state_attributes[ATTR_INPUT2] = self.input_2
-        self._attr_extra_state_attributes[ATTR_OUTPUT] = self.output
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the attributes, built only when the state is written."""
+        profile = self._setpoint_profile
+        metrics = self._core.metrics
+        attributes = {
+            **self.pid_state_attributes,
+            ATTR_INPUT1: self._input_1,
+            ATTR_INPUT2: self._input_2,
+            ATTR_OUTPUT: self._channel.entity_id,
+            ATTR_ALGORITHM: self._algorithm,
+            ATTR_ACTIVE_SETPOINT: self._pid.setpoint,
+            ATTR_SETPOINT_PROFILE_END: None
+            if profile is None
+            else dt_util.utc_from_timestamp(profile.end).isoformat(),
+            ATTR_IAE: round(metrics.iae, 3),
+            ATTR_ISE: round(metrics.ise, 3),
+            ATTR_OVERSHOOT: round(metrics.overshoot, 1),
+            ATTR_SETTLING_TIME: metrics.settling_time,
+            ATTR_OSCILLATION_PERIOD: metrics.oscillation_period,
+        }
+        if self._mpc is not None:
+            attributes[ATTR_MPC_FALLBACKS] = self._mpc_fallbacks
+        if self._adaptive is not None:
+            attributes[ATTR_CYCLE_PERIOD] = self._adaptive.period
+        if self._presets:
+            attributes[ATTR_PRESET] = self._preset
+        attributes[ATTR_PRIORITY] = self._priority
+        attributes[ATTR_DEFERRED_CYCLES] = self._deferred_cycles
+        attributes[ATTR_OVERRUNS] = self._overruns
+        attributes[ATTR_SKIPPED_CYCLES] = self._skipped_cycles
+        attributes[ATTR_PROBLEMS] = sorted(self._health.problems)
+        attributes[ATTR_SATURATION_DURATION] = round(
+            self._health.saturation_duration(time.monotonic())
+        )
+        return attributes
+
+    def _mqtt_max_age(self, mqtt_config: Any) -> float:
+        """Return how long a value received on an input topic is used."""
+        if CONF_MAX_AGE in mqtt_config:
+            return _as_seconds(mqtt_config[CONF_MAX_AGE])
+        adaptive = self._adaptive
+        return DEFAULT_MAX_AGE_CYCLES * (
+            self._cycle_seconds if adaptive is None else adaptive.maximum
+        )
+
+    def _create_adaptive_cycle(self, config: Any) -> AdaptiveCycle | None:
+        """Create the adaptive cycle time, if a minimum or maximum is set."""
+        if CONF_MIN_CYCLE_TIME not in config and CONF_MAX_CYCLE_TIME not in config:
+            return None
+        minimum = _as_seconds(config.get(CONF_MIN_CYCLE_TIME, self._cycle_seconds))
+        maximum = _as_seconds(config.get(CONF_MAX_CYCLE_TIME, self._cycle_seconds))
+        if self._algorithm != ALGORITHM_PID or minimum >= maximum:
+            # The models of mpc and the Smith predictor need a fixed cycle time
+            _LOGGER.warning(
+                "PID controller %s ignores the adaptive cycle time: it needs %s "
+                "below %s and does not work with %s or %s",
+                self.name,
+                CONF_MIN_CYCLE_TIME,
+                CONF_MAX_CYCLE_TIME,
+                ALGORITHM_MPC,
+                ALGORITHM_SMITH,
+            )
+            return None
+        return AdaptiveCycle(
+            minimum,
+            maximum,
+            config.get(CONF_ADAPTIVE_ERROR, DEFAULT_ADAPTIVE_ERROR),
+            config.get(CONF_ADAPTIVE_RATE, DEFAULT_ADAPTIVE_RATE),
+        )
+
+    def _plant_model(self, config: Any) -> PlantModel | None:
+        """Return the process model of the algorithm, or fall back to pid."""
+        model = config.get(CONF_MODEL)
+        if not model:
+            _LOGGER.error(
+                "PID controller %s uses %s without a %s, falling back to %s",
+                self.name,
+                self._algorithm,
+                CONF_MODEL,
+                ALGORITHM_PID,
+            )
+            self._algorithm = ALGORITHM_PID
+            return None
+        return PlantModel(
+            gain=model[CONF_MODEL_GAIN],
+            time_constant=_as_seconds(model[CONF_MODEL_TIME_CONSTANT]),
+            dead_time=_as_seconds(
+                model.get(CONF_MODEL_DEAD_TIME, DEFAULT_MODEL_DEAD_TIME)
+            ),
+        )
+
+    def _create_smith_predictor(self, config: Any) -> SmithPredictor | None:
+        """Create the Smith predictor, if configured."""
+        if self._algorithm != ALGORITHM_SMITH:
+            return None
+        if (model := self._plant_model(config)) is None:
+            return None
+        return SmithPredictor(model, self._cycle_seconds)
+
+    def _create_mpc(self, config: Any) -> ModelPredictiveController | None:
+        """Create the model predictive controller, if configured."""
+        if self._algorithm != ALGORITHM_MPC:
+            return None
+        if (model := self._plant_model(config)) is None:
+            return None
+        return ModelPredictiveController(
+            model,
+            self._cycle_seconds,
+            config.get(CONF_MPC_HORIZON, DEFAULT_MPC_HORIZON),
+            config.get(CONF_MPC_MOVE_SUPPRESSION, DEFAULT_MPC_MOVE_SUPPRESSION),
+        )
 
     async def async_added_to_hass(self) -> None:
         """Handle entity about to be added to hass event."""
         await super().async_added_to_hass()
+        self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ENTITIES, {})[
+            self.entity_id
+        ] = self
+        self._join_output_group()
+        self._async_track_bindings()
+        self.async_on_remove(self._async_untrack_bindings)
         start_pid_controller = False
         # Restore state and cycle timer info
         if last_state := await self.async_get_last_state():
             try:
                 # restore the enabled state
                 start_pid_controller = last_state.attributes.get(ATTR_PID_ENABLE, False)
+                # The gains and limits of the preset; the setpoint as it was
+                if (preset := last_state.attributes.get(ATTR_PRESET)) in self._presets:
+                    self._apply_preset(preset)
                 await self.async_set_native_value(float(last_state.state))
             except (ValueError, TypeError) as ex:
                 _LOGGER.warning(
                     "Failed to restore last state for %s: %s!", self.name, ex
                 )
 
+        # The entities on other platforms follow the restored controller
+        async_dispatcher_send(
+            self.hass, SIGNAL_CONTROLLER_ADDED.format(self.controller_key), self
+        )
+
         # After full startup, set outputs and timers & communicate
         # states to the physical outputs
         @callback
         async def _async_startup(*_) -> None:  # noqa: ANN002
             # Request min- and max values from HA, and clip the output
-            # of the PID regulator to that
-            entity = self.hass.states.get(self._output)
-            if entity:
-                self._output_domain = entity.domain
-                attr_min = entity.attributes.get("min", 0.0)
-                attr_max = entity.attributes.get("max", 100.0)
-                self._output_step = entity.attributes.get("step", 0.01)
-                # Set min/max for output
-                self._pid.set_output_limits(attr_min, attr_max)
+            # of the PID regulator to that. Later changes are tracked.
+            for channel in self._channels:
+                state = self.hass.states.get(channel.entity_id)
+                channel.track(state)
+                self._async_bind_output(channel, state)
+            if self._mqtt is not None:
+                await self._async_start_mqtt()
             # Start PID controller cycles
             await self._async_start_pid_cycle()
             if start_pid_controller:
-                await self.async_turn_on()
+                try:
+                    await self.async_turn_on()
+                except ServiceValidationError as err:
+                    _LOGGER.warning("PID controller stays in manual mode: %s", err)
 
         if self.hass.state == CoreState.running:
             await _async_startup()
         else:
             self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, _async_startup)
 
+    async def _async_start_mqtt(self) -> None:
+        """Subscribe to the MQTT input topics of the fast path."""
+        if not await self._mqtt.async_start(self.hass):
+            _LOGGER.error(
+                "MQTT is not available, PID controller %s uses its entities",
+                self.name,
+            )
+            self._mqtt = None
+            self._mirror = None
+            return
+        self.async_on_remove(self._mqtt.async_stop)
+        if self._mqtt.output_topic:
+            self._channel.publish = self._async_publish_output
+
+    async def _async_publish_output(self, value: float) -> None:
+        """Publish a new value of the main output on MQTT."""
+        await self._mqtt.async_publish(self.hass, value)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Handle entity which will be removed."""
+        await super().async_will_remove_from_hass()
+        self.hass.data[DOMAIN][DATA_ENTITIES].pop(self.entity_id, None)
+        for child in self._children:
+            self.hass.async_create_task(child.async_remove())
+        if self._group is not None:
+            self._group.remove(self)
+            if not self._group:
+                self.hass.data[DOMAIN][DATA_GROUPS].pop(self._group.output, None)
+            self._group = None
+        for problem in self._health.problems:
+            ir.async_delete_issue(self.hass, DOMAIN, f"{problem}_{self.entity_id}")
+
+    @callback
+    def _async_track_bindings(self) -> None:
+        """(Re)subscribe to registry and state changes of the bound entities."""
+        self._async_untrack_bindings()
+        outputs = [channel.entity_id for channel in self._channels]
+        entity_ids = [
+            entity_id
+            for entity_id in (self._input_1, self._input_2, *outputs)
+            if entity_id
+        ]
+        self._unsub_bindings = [
+            async_track_entity_registry_updated_event(
+                self.hass, entity_ids, self._async_binding_updated
+            ),
+            async_track_state_change_event(
+                self.hass, outputs, self._async_output_changed
+            ),
+        ]
+
+    @callback
+    def _async_untrack_bindings(self) -> None:
+        """Unsubscribe from the bound entities."""
+        while self._unsub_bindings:
+            self._unsub_bindings.pop()()
+
+    @callback
+    def _async_binding_updated(
+        self, event: Event[EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Follow a bound entity that was renamed in the entity registry."""
+        if event.data["action"] != "update" or "old_entity_id" not in event.data:
+            return
+        old_entity_id = event.data["old_entity_id"]
+        entity_id = event.data["entity_id"]
+        _LOGGER.info(
+            "PID controller %s follows rename of %s to %s",
+            self.name,
+            old_entity_id,
+            entity_id,
+        )
+        entity_id = sys.intern(entity_id)
+        if self._input_1 == old_entity_id:
+            self._input_1 = entity_id
+        if self._input_2 == old_entity_id:
+            self._input_2 = entity_id
+        if self._channel.entity_id == old_entity_id:
+            self._rename_output_group(old_entity_id, entity_id)
+        for channel in self._channels:
+            if channel.entity_id == old_entity_id:
+                channel.entity_id = entity_id
+                self._async_bind_output(channel, self.hass.states.get(entity_id))
+        self._async_track_bindings()
+        self.async_write_ha_state()
+        self._async_store_rename(old_entity_id, entity_id)
+
+    @callback
+    def _async_store_rename(self, old_entity_id: str, entity_id: str) -> None:
+        """Keep a followed rename after a restart: in the entry, or by a repair."""
+        entry = self.platform.config_entry
+        if entry is None:
+            # Set up from YAML, which only the user can edit
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                f"renamed_{old_entity_id}_{self.entity_id}",
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key="renamed",
+                translation_placeholders={
+                    "name": self.name,
+                    "old_entity_id": old_entity_id,
+                    "entity_id": entity_id,
+                },
+            )
+            return
+        self.hass.config_entries.async_update_entry(
+            entry, options=_renamed(entry.options, old_entity_id, entity_id)
+        )
+
+    @callback
+    def _async_output_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Refresh the output binding when an output entity changes."""
+        new_state = event.data["new_state"]
+        for channel in self._channels:
+            if channel.entity_id != event.data["entity_id"]:
+                continue
+            value = channel.track(new_state)
+            if channel is self._channel and value is not None and not self._pid.in_auto:
+                # Track the actuator in manual mode, for a bumpless transfer
+                self._pid.output = value
+            self._async_bind_output(channel, new_state)
+
+    @callback
+    def _async_bind_output(self, channel: OutputChannel, state: State | None) -> None:
+        """Take domain, limits and step from an output entity, if they changed."""
+        limits = channel.bind(self.hass, state)
+        if limits is not None and channel is self._channel:
+            # Set min/max for output
+            self._pid.set_output_limits(limits[0], limits[1])
+
+    def _rename_output_group(self, old_entity_id: str, entity_id: str) -> None:
+        """Move the output group along with a renamed output entity."""
+        if self._group is None:
+            return
+        groups = self.hass.data[DOMAIN][DATA_GROUPS]
+        if groups.get(old_entity_id) is self._group:
+            groups[entity_id] = groups.pop(old_entity_id)
+            self._group.output = entity_id
+
+    def _join_output_group(self) -> None:
+        """Join the group of controllers sharing the output entity."""
+        function = self._output_combine
+        if function == COMBINE_NONE:
+            return
+        groups = self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_GROUPS, {})
+        group = groups.get(self._channel.entity_id)
+        if group is None:
+            group = groups[self._channel.entity_id] = OutputGroup(
+                self._channel.entity_id, function
+            )
+        elif group.function != function:
+            _LOGGER.warning(
+                "PID controller %s uses %s for %s, but its group uses %s",
+                self.name,
+                function,
+                self._channel.entity_id,
+                group.function,
+            )
+        adaptive = self._adaptive
+        group.add(
+            self,
+            self._output_weight,
+            self._cycle_seconds if adaptive is None else adaptive.maximum,
+        )
+        self._group = group
+
     @property
     def name(self) -> str:
         """Return the name of the sensor."""
-        return self._config[CONF_NAME]
+        return self._name
 
     @property
     def should_poll(self) -> bool:
@@ -216,14 +955,159 @@ class PidEntity(RestoreNumber, PidBaseClass):
 
     async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
-        if math.isnan(value):
-            _LOGGER.warning(
-                "PID controller %s received invalid value: %s!", self.name, value
+        async with self._cycle_lock:
+            if math.isnan(value):
+                _LOGGER.warning(
+                    "PID controller %s received invalid value: %s!", self.name, value
+                )
+            else:
+                self._set_setpoint(value)
+                self.schedule_update_ha_state()
+
+    def _set_setpoint(self, value: float) -> None:
+        """Set a new setpoint target, without writing the state."""
+        # A manually set value ends a running setpoint profile
+        self._setpoint_profile = None
+        self._attr_native_value = value
+        self._speed_up_cycle()
+        self._core.set_target(value)
+
+    def _set_tunings(
+        self,
+        kp: float | None = None,
+        ki: float | None = None,
+        kd: float | None = None,
+    ) -> None:
+        """Change one or more gains, keeping the others, without a bump."""
+        self._core.set_tunings(
+            self._pid.kp if kp is None else kp,
+            self._pid.ki if ki is None else ki,
+            self._pid.kd if kd is None else kd,
+        )
+
+    async def async_set_kp(self, value: float) -> None:
+        """Set the proportional gain."""
+        async with self._cycle_lock:
+            self._set_tunings(kp=value)
+            self.async_write_ha_state()
+
+    async def async_set_ki(self, value: float) -> None:
+        """Set the integration gain."""
+        async with self._cycle_lock:
+            self._set_tunings(ki=value)
+            self.async_write_ha_state()
+
+    async def async_set_kd(self, value: float) -> None:
+        """Set the differential gain."""
+        async with self._cycle_lock:
+            self._set_tunings(kd=value)
+            self.async_write_ha_state()
+
+    @property
+    def presets(self) -> list[str]:
+        """Return the names of the presets."""
+        return list(self._presets)
+
+    @property
+    def preset(self) -> str | None:
+        """Return the name of the active preset."""
+        return self._preset
+
+    async def async_set_preset(self, preset: str) -> None:
+        """Switch to a preset in place, without a bump in the output."""
+        async with self._cycle_lock:
+            if preset not in self._presets:
+                msg = f"Unknown preset {preset} for {self.name}"
+                raise ServiceValidationError(msg)
+            self._apply_preset(preset)
+            self.async_write_ha_state()
+            self._async_update_children()
+
+    def _apply_preset(self, name: str) -> None:
+        """Apply limits, gains and setpoint of a preset, without writing the state."""
+        preset = self._presets[name].over(self._configured)
+        self._attr_native_min_value = preset.minimum
+        self._attr_native_max_value = preset.maximum
+        self._set_tunings(preset.kp, preset.ki, preset.kd)
+        value = self._attr_native_value if preset.setpoint is None else preset.setpoint
+        value = min(max(value, self.native_min_value), self.native_max_value)
+        if preset.setpoint is not None or value != self._attr_native_value:
+            self._set_setpoint(value)
+        self._preset = name
+
+    async def async_set_manual_output(self, value: float) -> None:
+        """Take the loop over in manual mode and write the output directly."""
+        async with self._cycle_lock:
+            if self._pid.in_auto:
+                await self._turn(PIDConst.MANUAL, write_state=False)
+            await self._async_write_output(value)
+            if self._channel.value is not None:
+                self._pid.output = self._channel.value
+            self.async_write_ha_state()
+            self._async_update_children()
+
+    def validate_bulk_update(self, data: Mapping[str, Any]) -> None:
+        """Raise if a bulk update cannot be applied to this controller."""
+        if data.get(ATTR_ENABLE):
+            # Raises when an input or the output has no value to start from
+            self._live_values()
+        value = data.get(ATTR_VALUE)
+        if value is not None and not (
+            self.native_min_value <= value <= self.native_max_value
+        ):
+            msg = (
+                f"Setpoint {value} for {self.name} is outside "
+                f"{self.native_min_value} - {self.native_max_value}"
             )
-        else:
-            self._pid.setpoint = value
-            self._attr_native_value = self._pid.setpoint
-            self.schedule_update_ha_state()
+            raise ServiceValidationError(msg)
+
+    async def async_bulk_update(self, data: Mapping[str, Any]) -> None:
+        """Apply gains, setpoint and enable flag with a single state write."""
+        async with self._cycle_lock:
+            self._set_tunings(
+                data.get(CONF_PID_KP), data.get(CONF_PID_KI), data.get(CONF_PID_KD)
+            )
+            if (value := data.get(ATTR_VALUE)) is not None:
+                self._set_setpoint(value)
+            if (enable := data.get(ATTR_ENABLE)) is not None:
+                await self._turn(
+                    PIDConst.AUTOMATIC if enable else PIDConst.MANUAL, write_state=False
+                )
+            self.async_write_ha_state()
+
+    async def async_set_setpoint_profile(self, profile: list[dict[str, Any]]) -> None:
+        """Load a timed setpoint profile, interpolated every cycle."""
+        points = [
+            (_as_seconds(point[ATTR_OFFSET]), point[ATTR_VALUE]) for point in profile
+        ]
+        for _, value in points:
+            if not self.native_min_value <= value <= self.native_max_value:
+                msg = (
+                    f"Setpoint {value} of profile for {self.name} is outside "
+                    f"{self.native_min_value} - {self.native_max_value}"
+                )
+                raise ServiceValidationError(msg)
+        async with self._cycle_lock:
+            if min(offset for offset, _ in points) > 0:
+                # Ramp from the current setpoint to the first point
+                points.append((0.0, self._attr_native_value))
+            start = dt_util.utcnow().timestamp()
+            self._setpoint_profile = SetpointProfile(start, points)
+            self._attr_native_value = self._setpoint_profile.value(start)
+            # The whole profile is one step, towards its last point
+            self._core.metrics.start_step(
+                self._setpoint_profile.value(self._setpoint_profile.end)
+            )
+            self.async_write_ha_state()
+
+    def _advance_setpoint(self, elapsed: float) -> None:
+        """Follow the setpoint profile and ramp, once per cycle."""
+        if self._setpoint_profile is not None:
+            wall_time = dt_util.utcnow().timestamp()
+            self._attr_native_value = self._setpoint_profile.value(wall_time)
+            if self._setpoint_profile.finished(wall_time):
+                self._setpoint_profile = None
+        self._core.advance_setpoint(self._attr_native_value, elapsed)
 
     @property
     def unique_id(self) -> str | None:
@@ -239,31 +1123,47 @@ class PidEntity(RestoreNumber, PidBaseClass):
             name=self.name,
         )
 
-    async def _turn(self, mode: int) -> None:
-        input_2 = math.nan
-        if self._input_2:
-            state_i2 = self.hass.states.get(self._input_2)
-            if state_i2:
-                input_2 = float(state_i2.state)
-        state_i1 = self.hass.states.get(self._input_1)
-        state_o = self.hass.states.get(self._output)
-        if state_i1 and state_o:
-            self._pid.set_mode(
-                mode,
-                float(state_i1.state),
-                float(state_o.state),
-                input_2,
-            )
-        self._attr_extra_state_attributes.update(self.pid_state_attributes)
-        self.schedule_update_ha_state()
+    def _live_values(self) -> tuple[float, float, float]:
+        """Return input 1, input 2 and the output; raise if one is no number."""
+        values = []
+        for entity_id in (self._input_1, self._input_2, self._channel.entity_id):
+            if not entity_id:
+                values.append(math.nan)
+                continue
+            state = self.hass.states.get(entity_id)
+            try:
+                value = math.nan if state is None else float(state.state)
+            except ValueError:
+                value = math.nan
+            if math.isnan(value):
+                msg = f"{self.name} cannot start: {entity_id} has no numeric state"
+                raise ServiceValidationError(msg)
+            values.append(value)
+        return values[0], values[1], values[2]
+
+    async def _turn(self, mode: int, *, write_state: bool = True) -> None:
+        if mode == PIDConst.MANUAL:
+            self._core.stop()
+        elif self._core.start(*self._live_values()):
+            self._speed_up_cycle()
+        if self._group is not None:
+            if self._pid.in_auto:
+                # Part of the next round, also before its first output
+                self._group.activate(self, time.monotonic())
+            else:
+                self._group.withdraw(self)
+        if write_state:
+            self.schedule_update_ha_state()
 
     async def async_turn_on(self) -> None:
         """Turn the entity on."""
-        await self._turn(PIDConst.AUTOMATIC)
+        async with self._cycle_lock:
+            await self._turn(PIDConst.AUTOMATIC)
 
     async def async_turn_off(self) -> None:
         """Turn the entity off."""
-        await self._turn(PIDConst.MANUAL)
+        async with self._cycle_lock:
+            await self._turn(PIDConst.MANUAL)
 
     @property
     def input_1(self) -> str:
@@ -278,37 +1178,169 @@ class PidEntity(RestoreNumber, PidBaseClass):
     @property
     def output(self) -> str:
         """Return output entity name."""
-        return self._output
+        return self._channel.entity_id
+
+    @property
+    def channels(self) -> tuple[OutputChannel, ...]:
+        """Return the output channels, the main output first."""
+        return self._channels
+
+    @property
+    def controller_key(self) -> str:
+        """Return the key the entities of this controller are found by."""
+        return self._attr_unique_id or self._name
+
+    @callback
+    def async_add_child(self, child: PidChildEntity) -> Callable[[], None]:
+        """Update an entity after every cycle; return the remove callback."""
+        self._children.append(child)
+        return lambda: self._children.remove(child)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """
+        Return a snapshot of the regulator, bindings, timing and last cycles.
+
+        Only reads: it does not take the cycle lock, so the control loop
+        never waits for it.
+        """
+        pid = self._pid
+        adaptive = self._adaptive
+        return {
+            "name": self._name,
+            "entity_id": self.entity_id,
+            "algorithm": self._algorithm,
+            "priority": self._priority,
+            "preset": self._preset,
+            "pid": {
+                "in_auto": pid.in_auto,
+                "direction": pid.controller_direction,
+                "kp": float(pid.kp),
+                "ki": float(pid.ki),
+                "kd": float(pid.kd),
+                "setpoint": float(pid.setpoint),
+                "output": float(pid.output),
+                "p_term": float(pid.pTerm),
+                "i_term": float(pid.iTerm),
+                "d_term": float(pid.dTerm),
+                "last_input": float(pid.last_input),
+                "last_error": float(pid.last_error),
+                "output_limit_min": float(pid.output_limit_min),
+                "output_limit_max": float(pid.output_limit_max),
+            },
+            "inputs": {
+                "input1": self._input_1,
+                "input2": self._input_2 or None,
+                "mqtt": self._mqtt is not None,
+            },
+            "outputs": [
+                {
+                    "entity_id": channel.entity_id,
+                    "adapter": None
+                    if channel.adapter is None
+                    else type(channel.adapter).__name__,
+                    "limits": channel.limits,
+                    "split": None
+                    if channel.split is None
+                    else [channel.split.start, channel.split.end],
+                    "value": channel.value,
+                    "commanded": channel.commanded,
+                    "reported": channel.reported,
+                    "pending": channel.pending_since is not None,
+                    "travel": channel.wear.travel,
+                    "reversals": channel.wear.reversals,
+                }
+                for channel in self._channels
+            ],
+            "timing": {
+                "cycle_time": self._cycle_seconds,
+                "cycle_period": None if adaptive is None else adaptive.period,
+                "last_cycle_start": str(self._attr_last_cycle_start),
+                "deferred_cycles": self._deferred_cycles,
+                "overruns": self._overruns,
+                "skipped_cycles": self._skipped_cycles,
+                "mpc_fallbacks": self._mpc_fallbacks,
+                **self._trace.statistics(),
+            },
+            "problems": sorted(self._health.problems),
+            "cycles": self._trace.rows(),
+        }
+
+    @callback
+    def _async_update_children(self) -> None:
+        """Let the entities that follow this controller write their state."""
+        for child in self._children:
+            child.async_controller_updated()
 
     @callback
     async def _async_pid_cycle(self, *_: Any) -> None:
-        """Cycle for PWM timed output."""
-        input_1_state = self.hass.states.get(self._input_1)
-        if input_1_state in (
-            STATE_UNAVAILABLE,
-            STATE_UNKNOWN,
+        """
+        Cycle for PWM timed output, unless deferred by the load governor.
+
+        Cycles and changes of the regulator run one at a time, so a slow
+        output write cannot let the next cycle or a service call interleave.
+        A tick that comes while the previous cycle still runs is an overrun,
+        handled by the overrun policy.
+        """
+        if self._cycle_lock.locked() and not self._overrun():
+            return
+        async with self._cycle_lock:
+            self._cycle_queued = False
+            if self._admitted():
+                start = time.perf_counter()
+                await self._async_run_cycle()
+                self._trace.time_cycle(time.perf_counter() - start)
+
+    def _overrun(self) -> bool:
+        """Count an overrun; return whether the tick waits for its turn."""
+        self._overruns += 1
+        policy = self._overrun_policy
+        if policy == OVERRUN_SKIP or (
+            policy == OVERRUN_QUEUE_LATEST and self._cycle_queued
         ):
-            _LOGGER.warning(
-                "Cannot fetch state of input %s for %s", self._input_1, self.name
-            )
-        else:
-            input_1 = float(input_1_state.state)
+            self._skipped_cycles += 1
+            return False
+        # With queue latest, only one tick waits: the ones after it are skipped
+        self._cycle_queued = policy == OVERRUN_QUEUE_LATEST
+        return True
+
+    def _admitted(self) -> bool:
+        """Return whether the load governor lets the cycle run now."""
+        governor = self.hass.data[DOMAIN].get(DATA_GOVERNOR)
+        if (
+            governor is not None
+            and self._pid.in_auto
+            and not governor.admit(self._priority, self._deferrals)
+        ):
+            # The next cycle covers the elapsed time of this one
+            self._deferrals += 1
+            self._deferred_cycles += 1
+            return False
+        self._deferrals = 0
+        return True
 
+    async def _async_run_cycle(self) -> None:
+        """Run one cycle: read the inputs, compute and write the output."""
+        start = time.perf_counter()
+        now = time.monotonic()
+        elapsed = now - self._last_cycle_time
+        self._last_cycle_time = now
+        self._advance_setpoint(elapsed)
+        mqtt_inputs = (
+            (math.nan, math.nan) if self._mqtt is None else self._mqtt.inputs(now)
+        )
+        input_1 = self._read_input(self._input_1, mqtt_inputs[0])
+        if not math.isnan(input_1):
             input_2 = math.nan
             if self._input_2:
-                input_2_state = self.hass.states.get(self._input_2)
-                if input_2_state in (
-                    STATE_UNAVAILABLE,
-                    STATE_UNKNOWN,
-                ):
-                    _LOGGER.warning(
-                        "Cannot fetch state of input %s for %s",
-                        self._input_2,
-                        self.name,
-                    )
-                else:
-                    input_2 = float(input_2_state.state)
-            if not self._pid.compute(input_1, input_2):
+                input_2 = self._read_input(self._input_2, mqtt_inputs[1])
+            measurement = measurement_of(input_1, input_2)
+            computed = self._core.compute(
+                input_1, input_2, self._attr_native_value, elapsed
+            )
+            if governor := self.hass.data[DOMAIN].get(DATA_GOVERNOR):
+                # Only the time on the event loop, not waiting for the output
+                governor.account(time.perf_counter() - start)
+            if not computed:
                 if self._pid.in_auto:
                     _LOGGER.warning(
                         "Something wrong with PID regulator"
@@ -317,18 +1349,185 @@ class PidEntity(RestoreNumber, PidBaseClass):
                         input_1,
                         input_2,
                     )
+                elif self._adaptive is not None:
+                    # Nothing to regulate in manual mode
+                    self._adaptive.period = self._adaptive.maximum
             else:
-                pid_val = (
-                    round(self._pid.output / self._output_step) * self._output_step
-                )  # Round off to step
-                await self.hass.services.async_call(
-                    domain=self._output_domain,
-                    service="set_value",
-                    service_data={
-                        "entity_id": self._output,
-                        "value": pid_val,
-                    },
+                self._trace.record(
+                    time.time(),
+                    elapsed,
+                    input_1,
+                    input_2,
+                    float(self._pid.setpoint),
+                    float(self._pid.output),
                 )
-                self._attr_last_cycle_start = dt_util.utcnow().replace(microsecond=0)
-                self._attr_extra_state_attributes.update(self.pid_state_attributes)
-                self.schedule_update_ha_state()
+                await self._async_cycle_computed(measurement, elapsed)
+
+    def _read_input(self, entity_id: str, value: float) -> float:
+        """Return an input: the value from MQTT, or the state of the entity."""
+        if not math.isnan(value):
+            return value
+        state = self.hass.states.get(entity_id)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            _LOGGER.warning(
+                "Cannot fetch state of input %s for %s", entity_id, self.name
+            )
+            return math.nan
+        return float(state.state)
+
+    async def _async_cycle_computed(self, measurement: float, elapsed: float) -> None:
+        """Post-process a computed cycle and write the output."""
+        if self._adaptive is not None:
+            self._adaptive.update(self._pid.last_error, elapsed)
+        pid_output = self._pid.output
+        if self._mpc is not None:
+            pid_output = await self._async_mpc_output(measurement, elapsed)
+        if self._group is not None:
+            # Only the member completing the round writes the output
+            pid_output = self._group.submit(self, pid_output, time.monotonic())
+        # With the MQTT fast path, the entities are only mirrored now and then
+        mirror = self._mirror is None or self._mirror.due(time.monotonic())
+        if pid_output is not None:
+            await self._async_write_output(pid_output, mirror=mirror, shape=True)
+        self._async_check_health()
+        self._attr_last_cycle_start = dt_util.utcnow().replace(microsecond=0)
+        if mirror:
+            self.schedule_update_ha_state()
+            self._async_update_children()
+
+    async def _async_start_pid_cycle(self) -> None:
+        """Start the controller cycles, at a fixed or an adaptive period."""
+        if self._adaptive is None:
+            await super()._async_start_pid_cycle()
+            return
+        self._async_schedule_cycle()
+        self.async_on_remove(self._async_stop_adaptive_cycle)
+
+    @callback
+    def _async_schedule_cycle(self) -> None:
+        """Schedule the next cycle after the current adaptive period."""
+        if self._unsub_cycle is not None:
+            self._unsub_cycle()
+        self._unsub_cycle = async_call_later(
+            self.hass, self._adaptive.period, self._async_adaptive_cycle
+        )
+
+    @callback
+    def _async_stop_adaptive_cycle(self) -> None:
+        """Stop the adaptive cycles."""
+        if self._unsub_cycle is not None:
+            self._unsub_cycle()
+        self._unsub_cycle = None
+        self._adaptive = None
+
+    async def _async_adaptive_cycle(self, _now: datetime) -> None:
+        """Run a cycle and schedule the next one."""
+        await self._async_pid_cycle()
+        if self._adaptive is not None:
+            self._async_schedule_cycle()
+
+    def _speed_up_cycle(self) -> None:
+        """Run the next cycle after the minimum period, e.g. on a new setpoint."""
+        adaptive = self._adaptive
+        if adaptive is None or adaptive.period == adaptive.minimum:
+            return
+        adaptive.speed_up()
+        if self._unsub_cycle is not None:
+            self._async_schedule_cycle()
+
+    async def _async_write_output(
+        self, value: float, *, mirror: bool = True, shape: bool = False
+    ) -> None:
+        """
+        Write a value to the output entity and the split-range outputs.
+
+        With shape, the wear-minimizing mode of each output applies. The main
+        output publishes on MQTT, if configured, and is only written to its
+        entity with mirror.
+        """
+        for channel in self._channels:
+            if not await channel.async_write(value, shape=shape, mirror=mirror):
+                _LOGGER.warning(
+                    "Output %s of %s is not available yet",
+                    channel.entity_id,
+                    self.name,
+                )
+
+    @callback
+    def _async_check_health(self) -> None:
+        """Check the output for an unresponsive actuator or a saturated loop."""
+        pending = [
+            channel.pending_since
+            for channel in self._channels
+            if channel.pending_since is not None
+        ]
+        pid = self._pid
+        changes = self._health.update(
+            time.monotonic(),
+            pending_since=min(pending, default=None),
+            saturated=not pid.output_limit_min < pid.output < pid.output_limit_max,
+        )
+        for problem, active in changes:
+            self._async_report_health(problem, active=active)
+
+    @callback
+    def _async_report_health(self, problem: str, *, active: bool) -> None:
+        """Raise or clear a repair issue and fire an event for a problem."""
+        issue_id = f"{problem}_{self.entity_id}"
+        self.hass.bus.async_fire(
+            EVENT_HEALTH,
+            {
+                ATTR_ENTITY_ID: self.entity_id,
+                ATTR_PROBLEM: problem,
+                ATTR_ACTIVE: active,
+            },
+        )
+        if not active:
+            _LOGGER.info(
+                "Output %s of %s recovered from %s", self.output, self.name, problem
+            )
+            ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+            return
+        _LOGGER.warning("Output %s of %s is %s", self.output, self.name, problem)
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key=problem,
+            translation_placeholders={"name": self.name, "output": self.output},
+        )
+
+    async def _async_mpc_output(self, measurement: float, elapsed: float) -> float:
+        """
+        Return the MPC output for this cycle.
+
+        The solver runs in the executor. When it does not finish within its
+        share of the cycle time, or the previous solve is still running, the
+        PID output of this cycle is used instead. The disturbance estimate
+        takes the measurement of every cycle either way.
+        """
+        output = self._pid.output
+        lower = self._pid.output_limit_min
+        upper = self._pid.output_limit_max
+        self._mpc.observe(measurement, elapsed)
+        if self._mpc_job is None or self._mpc_job.done():
+            problem = self._mpc.problem(self._pid.setpoint, output, lower, upper)
+            self._mpc_job = self.hass.async_add_executor_job(mpc_solve, problem)
+            try:
+                async with asyncio.timeout(self._cycle_seconds * MPC_TIMEOUT_FRACTION):
+                    output = await asyncio.shield(self._mpc_job)
+            except TimeoutError:
+                _LOGGER.debug("MPC solver of %s overran its time budget", self.name)
+                self._mpc_fallbacks += 1
+        else:
+            self._mpc_fallbacks += 1
+        self._mpc.commit(output)
+        # Let the PID integrator track the applied output, so that falling
+        # back to the PID output is bumpless.
+        self._pid.iTerm = min(
+            max(output - self._pid.pTerm - self._pid.dTerm, lower), upper
+        )
+        self._pid.output = output
+        return output
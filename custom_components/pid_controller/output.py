@@ -0,0 +1,320 @@
+"""
+Output adapters writing the controller output to its actuator.
+
+The default adapter calls the set_value service of the output domain. For
+outputs that live in this Home Assistant instance, the domain specific
+adapters call the entity directly: no service schema validation, context or
+task per write. When the entity cannot be resolved, they fall back to the
+service call.
+
+The quantizer snaps the output to the step grid of the output entity in
+decimal arithmetic, so written values never carry float noise. An output
+channel keeps adapter, quantizer, wear counters, last written and last
+reported value of one output entity together, optionally driven by a part of
+the controller output range for split-range control. A channel can also
+publish its values, e.g. on MQTT; the entity is then written as a mirror.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.input_number import DOMAIN as INPUT_NUMBER_DOMAIN
+from homeassistant.components.number import (
+    ATTR_VALUE,
+    SERVICE_SET_VALUE,
+)
+from homeassistant.components.number import (
+    DOMAIN as NUMBER_DOMAIN,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.helpers.entity_component import DATA_INSTANCES
+
+from .wear import ActuatorWear
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant, State
+
+
+class OutputQuantizer:
+    """
+    Snaps output values to the step grid and limits of the output entity.
+
+    round(value / step) * step gives values like 12.300000000000001 for a
+    step of 0.1. Here the step is kept as the decimal the entity reports,
+    so a quantized value is always the shortest float for its grid point.
+    """
+
+    __slots__ = ("_maximum", "_minimum", "_step")
+
+    def __init__(self, minimum: float, maximum: float, step: float) -> None:
+        """Initialize the quantizer from the attributes of the output entity."""
+        self._minimum = Decimal(str(minimum))
+        self._maximum = Decimal(str(maximum))
+        self._step = Decimal(str(step))
+
+    def quantize(self, value: float) -> float:
+        """Return the value on the step grid, within the limits."""
+        value = float(value)
+        if not math.isfinite(value):
+            msg = f"Output value {value} is not a finite number"
+            raise ValueError(msg)
+        # float() first: the repr of a numpy scalar is not a decimal number
+        exact = Decimal(repr(value))
+        if self._step > 0:
+            exact = (exact / self._step).to_integral_value() * self._step
+        return float(min(max(exact, self._minimum), self._maximum))
+
+
+class OutputAdapter:
+    """Writes the output through the service registry."""
+
+    __slots__ = ("domain", "entity_id", "hass")
+
+    def __init__(self, hass: HomeAssistant, entity_id: str, domain: str) -> None:
+        """Initialize the adapter for one output entity."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self.domain = domain
+
+    async def async_set_value(self, value: float) -> None:
+        """Write a value to the output."""
+        await self.hass.services.async_call(
+            domain=self.domain,
+            service=SERVICE_SET_VALUE,
+            service_data={
+                ATTR_ENTITY_ID: self.entity_id,
+                ATTR_VALUE: value,
+            },
+        )
+
+    def _resolve(self) -> Any:
+        """Return the in-process entity object, or None."""
+        component = self.hass.data.get(DATA_INSTANCES, {}).get(self.domain)
+        if component is None:
+            return None
+        return component.get_entity(self.entity_id)
+
+
+class InputNumberOutputAdapter(OutputAdapter):
+    """Writes an input_number entity directly."""
+
+    __slots__ = ()
+
+    async def async_set_value(self, value: float) -> None:
+        """Write a value to the output."""
+        if (entity := self._resolve()) is None:
+            await super().async_set_value(value)
+        else:
+            await entity.async_set_value(value)
+
+
+class NumberOutputAdapter(OutputAdapter):
+    """Writes a number entity directly, converting to its native unit."""
+
+    __slots__ = ()
+
+    async def async_set_value(self, value: float) -> None:
+        """Write a value to the output."""
+        if (entity := self._resolve()) is None:
+            await super().async_set_value(value)
+        else:
+            await entity.async_set_native_value(entity.convert_to_native_value(value))
+
+
+OUTPUT_ADAPTERS: dict[str, type[OutputAdapter]] = {
+    INPUT_NUMBER_DOMAIN: InputNumberOutputAdapter,
+    NUMBER_DOMAIN: NumberOutputAdapter,
+}
+
+
+def create_output_adapter(
+    hass: HomeAssistant, entity_id: str, domain: str, *, direct: bool = True
+) -> OutputAdapter:
+    """Return the adapter for an output entity."""
+    adapter = OUTPUT_ADAPTERS.get(domain, OutputAdapter) if direct else OutputAdapter
+    return adapter(hass, entity_id, domain)
+
+
+@dataclass(frozen=True, slots=True)
+class SplitRange:
+    """Part of the controller output range that drives one output."""
+
+    start: float
+    end: float
+    reverse: bool = False
+
+    def scale(self, value: float, minimum: float, maximum: float) -> float:
+        """Map the controller output on the range of the output entity."""
+        fraction = min(max((value - self.start) / (self.end - self.start), 0.0), 1.0)
+        if self.reverse:
+            fraction = 1.0 - fraction
+        return minimum + fraction * (maximum - minimum)
+
+
+class OutputChannel:
+    """One output entity: its adapter, step grid and last written value."""
+
+    __slots__ = (
+        "_direct",
+        "adapter",
+        "commanded",
+        "entity_id",
+        "limits",
+        "mirrored",
+        "pending_since",
+        "publish",
+        "quantizer",
+        "reported",
+        "split",
+        "value",
+        "wear",
+    )
+
+    def __init__(
+        self,
+        entity_id: str,
+        *,
+        direct: bool,
+        split: SplitRange | None = None,
+        wear: ActuatorWear | None = None,
+    ) -> None:
+        """Initialize an unbound channel."""
+        self._direct = direct
+        self.entity_id = sys.intern(entity_id)
+        self.split = split
+        self.wear = ActuatorWear() if wear is None else wear
+        self.adapter: OutputAdapter | None = None
+        self.limits: tuple[float, float, float] | None = None
+        self.quantizer: OutputQuantizer | None = None
+        # Last value sent and last value written to the entity, to never send
+        # the same value twice
+        self.value: float | None = None
+        self.mirrored: float | None = None
+        # Sends every new value, before the entity is written as a mirror
+        self.publish: Callable[[float], Awaitable[None]] | None = None
+        # Last value sent and reported, and since when the entity lags behind
+        self.commanded: float | None = None
+        self.reported: float | None = None
+        self.pending_since: float | None = None
+
+    def bind(
+        self, hass: HomeAssistant, state: State | None
+    ) -> tuple[float, float, float] | None:
+        """Take domain, limits and step from the entity; return new limits."""
+        if state is None:
+            return None
+        adapter = self.adapter
+        if (
+            adapter is None
+            or adapter.entity_id != state.entity_id
+            or adapter.domain != state.domain
+        ):
+            self.adapter = create_output_adapter(
+                hass, state.entity_id, state.domain, direct=self._direct
+            )
+            self.value = None
+            self.mirrored = None
+            self.commanded = None
+            self.pending_since = None
+        limits = (
+            state.attributes.get("min", 0.0),
+            state.attributes.get("max", 100.0),
+            state.attributes.get("step", 0.01),
+        )
+        if limits == self.limits:
+            return None
+        self.limits = limits
+        self.quantizer = OutputQuantizer(*limits)
+        self.value = None
+        self.mirrored = None
+        return limits
+
+    def track(self, state: State | None) -> float | None:
+        """Return the value of the entity, noticing changes made by others."""
+        try:
+            value = None if state is None else float(state.state)
+        except ValueError:
+            value = None
+        self.reported = value
+        if self._follows(value):
+            self.pending_since = None
+        # A published value shows in the entity only when it is mirrored
+        ours = self.value if self.publish is None else self.mirrored
+        if value not in (ours, self.value) and (ours is not None or self.value is None):
+            # Changed by someone else: write the next value, even if unchanged
+            self.value = None
+            self.mirrored = None
+            if value is not None:
+                # Moves are measured from where the actuator really is
+                self.wear.position = value
+        return value
+
+    async def async_write(
+        self, value: float, *, shape: bool = False, mirror: bool = True
+    ) -> bool:
+        """
+        Write the value if it changed; False while the entity is not bound.
+
+        With shape, moves that the wear-minimizing mode holds back are not
+        written; manual values always are. With a publish function, new
+        values are published and the entity only follows when mirror is set.
+        """
+        if self.adapter is None or self.quantizer is None or self.limits is None:
+            return False
+        if self.split is not None:
+            value = self.split.scale(value, self.limits[0], self.limits[1])
+        value = self.quantizer.quantize(value)
+        if value != self.value and (
+            not shape or self.wear.admit(value, self.limits[0], self.limits[1])
+        ):
+            sent = self.value
+            # Set first, so the state of our own write is not taken as a change
+            self.value = value
+            try:
+                if self.publish is not None:
+                    await self.publish(value)
+                else:
+                    await self._async_mirror(value)
+            except Exception:
+                # Not written: send it again next cycle
+                self.value = sent
+                raise
+            self.wear.record(value, time.monotonic())
+            self.commanded = value
+            if self._follows(self.reported):
+                self.pending_since = None
+            elif self.pending_since is None:
+                self.pending_since = time.monotonic()
+        if (
+            mirror
+            and self.publish is not None
+            and self.value is not None
+            and self.value != self.mirrored
+        ):
+            await self._async_mirror(self.value)
+        return True
+
+    async def _async_mirror(self, value: float) -> None:
+        """Write the value to the entity; kept as written only when it was."""
+        mirrored = self.mirrored
+        self.mirrored = value
+        try:
+            await self.adapter.async_set_value(value)
+        except Exception:
+            self.mirrored = mirrored
+            raise
+
+    def _follows(self, value: float | None) -> bool:
+        """Return whether a reported value is the commanded one, within a step."""
+        if value is None or self.commanded is None:
+            return False
+        step = self.limits[2] if self.limits is not None else 0.0
+        return abs(value - self.commanded) <= step / 2
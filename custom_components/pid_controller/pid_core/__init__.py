@@ -0,0 +1,8 @@
+"""
+Control core of the PID controller, without Home Assistant.
+
+The regulator and what runs around it, the loop metrics and the replay tool.
+The package imports neither Home Assistant nor the integration: the
+integration imports it as pid_core, and the tests and the replay tool load it
+on its own.
+"""
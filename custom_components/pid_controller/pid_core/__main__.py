@@ -0,0 +1,29 @@
+"""
+Run the replay tool without Home Assistant.
+
+    python custom_components/pid_controller/pid_core history.csv --kp 2 ...
+
+Run as a directory, the package is loaded from its path as pid_core:
+imported through the integration, it would import Home Assistant.
+"""
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+
+def _load_package() -> None:
+    """Import this directory as the top-level package pid_core."""
+    package = Path(__file__).parent
+    spec = importlib.util.spec_from_file_location(
+        "pid_core", package / "__init__.py", submodule_search_locations=[str(package)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+
+if __name__ == "__main__":
+    _load_package()
+    sys.exit(importlib.import_module("pid_core.replay").main())
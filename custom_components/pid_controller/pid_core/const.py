@@ -0,0 +1,16 @@
+"""Constants of the control core, shared with the PID Controller integration."""
+
+PID_DIR_DIRECT = "direct"
+PID_DIR_REVERSE = "reverse"
+
+DERIVATIVE_ON_MEASUREMENT = "measurement"
+DERIVATIVE_ON_ERROR = "error"
+
+DEFAULT_PID_KI = 1.0
+DEFAULT_PID_KP = 0.1
+DEFAULT_PID_KD = 0.0
+
+DEFAULT_SETPOINT_RAMP_RATE = 0.0
+DEFAULT_DERIVATIVE_ON = DERIVATIVE_ON_MEASUREMENT
+DEFAULT_DERIVATIVE_FILTER = 0.0
+DEFAULT_SETPOINT_WEIGHT_P = 1.0
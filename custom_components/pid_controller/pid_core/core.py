@@ -0,0 +1,199 @@
+"""
+Control core of the PID controller, without Home Assistant.
+
+Inputs in, output out, with an explicit time step: the core runs the same
+in the entity, in the replay tool and in tests, and a cycle takes
+microseconds. The entity only adds the plumbing: reading states, writing
+the output entity and the attributes.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import TYPE_CHECKING, Any
+
+from dvg_pid_controller import Constants as PIDConst
+
+from .metrics import LoopMetrics
+from .setpoint import ramp
+
+if TYPE_CHECKING:
+    from .derivative import DerivativeTerm
+    from .smith import SmithPredictor
+
+
+def measurement_of(input_1: float, input_2: float) -> float:
+    """Return the controlled value: input 1, or input 2 - input 1."""
+    return input_1 if math.isnan(input_2) else input_2 - input_1
+
+
+class ControllerCore:
+    """
+    One loop: the regulator of dvg_pid_controller and what runs around it.
+
+    Every cycle the setpoint ramps towards its target, the regulator computes
+    with the given time step, the loop metrics are updated and the filtered
+    derivative term replaces the raw one. With a Smith predictor the
+    regulator computes on the measurement corrected for the dead time.
+
+    With a setpoint weight b below 1, the proportional term acts on
+    b * setpoint - measurement: disturbances meet the full gain, a setpoint
+    step only a part of it, and the integrator takes the loop to the
+    setpoint without the overshoot of the full proportional kick.
+    """
+
+    __slots__ = (
+        "derivative",
+        "metrics",
+        "pid",
+        "predictor",
+        "ramp_rate",
+        "setpoint_weight",
+    )
+
+    def __init__(
+        self,
+        pid: Any,
+        *,
+        ramp_rate: float = 0.0,
+        derivative: DerivativeTerm | None = None,
+        predictor: SmithPredictor | None = None,
+        setpoint_weight: float = 1.0,
+    ) -> None:
+        """Initialize the core around a regulator; ramp rate in units/second."""
+        self.pid = pid
+        self.ramp_rate = ramp_rate
+        self.setpoint_weight = setpoint_weight
+        # Only kept when it differs from the raw term of the regulator
+        self.derivative = (
+            derivative if derivative is not None and derivative.active else None
+        )
+        self.predictor = predictor
+        self.metrics = LoopMetrics()
+
+    def set_target(self, target: float) -> None:
+        """Take a new setpoint target, at once unless it is ramped; a new step."""
+        self.metrics.start_step(target)
+        if self.ramp_rate <= 0 or not self.pid.in_auto:
+            self.pid.setpoint = target
+
+    def advance_setpoint(self, target: float, elapsed: float) -> None:
+        """Move the setpoint of the regulator towards the target."""
+        pid = self.pid
+        if self.ramp_rate > 0 and pid.in_auto:
+            pid.setpoint = ramp(pid.setpoint, target, self.ramp_rate * elapsed)
+        else:
+            pid.setpoint = target
+
+    def compute(
+        self, input_1: float, input_2: float, target: float, elapsed: float
+    ) -> bool:
+        """Compute the output over the elapsed time; False in manual mode."""
+        pid = self.pid
+        measurement = measurement_of(input_1, input_2)
+        if self.predictor is not None:
+            if pid.in_auto:
+                # The model runs per cycle, also over cycles that were deferred
+                self.predictor.catch_up(elapsed, float(pid.output))
+            # The measurement is input 1, or input 2 - input 1
+            if math.isnan(input_2):
+                input_1 += self.predictor.correction
+            else:
+                input_2 += self.predictor.correction
+        # The regulator takes its time step from the clock: set it explicitly
+        pid.last_time = time.perf_counter() - elapsed
+        if not pid.compute(input_1, input_2):
+            return False
+        self.metrics.update(target, measurement, elapsed)
+        if self.setpoint_weight != 1:
+            self._weight_setpoint()
+        if self.derivative is not None:
+            self.derivative.apply(pid, measurement_of(input_1, input_2), elapsed)
+        if self.predictor is not None:
+            self.predictor.update(float(pid.output))
+        return True
+
+    def cycle(
+        self, input_1: float, input_2: float, target: float, elapsed: float
+    ) -> float | None:
+        """Run one cycle; return the output, or None in manual mode."""
+        self.advance_setpoint(target, elapsed)
+        if not self.compute(input_1, input_2, target, elapsed):
+            return None
+        return float(self.pid.output)
+
+    def proportional_error(self) -> float:
+        """Return the error the proportional term acts on, b * setpoint - input."""
+        pid = self.pid
+        # From the setpoint now: it may have changed since the last cycle
+        return self.setpoint_weight * pid.setpoint - pid.last_input
+
+    def _weight_setpoint(self) -> None:
+        """Replace the proportional term of the regulator by the weighted one."""
+        pid = self.pid
+        pid.pTerm = pid.controller_direction * pid.kp * self.proportional_error()
+        pid.output = min(
+            max(pid.pTerm + pid.iTerm + pid.dTerm, pid.output_limit_min),
+            pid.output_limit_max,
+        )
+
+    def start(self, input_1: float, input_2: float, output: float) -> bool:
+        """Switch to automatic from the live output; False if already on."""
+        pid = self.pid
+        if pid.in_auto:
+            return False
+        if self.ramp_rate > 0:
+            # Ramp from the process value towards the setpoint
+            pid.setpoint = measurement_of(input_1, input_2)
+        pid.set_mode(PIDConst.AUTOMATIC, input_1, output, input_2)
+        if self.predictor is not None:
+            self.predictor.reset(output)
+        self.initialize_bumpless(output)
+        return True
+
+    def stop(self) -> None:
+        """Switch to manual: the output is no longer computed."""
+        self.pid.set_mode(PIDConst.MANUAL, math.nan, math.nan)
+
+    def set_tunings(self, kp: float, ki: float, kd: float) -> None:
+        """
+        Change the gains without a bump in the output.
+
+        A new proportional gain moves the output at once by the change of
+        the proportional term. With integral action the integrator takes
+        that change over, so the output continues from where it was.
+        """
+        pid = self.pid
+        error = self.proportional_error()
+        if pid.in_auto and pid.ki > 0 and ki > 0 and not math.isnan(error):
+            pid.iTerm = min(
+                max(
+                    pid.iTerm + pid.controller_direction * (pid.kp - kp) * error,
+                    pid.output_limit_min,
+                ),
+                pid.output_limit_max,
+            )
+        pid.set_tunings(kp, ki, kd, pid.controller_direction)
+
+    def initialize_bumpless(self, output: float) -> None:
+        """
+        Start automatic mode from the live actuator value.
+
+        The regulator initializes its integrator with the output, but the
+        first cycle adds the proportional term on top of it. Taking that term
+        off the integrator makes the first automatic output equal the output.
+        Without integral action the integrator is a fixed bias that would
+        never wind back, so the proportional term is kept then.
+        """
+        pid = self.pid
+        pid.output = output
+        if self.derivative is not None:
+            self.derivative.reset()
+        error = self.proportional_error()
+        if pid.ki <= 0 or math.isnan(error):
+            return
+        p_term = pid.controller_direction * pid.kp * error
+        pid.iTerm = min(
+            max(output - p_term, pid.output_limit_min), pid.output_limit_max
+        )
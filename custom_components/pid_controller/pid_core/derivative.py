@@ -0,0 +1,76 @@
+"""
+Filtered derivative term for the PID controller.
+
+The regulator of dvg_pid_controller takes the raw derivative of the
+measurement: every bit of sensor noise is amplified by Kd / dt. This module
+computes the derivative term with a first order low pass filter, on the
+measurement, on the error or on a weighted error, and replaces the term of
+the regulator.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from .const import DERIVATIVE_ON_ERROR
+
+
+class DerivativeTerm:
+    """
+    Derivative term with a first order filter, Kd * s / (1 + s / N).
+
+    N is the filter coefficient in 1/s: the derivative is filtered with a
+    time constant of 1 / N. N = 0 disables the filter. The term is taken of
+    c * setpoint - measurement: the setpoint weight c is 0 for the derivative
+    on the measurement and 1 for the derivative on the error, unless set.
+    """
+
+    __slots__ = ("_last", "filter_n", "value", "weight")
+
+    def __init__(
+        self, filter_n: float, derivative_on: str, weight: float | None = None
+    ) -> None:
+        """Initialize the derivative term."""
+        self.filter_n = filter_n
+        if weight is None:
+            weight = 1.0 if derivative_on == DERIVATIVE_ON_ERROR else 0.0
+        self.weight = weight
+        self._last = math.nan
+        self.value = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Return whether the term differs from the one of the regulator."""
+        return self.weight != 0 or self.filter_n > 0
+
+    def reset(self) -> None:
+        """Forget the history, e.g. after a transfer from manual to auto."""
+        self._last = math.nan
+        self.value = 0.0
+
+    def update(
+        self, kd: float, setpoint: float, measurement: float, elapsed: float
+    ) -> float:
+        """Return the derivative term for the next cycle."""
+        signal = self.weight * setpoint - measurement
+        if math.isnan(self._last) or elapsed <= 0:
+            self._last = signal
+            return self.value
+        time_constant = 1.0 / self.filter_n if self.filter_n > 0 else 0.0
+        # Backward Euler discretization of the filtered derivative
+        self.value = (time_constant * self.value + kd * (signal - self._last)) / (
+            time_constant + elapsed
+        )
+        self._last = signal
+        return self.value
+
+    def apply(self, pid: Any, measurement: float, elapsed: float) -> None:
+        """Replace the raw derivative term of the regulator by this one."""
+        pid.dTerm = pid.controller_direction * self.update(
+            pid.kd, pid.setpoint, measurement, elapsed
+        )
+        pid.output = min(
+            max(pid.pTerm + pid.iTerm + pid.dTerm, pid.output_limit_min),
+            pid.output_limit_max,
+        )
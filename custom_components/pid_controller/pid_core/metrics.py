@@ -0,0 +1,148 @@
+"""
+Streaming control quality metrics for the PID controller.
+
+Every update is O(1): the metrics are kept as running sums and a handful of
+markers, so they can be computed every cycle for every controller.
+"""
+
+from __future__ import annotations
+
+import math
+
+# Band around the setpoint, relative to the setpoint step, that counts as settled
+SETTLING_BAND = 0.02
+# Error zero crossings in a row with a steady period before a loop oscillates
+OSCILLATION_CROSSINGS = 4
+# Allowed deviation of a half period from the average, relative
+OSCILLATION_TOLERANCE = 0.5
+
+
+class LoopMetrics:
+    """
+    Control quality of one loop.
+
+    Tracks the integrated absolute and squared error since the start, and for
+    the last setpoint step the overshoot in percent of the step and the
+    settling time into a band around its target, as well as the period of a
+    sustained oscillation of the error.
+
+    A step starts at a discrete setpoint change only, announced with
+    start_step: a ramp or a profile moves the setpoint every cycle, but the
+    step lasts until its target is reached.
+    """
+
+    __slots__ = (
+        "_crossing_time",
+        "_crossings",
+        "_error_sign",
+        "_half_period",
+        "_inside",
+        "_last_outside",
+        "_peak",
+        "_pending",
+        "_step",
+        "_step_start",
+        "_target",
+        "_time",
+        "iae",
+        "ise",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self._time = 0.0
+        # Without a step announced, the first setpoint starts one
+        self._target = math.nan
+        self._pending = True
+        self._step = 0.0
+        self._step_start = 0.0
+        self._peak = 0.0
+        self._last_outside = 0.0
+        self._inside = True
+        self._error_sign = 0
+        self._crossing_time = 0.0
+        self._half_period = 0.0
+        self._crossings = 0
+        self.iae = 0.0
+        self.ise = 0.0
+
+    def start_step(self, target: float) -> None:
+        """Start a new step towards the target at the next update, if it moved."""
+        if target != self._target:
+            self._target = target
+            self._pending = True
+
+    def update(self, setpoint: float, measurement: float, elapsed: float) -> None:
+        """Add one cycle of the loop."""
+        self._time += elapsed
+        if math.isnan(self._target):
+            self._target = setpoint
+        if self._pending:
+            self._begin_step(measurement)
+        error = setpoint - measurement
+        self.iae += abs(error) * elapsed
+        self.ise += error * error * elapsed
+
+        # Overshoot: how far the measurement went past the target of the step
+        step_error = self._target - measurement
+        if self._step:
+            self._peak = max(self._peak, -step_error * math.copysign(1.0, self._step))
+        band = abs(self._step) * SETTLING_BAND
+        self._inside = abs(step_error) <= band
+        if not self._inside:
+            self._last_outside = self._time
+        # Oscillation: around the setpoint, also while it ramps
+        if abs(error) > band:
+            self._count_crossing(error, band)
+
+    def _begin_step(self, measurement: float) -> None:
+        """Restart the step metrics from the measurement."""
+        self._pending = False
+        self._step = self._target - measurement
+        self._step_start = self._time
+        self._last_outside = self._time
+        self._peak = 0.0
+
+    def _count_crossing(self, error: float, band: float) -> None:
+        """Track zero crossings of the error outside the settling band."""
+        sign = 1 if error > band else -1
+        if sign == self._error_sign:
+            return
+        if self._error_sign:
+            half_period = self._time - self._crossing_time
+            if self._crossings and (
+                abs(half_period - self._half_period)
+                > OSCILLATION_TOLERANCE * self._half_period
+            ):
+                self._crossings = 0
+            if self._crossings:
+                self._half_period += (half_period - self._half_period) / 2
+            else:
+                self._half_period = half_period
+            self._crossings += 1
+        self._error_sign = sign
+        self._crossing_time = self._time
+
+    @property
+    def overshoot(self) -> float:
+        """Return the overshoot of the last step, in percent of the step."""
+        if not self._step:
+            return 0.0
+        return 100.0 * self._peak / abs(self._step)
+
+    @property
+    def settling_time(self) -> float | None:
+        """Return the settling time of the last step, or None while outside."""
+        if not self._inside:
+            return None
+        return self._last_outside - self._step_start
+
+    @property
+    def oscillation_period(self) -> float | None:
+        """Return the period of a sustained oscillation, if any."""
+        if self._crossings < OSCILLATION_CROSSINGS:
+            return None
+        # A crossing that is overdue by far means the oscillation died out
+        if self._time - self._crossing_time > 2 * self._half_period:
+            return None
+        return 2 * self._half_period
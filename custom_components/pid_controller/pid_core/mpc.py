@@ -0,0 +1,194 @@
+"""
+Model predictive control for the PID controller.
+
+The solver works on a first order plus dead time model of the process and
+solves a small box-constrained quadratic problem every cycle. It is plain
+numpy without any Home Assistant dependencies, so it can be handed to an
+executor and never blocks the event loop.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+MPC_CONTROL_HORIZON = 3
+MPC_ITERATIONS = 200
+# Weight of the newest observation in the disturbance estimate
+MPC_DISTURBANCE_FILTER = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class PlantModel:
+    """First order plus dead time model of the controlled process."""
+
+    gain: float
+    time_constant: float
+    dead_time: float = 0.0
+
+    def discretize(self, cycle_time: float) -> tuple[float, float, int]:
+        """Return pole, input gain and dead time in cycles for a sample time."""
+        if self.time_constant > 0:
+            pole = math.exp(-cycle_time / self.time_constant)
+        else:
+            pole = 0.0
+        delay = round(self.dead_time / cycle_time) if cycle_time > 0 else 0
+        return pole, self.gain * (1.0 - pole), delay
+
+
+@dataclass(frozen=True, slots=True)
+class MpcProblem:
+    """Snapshot of one optimization, safe to hand over to a worker thread."""
+
+    pole: float
+    input_gain: float
+    disturbance: float
+    measurement: float
+    setpoint: float
+    pending_outputs: tuple[float, ...]
+    last_output: float
+    output_min: float
+    output_max: float
+    horizon: int
+    control_horizon: int
+    move_suppression: float
+
+
+def solve(problem: MpcProblem, iterations: int = MPC_ITERATIONS) -> float:
+    """
+    Solve the constrained MPC problem and return the first output move.
+
+    The prediction is linear in the future outputs (y = free + G u), so the
+    cost ||y - r||^2 + lambda ||du||^2 is a convex quadratic which is
+    minimized by projected gradient descent onto the output limits.
+    """
+    pred = problem.horizon
+    moves = max(1, min(problem.control_horizon, pred))
+    delay = len(problem.pending_outputs)
+
+    free = np.empty(pred)
+    forced = np.zeros((pred, moves))
+    level = problem.measurement
+    row = np.zeros(moves)
+    for k in range(pred):
+        applied = k - delay
+        known = problem.pending_outputs[k] if applied < 0 else 0.0
+        level = problem.pole * level + problem.input_gain * known
+        level += problem.disturbance
+        free[k] = level
+        row = problem.pole * row
+        if applied >= 0:
+            row[min(applied, moves - 1)] += problem.input_gain
+        forced[k] = row
+
+    diff = np.eye(moves) - np.eye(moves, k=-1)
+    first = np.zeros(moves)
+    first[0] = problem.last_output
+    error = free - problem.setpoint
+
+    hessian = forced.T @ forced + problem.move_suppression * diff.T @ diff
+    step_max = float(np.linalg.eigvalsh(hessian)[-1])
+    if step_max <= 0:
+        return float(
+            np.clip(problem.last_output, problem.output_min, problem.output_max)
+        )
+    step = 1.0 / step_max
+    linear = forced.T @ error - problem.move_suppression * diff.T @ first
+
+    outputs = np.full(moves, problem.last_output, dtype=float)
+    outputs = np.clip(outputs, problem.output_min, problem.output_max)
+    for _ in range(iterations):
+        gradient = hessian @ outputs + linear
+        outputs = np.clip(
+            outputs - step * gradient, problem.output_min, problem.output_max
+        )
+    return float(outputs[0])
+
+
+class ModelPredictiveController:
+    """Bookkeeping around the solver; lives on the event loop."""
+
+    def __init__(
+        self,
+        model: PlantModel,
+        cycle_time: float,
+        horizon: int,
+        move_suppression: float,
+    ) -> None:
+        """Initialize the controller for a fixed cycle time."""
+        self._cycle_time = cycle_time
+        self._pole, self._input_gain, delay = model.discretize(cycle_time)
+        self._horizon = horizon
+        self._move_suppression = move_suppression
+        # Outputs of the last dead time cycles, plus the one before them
+        self._history: deque[float] = deque(maxlen=delay + 1)
+        self._delay = delay
+        self._disturbance = 0.0
+        self._last_measurement: float | None = None
+        self._last_output: float | None = None
+
+    def observe(self, measurement: float, elapsed: float) -> None:
+        """
+        Update the disturbance estimate with the measurement of a cycle.
+
+        Runs every cycle, also when the previous problem is still being
+        solved. Over cycles that did not run, e.g. deferred ones, the model
+        is stepped with the output held.
+        """
+        if self._last_measurement is not None and self._last_output is not None:
+            held = self._last_output
+            steps = max(1, round(elapsed / self._cycle_time))
+            predicted = self._last_measurement
+            # Sum of the disturbance over the steps, as the solver adds it
+            weight = 0.0
+            for step in range(steps):
+                applied = self._history[0] if len(self._history) > self._delay else held
+                predicted = self._pole * predicted + self._input_gain * applied
+                weight = self._pole * weight + 1.0
+                if step < steps - 1:
+                    self._history.append(held)
+            self._disturbance += MPC_DISTURBANCE_FILTER * (
+                (measurement - predicted) / weight - self._disturbance
+            )
+        self._last_measurement = measurement
+
+    def problem(
+        self,
+        setpoint: float,
+        fallback_output: float,
+        output_min: float,
+        output_max: float,
+    ) -> MpcProblem:
+        """Build the next problem from the last observed measurement."""
+        last_output = (
+            self._last_output if self._last_output is not None else fallback_output
+        )
+        if math.isnan(last_output):
+            last_output = output_min
+        measurement = (
+            self._last_measurement if self._last_measurement is not None else math.nan
+        )
+        pending = list(self._history)[-self._delay :] if self._delay else []
+        pending = [last_output] * (self._delay - len(pending)) + pending
+        return MpcProblem(
+            pole=self._pole,
+            input_gain=self._input_gain,
+            disturbance=self._disturbance,
+            measurement=measurement,
+            setpoint=setpoint,
+            pending_outputs=tuple(pending),
+            last_output=last_output,
+            output_min=output_min,
+            output_max=output_max,
+            horizon=self._horizon,
+            control_horizon=MPC_CONTROL_HORIZON,
+            move_suppression=self._move_suppression,
+        )
+
+    def commit(self, output: float) -> None:
+        """Record the output that was actually applied this cycle."""
+        self._last_output = output
+        self._history.append(output)
@@ -0,0 +1,404 @@
+r"""
+Headless replay of recorded histories through the PID controller.
+
+Runs the recorded inputs and setpoints of a loop through the regulator with
+other gains, in virtual time, and reports the outputs the controller would
+have written and the quality metrics of the loop. The measurements are
+replayed as recorded: the new outputs do not act on a process.
+
+Two CSV layouts are read:
+
+- wide: a time column (timestamp, time, last_changed or last_updated) and
+  the columns input1, input2 and setpoint, in time order. It is read row
+  by row, so months of data need no memory.
+- recorder export: the columns entity_id, state and last_changed, as
+  exported from the history panel. The entities are mapped on input1,
+  input2 and setpoint with --entity. The export is grouped by entity: the
+  rows of the mapped entities are kept, and merged in time order.
+
+Usage, without Home Assistant:
+    python custom_components/pid_controller/pid_core history.csv \
+        --kp 2 --ki 0.01 --cycle-time 30 --entity input1=sensor.water \
+        --entity setpoint=number.pid --trace outputs.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import heapq
+import math
+import sys
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
+
+from dvg_pid_controller import Constants as PIDConst
+from dvg_pid_controller import PID_Controller
+
+from .const import (
+    DEFAULT_DERIVATIVE_FILTER,
+    DEFAULT_DERIVATIVE_ON,
+    DEFAULT_PID_KD,
+    DEFAULT_PID_KI,
+    DEFAULT_PID_KP,
+    DEFAULT_SETPOINT_RAMP_RATE,
+    DEFAULT_SETPOINT_WEIGHT_P,
+    DERIVATIVE_ON_ERROR,
+    DERIVATIVE_ON_MEASUREMENT,
+    PID_DIR_DIRECT,
+    PID_DIR_REVERSE,
+)
+from .core import ControllerCore
+from .derivative import DerivativeTerm
+from .metrics import LoopMetrics
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+INPUT1 = "input1"
+INPUT2 = "input2"
+SETPOINT = "setpoint"
+SIGNALS = (INPUT1, INPUT2, SETPOINT)
+TIME_COLUMNS = ("timestamp", "time", "last_changed", "last_updated")
+
+# One recorded change: (time in seconds since the epoch, signal, value)
+Sample = tuple[float, str, float]
+
+
+def _parse_time(value: str) -> float:
+    """Return a timestamp in seconds from an epoch number or ISO 8601 string."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def _parse_value(value: str) -> float:
+    """Return a recorded state, NaN when unavailable or unknown."""
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+
+def read_samples(
+    stream: TextIO, entities: dict[str, str] | None = None
+) -> Iterator[Sample]:
+    """Yield the samples of a wide CSV file or a recorder export."""
+    reader = csv.reader(stream)
+    header = [column.strip().lower() for column in next(reader)]
+    time_index = next((header.index(c) for c in TIME_COLUMNS if c in header), None)
+    if time_index is None:
+        msg = f"No time column found, expected one of {', '.join(TIME_COLUMNS)}"
+        raise ValueError(msg)
+
+    if "entity_id" in header:
+        signals = {entity: signal for signal, entity in (entities or {}).items()}
+        entity_index = header.index("entity_id")
+        state_index = header.index("state")
+        # Grouped by entity, each group in time order
+        groups: dict[str, list[Sample]] = {}
+        for row in reader:
+            if (signal := signals.get(row[entity_index])) is not None:
+                groups.setdefault(signal, []).append(
+                    (
+                        _parse_time(row[time_index]),
+                        signal,
+                        _parse_value(row[state_index]),
+                    )
+                )
+        yield from heapq.merge(
+            *(sorted(group) for group in groups.values()),
+            key=lambda sample: sample[0],
+        )
+        return
+
+    columns = [(header.index(s), s) for s in SIGNALS if s in header]
+    for row in reader:
+        timestamp = _parse_time(row[time_index])
+        for index, signal in columns:
+            if row[index]:
+                yield timestamp, signal, _parse_value(row[index])
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayConfig:
+    """Settings of the controller under test."""
+
+    kp: float = DEFAULT_PID_KP
+    ki: float = DEFAULT_PID_KI
+    kd: float = DEFAULT_PID_KD
+    direction: str = PID_DIR_DIRECT
+    cycle_time: float = 30.0
+    output_min: float = 0.0
+    output_max: float = 100.0
+    initial_output: float = 0.0
+    setpoint: float = math.nan
+    setpoint_ramp_rate: float = DEFAULT_SETPOINT_RAMP_RATE
+    derivative_on: str = DEFAULT_DERIVATIVE_ON
+    derivative_filter: float = DEFAULT_DERIVATIVE_FILTER
+    setpoint_weight_p: float = DEFAULT_SETPOINT_WEIGHT_P
+    setpoint_weight_d: float | None = None
+
+
+@dataclass(slots=True)
+class ReplayResult:
+    """Outputs and loop quality of one replay."""
+
+    metrics: LoopMetrics = field(default_factory=LoopMetrics)
+    cycles: int = 0
+    skipped: int = 0
+    output_min: float = math.inf
+    output_max: float = -math.inf
+    output_sum: float = 0.0
+    output_travel: float = 0.0
+    saturated: int = 0
+    last_output: float = math.nan
+
+    @property
+    def output_mean(self) -> float:
+        """Return the mean output."""
+        return self.output_sum / self.cycles if self.cycles else math.nan
+
+    def add(self, output: float, *, saturated: bool) -> None:
+        """Account for the output of one cycle."""
+        self.cycles += 1
+        self.output_min = min(self.output_min, output)
+        self.output_max = max(self.output_max, output)
+        self.output_sum += output
+        if not math.isnan(self.last_output):
+            self.output_travel += abs(output - self.last_output)
+        self.last_output = output
+        self.saturated += saturated
+
+
+class ReplayController:
+    """
+    The controller of a PidEntity, cycled in virtual time.
+
+    Runs the same control core as the entity, with the cycle time as the
+    time step.
+    """
+
+    def __init__(self, config: ReplayConfig) -> None:
+        """Initialize the controller."""
+        self.config = config
+        self.pid = PID_Controller(
+            config.kp,
+            config.ki,
+            config.kd,
+            PIDConst.DIRECT if config.direction == PID_DIR_DIRECT else PIDConst.REVERSE,
+        )
+        self.pid.set_output_limits(config.output_min, config.output_max)
+        self.core = ControllerCore(
+            self.pid,
+            # Setpoint ramp rate in units per second
+            ramp_rate=config.setpoint_ramp_rate / 60.0,
+            derivative=DerivativeTerm(
+                config.derivative_filter,
+                config.derivative_on,
+                config.setpoint_weight_d,
+            ),
+            setpoint_weight=config.setpoint_weight_p,
+        )
+
+    def cycle(self, input_1: float, input_2: float, setpoint: float) -> float | None:
+        """Run one cycle, return the output or None when it was skipped."""
+        if math.isnan(input_1) or math.isnan(setpoint):
+            return None
+        self.core.start(input_1, input_2, self.config.initial_output)
+        return self.core.cycle(input_1, input_2, setpoint, self.config.cycle_time)
+
+
+def replay(
+    samples: Iterable[Sample], config: ReplayConfig, trace: TextIO | None = None
+) -> ReplayResult:
+    """Replay the samples through the controller, one cycle per cycle time."""
+    controller = ReplayController(config)
+    result = ReplayResult(metrics=controller.core.metrics)
+    values = {INPUT1: math.nan, INPUT2: math.nan, SETPOINT: config.setpoint}
+    writer = None
+    if trace is not None:
+        writer = csv.writer(trace)
+        writer.writerow(("time", SETPOINT, INPUT1, INPUT2, "output"))
+
+    def run_until(cycle_time: float, timestamp: float) -> float:
+        """Run the cycles before the timestamp, on the last known values."""
+        while cycle_time < timestamp:
+            output = controller.cycle(values[INPUT1], values[INPUT2], values[SETPOINT])
+            if output is None:
+                result.skipped += 1
+            else:
+                result.add(
+                    output,
+                    saturated=output in (config.output_min, config.output_max),
+                )
+                if writer is not None:
+                    writer.writerow(
+                        (
+                            datetime.fromtimestamp(cycle_time, UTC).isoformat(),
+                            controller.pid.setpoint,
+                            values[INPUT1],
+                            values[INPUT2],
+                            output,
+                        )
+                    )
+            cycle_time += config.cycle_time
+        return cycle_time
+
+    next_cycle = math.nan
+    last_time = -math.inf
+    for timestamp, signal, value in samples:
+        if timestamp < last_time:
+            msg = (
+                "History not in time order: "
+                f"{datetime.fromtimestamp(timestamp, UTC).isoformat()} after "
+                f"{datetime.fromtimestamp(last_time, UTC).isoformat()}"
+            )
+            raise ValueError(msg)
+        if math.isnan(next_cycle):
+            next_cycle = timestamp
+        next_cycle = run_until(next_cycle, timestamp)
+        if signal == SETPOINT and value != values[SETPOINT]:
+            # A recorded setpoint change starts a new step of the metrics
+            controller.core.set_target(value)
+        values[signal] = value
+        last_time = timestamp
+    if not math.isnan(next_cycle):
+        # Include the cycle at the time of the last sample
+        run_until(next_cycle, math.nextafter(last_time, math.inf))
+    return result
+
+
+def _entity(value: str) -> tuple[str, str]:
+    """Parse a signal=entity_id argument."""
+    signal, _, entity_id = value.partition("=")
+    if signal not in SIGNALS or not entity_id:
+        msg = f"expected {'|'.join(SIGNALS)}=<entity_id>, got {value}"
+        raise argparse.ArgumentTypeError(msg)
+    return signal, entity_id
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="python custom_components/pid_controller/pid_core",
+        description="Replay a recorded history through the PID controller.",
+    )
+    parser.add_argument("history", help="CSV file, or - for stdin")
+    parser.add_argument("--kp", type=float, default=DEFAULT_PID_KP)
+    parser.add_argument("--ki", type=float, default=DEFAULT_PID_KI)
+    parser.add_argument("--kd", type=float, default=DEFAULT_PID_KD)
+    parser.add_argument(
+        "--direction",
+        choices=[PID_DIR_DIRECT, PID_DIR_REVERSE],
+        default=PID_DIR_DIRECT,
+    )
+    parser.add_argument("--cycle-time", type=float, default=30.0, help="seconds")
+    parser.add_argument("--output-min", type=float, default=0.0)
+    parser.add_argument("--output-max", type=float, default=100.0)
+    parser.add_argument("--initial-output", type=float, default=0.0)
+    parser.add_argument(
+        "--setpoint",
+        type=float,
+        default=math.nan,
+        help="constant setpoint, when the history has none",
+    )
+    parser.add_argument(
+        "--setpoint-ramp-rate",
+        type=float,
+        default=DEFAULT_SETPOINT_RAMP_RATE,
+        help="per minute",
+    )
+    parser.add_argument(
+        "--derivative-on",
+        choices=[DERIVATIVE_ON_MEASUREMENT, DERIVATIVE_ON_ERROR],
+        default=DEFAULT_DERIVATIVE_ON,
+    )
+    parser.add_argument(
+        "--derivative-filter", type=float, default=DEFAULT_DERIVATIVE_FILTER
+    )
+    parser.add_argument(
+        "--setpoint-weight-p",
+        type=float,
+        default=DEFAULT_SETPOINT_WEIGHT_P,
+        help="part of a setpoint change the proportional term acts on",
+    )
+    parser.add_argument(
+        "--setpoint-weight-d",
+        type=float,
+        help="part of a setpoint change the derivative term acts on",
+    )
+    parser.add_argument(
+        "--entity",
+        type=_entity,
+        action="append",
+        default=[],
+        help="map an entity of a recorder export, e.g. input1=sensor.water",
+    )
+    parser.add_argument("--trace", help="write the output of every cycle to a CSV")
+    return parser
+
+
+def _report(result: ReplayResult, out: TextIO) -> None:
+    """Write a summary of the replay."""
+    metrics = result.metrics
+    lines = {
+        "cycles": result.cycles,
+        "skipped cycles": result.skipped,
+        "output min": result.output_min,
+        "output max": result.output_max,
+        "output mean": result.output_mean,
+        "output travel": result.output_travel,
+        "saturated cycles": result.saturated,
+        "iae": metrics.iae,
+        "ise": metrics.ise,
+        "overshoot": metrics.overshoot,
+        "settling time": metrics.settling_time,
+        "oscillation period": metrics.oscillation_period,
+    }
+    for name, value in lines.items():
+        shown = f"{value:.6g}" if isinstance(value, float) else value
+        out.write(f"{name}: {shown}\n")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the replay from the command line."""
+    args = _parser().parse_args(argv)
+    config = ReplayConfig(
+        kp=args.kp,
+        ki=args.ki,
+        kd=args.kd,
+        direction=args.direction,
+        cycle_time=args.cycle_time,
+        output_min=args.output_min,
+        output_max=args.output_max,
+        initial_output=args.initial_output,
+        setpoint=args.setpoint,
+        setpoint_ramp_rate=args.setpoint_ramp_rate,
+        derivative_on=args.derivative_on,
+        derivative_filter=args.derivative_filter,
+        setpoint_weight_p=args.setpoint_weight_p,
+        setpoint_weight_d=args.setpoint_weight_d,
+    )
+    with ExitStack() as stack:
+        history = (
+            sys.stdin
+            if args.history == "-"
+            else stack.enter_context(Path(args.history).open(newline=""))
+        )
+        trace = (
+            stack.enter_context(Path(args.trace).open("w", newline=""))
+            if args.trace
+            else None
+        )
+        result = replay(read_samples(history, dict(args.entity)), config, trace)
+    _report(result, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
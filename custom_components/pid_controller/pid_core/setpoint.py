@@ -0,0 +1,62 @@
+"""Setpoint ramping and timed setpoint profiles for the PID controller."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def ramp(current: float, target: float, max_change: float) -> float:
+    """Move current towards target by at most max_change."""
+    if math.isnan(current) or abs(target - current) <= max_change:
+        return target
+    return current + math.copysign(max_change, target - current)
+
+
+class SetpointProfile:
+    """
+    Timed setpoint profile, linearly interpolated between its points.
+
+    Times and values are stored in two flat arrays, so every lookup is a
+    bisect and one interpolation, no matter how long the profile is.
+    """
+
+    __slots__ = ("_times", "_values")
+
+    def __init__(self, start: float, points: Iterable[tuple[float, float]]) -> None:
+        """Create a profile from (offset in seconds, value) points."""
+        ordered = sorted(points)
+        if not ordered:
+            msg = "A setpoint profile needs at least one point"
+            raise ValueError(msg)
+        self._times = array("d", (start + offset for offset, _ in ordered))
+        self._values = array("d", (value for _, value in ordered))
+
+    def __len__(self) -> int:
+        """Return the number of points in the profile."""
+        return len(self._times)
+
+    @property
+    def end(self) -> float:
+        """Return the time of the last point."""
+        return self._times[-1]
+
+    def value(self, now: float) -> float:
+        """Return the setpoint of the profile at the given time."""
+        index = bisect_right(self._times, now)
+        if index == 0:
+            return self._values[0]
+        if index == len(self._times):
+            return self._values[-1]
+        t_0, t_1 = self._times[index - 1], self._times[index]
+        v_0, v_1 = self._values[index - 1], self._values[index]
+        return v_0 + (v_1 - v_0) * (now - t_0) / (t_1 - t_0)
+
+    def finished(self, now: float) -> bool:
+        """Return whether the last point of the profile has passed."""
+        return now >= self._times[-1]
@@ -0,0 +1,84 @@
+"""
+Smith predictor for the PID controller.
+
+With a long dead time the PID regulator only sees the effect of its output
+much later, and has to be tuned very slowly not to oscillate. The Smith
+predictor runs a first order plus dead time model of the process alongside
+the loop. The regulator gets the measurement plus the model output without
+dead time, minus the model output with dead time: it sees the process as if
+there were no dead time, and can be tuned for the time constant alone.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .mpc import PlantModel
+
+
+class SmithPredictor:
+    """
+    Model of the process, with and without its dead time.
+
+    The dead time is a ring buffer of model outputs, one per cycle, sized
+    once from the dead time and the cycle time.
+    """
+
+    __slots__ = (
+        "_delayed",
+        "_index",
+        "cycle_time",
+        "gain",
+        "input_gain",
+        "model_output",
+        "pole",
+    )
+
+    def __init__(self, model: PlantModel, cycle_time: float) -> None:
+        """Discretize the model for the cycle time."""
+        self.cycle_time = cycle_time
+        self.pole, self.input_gain, delay = model.discretize(cycle_time)
+        self.gain = model.gain
+        self.model_output = 0.0
+        self._delayed = array("d", [0.0]) * delay
+        self._index = 0
+
+    @property
+    def delayed_output(self) -> float:
+        """Return the model output of one dead time ago."""
+        if not self._delayed:
+            return self.model_output
+        return self._delayed[self._index]
+
+    @property
+    def correction(self) -> float:
+        """Return what to add to the measurement for the regulator."""
+        return self.model_output - self.delayed_output
+
+    def reset(self, output: float) -> None:
+        """Settle the model on a steady output, e.g. when the loop starts."""
+        self.model_output = self.gain * output
+        for index in range(len(self._delayed)):
+            self._delayed[index] = self.model_output
+        self._index = 0
+
+    def catch_up(self, elapsed: float, output: float) -> None:
+        """
+        Advance the model over the cycles that did not run, e.g. deferred ones.
+
+        The output was held over them; the cycle of the elapsed time itself
+        is advanced by update.
+        """
+        if self.cycle_time <= 0:
+            return
+        for _ in range(round(elapsed / self.cycle_time) - 1):
+            self.update(output)
+
+    def update(self, output: float) -> None:
+        """Advance the model by one cycle with the output that was applied."""
+        if self._delayed:
+            self._delayed[self._index] = self.model_output
+            self._index = (self._index + 1) % len(self._delayed)
+        self.model_output = self.pole * self.model_output + self.input_gain * output
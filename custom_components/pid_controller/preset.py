@@ -0,0 +1,91 @@
+"""
+Named presets of the PID controller, like comfort, eco or away.
+
+A preset bundles a setpoint, gains and setpoint limits. Switching presets
+changes the running controller in place, without reloading it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import astuple, dataclass
+from typing import Any
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.const import CONF_MAXIMUM, CONF_MINIMUM
+
+from .const import CONF_SETPOINT
+from .pid_shared.const import CONF_PID_KD, CONF_PID_KI, CONF_PID_KP
+
+_GAIN = vol.All(vol.Coerce(float), vol.Range(min=0))
+
+
+def _valid_limits(value: dict[str, Any]) -> dict[str, Any]:
+    """Check that the setpoint limits of a preset are not empty."""
+    if value.get(CONF_MINIMUM, float("-inf")) >= value.get(CONF_MAXIMUM, float("inf")):
+        msg = f"{CONF_MINIMUM} must be below {CONF_MAXIMUM}"
+        raise vol.Invalid(msg)
+    return value
+
+
+PRESET_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(CONF_SETPOINT): vol.Coerce(float),
+            vol.Optional(CONF_PID_KP): _GAIN,
+            vol.Optional(CONF_PID_KI): _GAIN,
+            vol.Optional(CONF_PID_KD): _GAIN,
+            vol.Optional(CONF_MINIMUM): vol.Coerce(float),
+            vol.Optional(CONF_MAXIMUM): vol.Coerce(float),
+        }
+    ),
+    cv.has_at_least_one_key(
+        CONF_SETPOINT, CONF_PID_KP, CONF_PID_KI, CONF_PID_KD, CONF_MINIMUM, CONF_MAXIMUM
+    ),
+    _valid_limits,
+)
+
+PRESETS_SCHEMA = vol.Schema({cv.string: PRESET_SCHEMA})
+
+
+@dataclass(frozen=True, slots=True)
+class Preset:
+    """What a preset sets; None takes the configured value, or keeps the setpoint."""
+
+    setpoint: float | None = None
+    kp: float | None = None
+    ki: float | None = None
+    kd: float | None = None
+    minimum: float | None = None
+    maximum: float | None = None
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> Preset:
+        """Create a preset from its validated configuration."""
+        return cls(
+            config.get(CONF_SETPOINT),
+            config.get(CONF_PID_KP),
+            config.get(CONF_PID_KI),
+            config.get(CONF_PID_KD),
+            config.get(CONF_MINIMUM),
+            config.get(CONF_MAXIMUM),
+        )
+
+    def over(self, configured: Preset) -> Preset:
+        """Return the preset with what it does not set taken from the configuration."""
+        return Preset(
+            *(
+                default if value is None else value
+                for value, default in zip(
+                    astuple(self), astuple(configured), strict=True
+                )
+            )
+        )
+
+
+def parse_presets(config: dict[str, Any] | None) -> dict[str, Preset]:
+    """Return the presets by name from the configuration."""
+    return {
+        name: Preset.from_config(item)
+        for name, item in PRESETS_SCHEMA(config or {}).items()
+    }
@@ -0,0 +1,75 @@
+"""Preset select of the PID controller."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.core import callback
+
+from .const import ATTR_PRESET, CONF_CONTROLLER_KEY
+from .entity import PidChildEntity, async_setup_child_entities
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+
+    from .number import PidEntity
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the preset select of the controller of a config entry."""
+    config_entry.async_on_unload(
+        async_setup_child_entities(
+            hass, config_entry.entry_id, _create_preset_select, async_add_entities
+        )
+    )
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,  # noqa: ARG001
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the preset select of a controller set up from YAML."""
+    if discovery_info is None:
+        return
+    async_setup_child_entities(
+        hass,
+        discovery_info[CONF_CONTROLLER_KEY],
+        _create_preset_select,
+        async_add_entities,
+    )
+
+
+def _create_preset_select(controller: PidEntity) -> list[PresetSelect]:
+    """Return the preset select of a controller, if it has presets."""
+    return [PresetSelect(controller)] if controller.presets else []
+
+
+class PresetSelect(PidChildEntity, SelectEntity):
+    """Switches the presets of a controller, e.g. from a dashboard."""
+
+    def __init__(self, controller: PidEntity) -> None:
+        """Initialize the select with the presets of the controller."""
+        super().__init__(controller, ATTR_PRESET, ATTR_PRESET)
+        self._attr_options = controller.presets
+        self._attr_current_option = controller.preset
+
+    async def async_select_option(self, option: str) -> None:
+        """Switch the controller to the preset."""
+        await self.controller.async_set_preset(option)
+
+    @callback
+    def async_controller_updated(self) -> None:
+        """Write the state when the preset changed."""
+        if self.controller.preset != self._attr_current_option:
+            self._attr_current_option = self.controller.preset
+            self.async_write_ha_state()
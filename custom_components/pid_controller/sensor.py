@@ -0,0 +1,172 @@
+"""Actuator wear sensors of the PID controller outputs."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, Platform
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    CONF_CONTROLLER_KEY,
+    DOMAIN,
+    WEAR_REVERSALS,
+    WEAR_TRAVEL,
+    WEAR_WRITES_PER_HOUR,
+)
+from .entity import PidChildEntity, async_setup_child_entities
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+
+    from .number import PidEntity
+
+WEAR_SENSORS = (
+    SensorEntityDescription(
+        key=WEAR_TRAVEL,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key=WEAR_REVERSALS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key=WEAR_WRITES_PER_HOUR,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement="writes/h",
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the wear sensors of the controller of a config entry."""
+    config_entry.async_on_unload(
+        async_setup_child_entities(
+            hass, config_entry.entry_id, _create_wear_sensors, async_add_entities
+        )
+    )
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,  # noqa: ARG001
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the wear sensors of a controller set up from YAML."""
+    if discovery_info is None:
+        return
+    async_setup_child_entities(
+        hass,
+        discovery_info[CONF_CONTROLLER_KEY],
+        _create_wear_sensors,
+        async_add_entities,
+    )
+
+
+def _create_wear_sensors(controller: PidEntity) -> list[ActuatorWearSensor]:
+    """Return the wear sensors of every output of a controller."""
+    _migrate_unique_ids(controller)
+    return [
+        ActuatorWearSensor(controller, index, description)
+        for index in range(len(controller.channels))
+        for description in WEAR_SENSORS
+    ]
+
+
+def _wear_key(index: int, description: SensorEntityDescription) -> str:
+    """Return the key of a wear sensor: the output by its index, not its entity."""
+    return f"output{index}_{description.key}"
+
+
+def _migrate_unique_ids(controller: PidEntity) -> None:
+    """Move wear sensors keyed by the entity id of their output to the index."""
+    if not controller.unique_id:
+        return
+    registry = er.async_get(controller.hass)
+    for index, channel in enumerate(controller.channels):
+        for description in WEAR_SENSORS:
+            old_unique_id = (
+                f"{controller.unique_id}_{channel.entity_id}_{description.key}"
+            )
+            if entity_id := registry.async_get_entity_id(
+                Platform.SENSOR, DOMAIN, old_unique_id
+            ):
+                registry.async_update_entity(
+                    entity_id,
+                    new_unique_id=(
+                        f"{controller.unique_id}_{_wear_key(index, description)}"
+                    ),
+                )
+
+
+class ActuatorWearSensor(PidChildEntity, RestoreSensor):
+    """Travel, reversals or writes per hour of one output."""
+
+    def __init__(
+        self,
+        controller: PidEntity,
+        index: int,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor of an output of the controller, by its index."""
+        channel = controller.channels[index]
+        name = description.key.replace("_", " ")
+        if len(controller.channels) > 1:
+            # Split-range outputs: tell them apart by their entity
+            name = f"{channel.entity_id.partition('.')[2]} {name}"
+        super().__init__(controller, name, _wear_key(index, description))
+        self.entity_description = description
+        self._channel = channel
+        self._attr_native_value = self._wear_value()
+
+    async def async_added_to_hass(self) -> None:
+        """Continue the totals from before the restart."""
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        if last is not None and last.native_value is not None:
+            wear = self._channel.wear
+            try:
+                if self.entity_description.key == WEAR_TRAVEL:
+                    wear.travel += float(last.native_value)
+                elif self.entity_description.key == WEAR_REVERSALS:
+                    wear.reversals += int(float(last.native_value))
+            except ValueError:
+                pass
+        self._attr_native_value = self._wear_value()
+
+    @callback
+    def async_controller_updated(self) -> None:
+        """Write the state when the wear changed."""
+        value = self._wear_value()
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+
+    def _wear_value(self) -> float:
+        """Return the value of the wear counter of the output."""
+        wear = self._channel.wear
+        key = self.entity_description.key
+        if key == WEAR_TRAVEL:
+            return round(wear.travel, 3)
+        if key == WEAR_REVERSALS:
+            return wear.reversals
+        return wear.writes_per_hour(time.monotonic())
@@ -0,0 +1,92 @@
+"""
+Trace of the recent cycles of the PID controller, for diagnostics.
+
+The last cycles are kept in a ring of flat arrays, one per column, allocated
+at the first cycle. Recording a cycle is a few stores, so the trace runs
+always; reading it takes a snapshot without pausing the control loop.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any
+
+# Number of cycles kept
+TRACE_LENGTH = 60
+COLUMNS = ("time", "elapsed", "input1", "input2", "setpoint", "output")
+
+
+class CycleTrace:
+    """The last cycles, and statistics of the cycle durations and intervals."""
+
+    __slots__ = (
+        "_columns",
+        "_index",
+        "count",
+        "duration_max",
+        "duration_total",
+        "interval_max",
+        "interval_min",
+        "interval_total",
+        "length",
+        "recorded",
+    )
+
+    def __init__(self, length: int = TRACE_LENGTH) -> None:
+        """Initialize an empty trace."""
+        self.length = length
+        self._columns: tuple[array, ...] = ()
+        self._index = 0
+        # Cycles recorded in the trace, and cycles timed
+        self.recorded = 0
+        self.count = 0
+        self.duration_total = 0.0
+        self.duration_max = 0.0
+        self.interval_total = 0.0
+        self.interval_min = math.inf
+        self.interval_max = 0.0
+
+    def record(self, *values: float) -> None:
+        """Record a cycle: time, elapsed, input 1, input 2, setpoint and output."""
+        if not self._columns:
+            self._columns = tuple(array("d", [math.nan]) * self.length for _ in COLUMNS)
+        for column, value in zip(self._columns, values, strict=True):
+            column[self._index] = value
+        self._index = (self._index + 1) % self.length
+        self.recorded += 1
+        interval = values[1]
+        self.interval_total += interval
+        self.interval_min = min(self.interval_min, interval)
+        self.interval_max = max(self.interval_max, interval)
+
+    def time_cycle(self, duration: float) -> None:
+        """Add the time one cycle took, including waiting for the output."""
+        self.count += 1
+        self.duration_total += duration
+        self.duration_max = max(self.duration_max, duration)
+
+    def rows(self) -> list[dict[str, float | None]]:
+        """Return the recorded cycles, oldest first; NaN becomes None."""
+        size = min(self.recorded, self.length)
+        start = (self._index - size) % self.length
+        return [
+            {
+                name: None if math.isnan(value := column[index]) else value
+                for name, column in zip(COLUMNS, self._columns, strict=True)
+            }
+            for index in ((start + offset) % self.length for offset in range(size))
+        ]
+
+    def statistics(self) -> dict[str, Any]:
+        """Return the statistics of the cycle durations and intervals."""
+        return {
+            "cycles": self.count,
+            "duration_mean": self.duration_total / self.count if self.count else None,
+            "duration_max": self.duration_max if self.count else None,
+            "interval_mean": self.interval_total / self.recorded
+            if self.recorded
+            else None,
+            "interval_min": self.interval_min if self.recorded else None,
+            "interval_max": self.interval_max if self.recorded else None,
+        }
@@ -0,0 +1,150 @@
+"""
+MQTT fast path for the inputs and output of the PID controller.
+
+A sensor and an actuator on MQTT normally reach the controller through the
+MQTT integration and the state machine, and the output goes back through a
+service call and the MQTT integration again. With the fast path the
+controller subscribes to the input topics and publishes its output itself,
+through the MQTT helpers of Home Assistant. The state machine is then only
+updated at a lower rate, as a mirror for the user interface and history.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.components import mqtt
+from homeassistant.core import callback
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.components.mqtt import ReceiveMessage
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MirrorRate:
+    """Lets a mirror update through at most once per interval."""
+
+    __slots__ = ("_last", "interval")
+
+    def __init__(self, interval: float) -> None:
+        """Initialize; the first update is always due."""
+        self.interval = interval
+        self._last = -math.inf
+
+    def due(self, now: float) -> bool:
+        """Return whether the mirror is due, and if so restart the interval."""
+        if now - self._last < self.interval:
+            return False
+        self._last = now
+        return True
+
+
+class MqttTransport:
+    """
+    Inputs and output of one controller on MQTT topics.
+
+    The payloads are plain numbers. Until a value is received on an input
+    topic, after an invalid payload, or when the last value is older than the
+    max age, the input is NaN and the controller reads the state of the
+    input entity instead: a silent sensor does not freeze the loop.
+    """
+
+    __slots__ = (
+        "_received_1",
+        "_received_2",
+        "_unsubscribe",
+        "input_1",
+        "input_1_topic",
+        "input_2",
+        "input_2_topic",
+        "max_age",
+        "output_topic",
+        "qos",
+        "retain",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        input_1_topic: str | None,
+        input_2_topic: str | None,
+        output_topic: str | None,
+        *,
+        qos: int = 0,
+        retain: bool = False,
+        max_age: float = math.inf,
+    ) -> None:
+        """Initialize the transport; nothing is subscribed yet."""
+        self.input_1_topic = input_1_topic
+        self.input_2_topic = input_2_topic
+        self.output_topic = output_topic
+        self.qos = qos
+        self.retain = retain
+        self.max_age = max_age
+        self.input_1 = math.nan
+        self.input_2 = math.nan
+        # Monotonic time the inputs were received
+        self._received_1 = -math.inf
+        self._received_2 = -math.inf
+        self._unsubscribe: list[Callable[[], None]] = []
+
+    async def async_start(self, hass: HomeAssistant) -> bool:
+        """Subscribe to the input topics; False when MQTT is not available."""
+        if not await mqtt.async_wait_for_mqtt_client(hass):
+            return False
+        for topic, receive in (
+            (self.input_1_topic, self._receive_input_1),
+            (self.input_2_topic, self._receive_input_2),
+        ):
+            if topic:
+                self._unsubscribe.append(
+                    await mqtt.async_subscribe(hass, topic, receive, self.qos)
+                )
+        return True
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe from the input topics."""
+        while self._unsubscribe:
+            self._unsubscribe.pop()()
+
+    async def async_publish(self, hass: HomeAssistant, value: float) -> None:
+        """Publish the output, if an output topic is set."""
+        if self.output_topic:
+            await mqtt.async_publish(
+                hass, self.output_topic, str(float(value)), self.qos, self.retain
+            )
+
+    def inputs(self, now: float) -> tuple[float, float]:
+        """Return the inputs, NaN when older than the max age."""
+        return (
+            self.input_1 if now - self._received_1 <= self.max_age else math.nan,
+            self.input_2 if now - self._received_2 <= self.max_age else math.nan,
+        )
+
+    @callback
+    def _receive_input_1(self, message: ReceiveMessage) -> None:
+        """Take a value of input 1."""
+        self.input_1 = _parse(message)
+        self._received_1 = time.monotonic()
+
+    @callback
+    def _receive_input_2(self, message: ReceiveMessage) -> None:
+        """Take a value of input 2."""
+        self.input_2 = _parse(message)
+        self._received_2 = time.monotonic()
+
+
+def _parse(message: ReceiveMessage) -> float:
+    """Return the number in a payload, or NaN."""
+    try:
+        return float(message.payload)
+    except ValueError:
+        _LOGGER.debug("Invalid payload on %s: %s", message.topic, message.payload)
+        return math.nan
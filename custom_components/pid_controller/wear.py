@@ -0,0 +1,84 @@
+"""
+Actuator wear of one output of the PID controller.
+
+Every written value moves a valve or a motor. The wear counters keep the
+travel, the direction reversals and the writes of the last hour of one
+output. The optional wear-minimizing mode holds back moves that are smaller
+than a minimum move, and reversals that are smaller than a hysteresis, so a
+noisy controller output does not make the actuator hunt. Moves to a limit
+of the output always go through, so the actuator can still close fully.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+MINUTES_PER_HOUR = 60
+
+
+class ActuatorWear:
+    """Travel, reversals and writes of one output, and the moves it allows."""
+
+    __slots__ = (
+        "_minute",
+        "_writes_per_minute",
+        "direction",
+        "hysteresis",
+        "min_move",
+        "position",
+        "reversals",
+        "travel",
+        "writes",
+    )
+
+    def __init__(self, *, min_move: float = 0.0, hysteresis: float = 0.0) -> None:
+        """Initialize the counters; without minimum move or hysteresis all moves go."""
+        self.min_move = min_move
+        self.hysteresis = hysteresis
+        self.travel = 0.0
+        self.reversals = 0
+        self.writes = 0
+        # Last position of the actuator and the direction it moved to it
+        self.position: float | None = None
+        self.direction = 0
+        # Ring of write counts of the last hour, one per minute
+        self._writes_per_minute = array("I", [0]) * MINUTES_PER_HOUR
+        self._minute: int | None = None
+
+    def admit(self, value: float, minimum: float, maximum: float) -> bool:
+        """Return whether a move to the value is worth the wear."""
+        if self.position is None or value in (minimum, maximum):
+            return True
+        move = value - self.position
+        if abs(move) < self.min_move:
+            return False
+        # A reversal must be larger than the hysteresis
+        return move * self.direction >= 0 or abs(move) >= self.hysteresis
+
+    def record(self, value: float, now: float) -> None:
+        """Count a write of the value; now is a monotonic time in seconds."""
+        if self.position is not None and value != self.position:
+            direction = 1 if value > self.position else -1
+            self.travel += abs(value - self.position)
+            if direction == -self.direction:
+                self.reversals += 1
+            self.direction = direction
+        self.position = value
+        self.writes += 1
+        self._advance(now)
+        self._writes_per_minute[self._minute % MINUTES_PER_HOUR] += 1
+
+    def writes_per_hour(self, now: float) -> int:
+        """Return the number of writes in the last hour."""
+        self._advance(now)
+        return sum(self._writes_per_minute)
+
+    def _advance(self, now: float) -> None:
+        """Clear the minutes that passed since the last write."""
+        minute = int(now // 60)
+        if self._minute is not None:
+            for passed in range(
+                self._minute + 1, min(minute, self._minute + MINUTES_PER_HOUR) + 1
+            ):
+                self._writes_per_minute[passed % MINUTES_PER_HOUR] = 0
+        self._minute = minute
@@ -0,0 +1 @@
+"""Tests for the control core of the pid_controller, without Home Assistant."""
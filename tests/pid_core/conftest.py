@@ -0,0 +1,36 @@
+"""
+Fixtures for testing the control core, without Home Assistant.
+
+The core is loaded from its path as the package pid_core, before the tests
+import it: through custom_components.pid_controller it would import the
+integration, and with it Home Assistant.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE = (
+    Path(__file__).parents[2] / "custom_components" / "pid_controller" / "pid_core"
+)
+
+
+def _load_package() -> None:
+    """Import the control core as the top-level package pid_core."""
+    spec = importlib.util.spec_from_file_location(
+        "pid_core", PACKAGE / "__init__.py", submodule_search_locations=[str(PACKAGE)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+
+_load_package()
+
+
+@pytest.fixture(autouse=True)
+def _auto_enable_custom_integrations() -> None:
+    """Replace the fixture of the integration tests: there is no Home Assistant."""
+    return
@@ -0,0 +1,224 @@
+"""Test the control core of the pid_controller, without Home Assistant."""
+
+import math
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from dvg_pid_controller import Constants as PIDConst
+from dvg_pid_controller import PID_Controller
+from hypothesis import given
+from hypothesis import strategies as st
+
+from pid_core.const import DERIVATIVE_ON_MEASUREMENT
+from pid_core.core import ControllerCore
+from pid_core.derivative import DerivativeTerm
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+OUTPUT_MIN = 0.0
+OUTPUT_MAX = 100.0
+# The regulator takes its time step from the clock, a few microseconds late
+CLOCK_TOLERANCE = 1e-2
+BENCHMARK_CYCLES = 10000
+# Budget per cycle in seconds: the core must stay far below a millisecond
+SECONDS_PER_CYCLE = 1e-4
+
+gains = st.floats(min_value=0.0, max_value=10.0)
+values = st.floats(min_value=-1000.0, max_value=1000.0)
+steps = st.floats(min_value=0.1, max_value=600.0)
+weights = st.floats(min_value=0.0, max_value=1.0)
+
+
+def _core(  # noqa: PLR0913
+    kp: float,
+    ki: float,
+    kd: float,
+    *,
+    direction: int = PIDConst.DIRECT,
+    ramp_rate: float = 0.0,
+    filter_n: float = 0.0,
+    setpoint_weight: float = 1.0,
+) -> ControllerCore:
+    """Return a core with a fresh regulator."""
+    pid = PID_Controller(kp, ki, kd, direction)
+    pid.set_output_limits(OUTPUT_MIN, OUTPUT_MAX)
+    return ControllerCore(
+        pid,
+        ramp_rate=ramp_rate,
+        derivative=DerivativeTerm(filter_n, DERIVATIVE_ON_MEASUREMENT),
+        setpoint_weight=setpoint_weight,
+    )
+
+
+@given(
+    kp=gains,
+    ki=gains,
+    kd=gains,
+    reverse=st.booleans(),
+    filter_n=st.floats(min_value=0.0, max_value=10.0),
+    setpoint=values,
+    inputs=st.lists(st.tuples(values, steps), min_size=1, max_size=20),
+)
+def test_output_within_limits(  # noqa: PLR0913
+    kp: float,
+    ki: float,
+    kd: float,
+    reverse: bool,  # noqa: FBT001
+    filter_n: float,
+    setpoint: float,
+    inputs: Sequence[tuple[float, float]],
+) -> None:
+    """Test that no input sequence drives the output outside its limits."""
+    core = _core(
+        kp,
+        ki,
+        kd,
+        direction=PIDConst.REVERSE if reverse else PIDConst.DIRECT,
+        filter_n=filter_n,
+    )
+    core.pid.setpoint = setpoint
+    core.start(inputs[0][0], math.nan, OUTPUT_MAX / 2)
+    for value, elapsed in inputs:
+        output = core.cycle(value, math.nan, setpoint, elapsed)
+        assert output is not None
+        assert OUTPUT_MIN <= output <= OUTPUT_MAX
+
+
+@given(
+    ki=st.floats(min_value=0.001, max_value=1.0),
+    error=st.floats(min_value=-10.0, max_value=10.0),
+    elapsed=st.floats(min_value=0.01, max_value=5.0),
+)
+def test_explicit_time_step(ki: float, error: float, elapsed: float) -> None:
+    """Test that the integral grows with the given time step, not the clock."""
+    core = _core(0.0, ki, 0.0)
+    start = OUTPUT_MAX / 2
+    core.start(0.0, math.nan, start)
+    output = core.cycle(0.0, math.nan, error, elapsed)
+    assert output == pytest.approx(start + ki * error * elapsed, abs=CLOCK_TOLERANCE)
+
+
+@given(kp=gains, ki=st.floats(min_value=0.001, max_value=10.0), error=values)
+def test_bumpless_start(kp: float, ki: float, error: float) -> None:
+    """Test that switching to automatic keeps the live output."""
+    core = _core(kp, ki, 0.0)
+    core.pid.setpoint = error
+    output = OUTPUT_MAX / 4
+    assert core.start(0.0, math.nan, output)
+    assert not core.start(0.0, math.nan, output)
+    # The first proportional term is taken off the integrator
+    expected = min(max(output - kp * error, OUTPUT_MIN), OUTPUT_MAX)
+    assert core.pid.iTerm == pytest.approx(expected)
+
+
+@given(
+    kp=gains,
+    new_kp=gains,
+    ki=st.floats(min_value=0.001, max_value=1.0),
+    # Small enough that the output stays away from its limits
+    error=st.floats(min_value=-1.0, max_value=1.0),
+    weight=weights,
+)
+def test_bumpless_tunings(
+    kp: float, new_kp: float, ki: float, error: float, weight: float
+) -> None:
+    """Test that new gains continue from the output, with the same error."""
+    core = _core(kp, ki, 0.0, setpoint_weight=weight)
+    core.start(0.0, math.nan, OUTPUT_MAX / 2)
+    before = core.cycle(0.0, math.nan, error, 1.0)
+    core.set_tunings(new_kp, ki, 0.0)
+    after = core.cycle(0.0, math.nan, error, 1e-6)
+    # Only the integral of one microsecond is added
+    assert after == pytest.approx(before, abs=CLOCK_TOLERANCE)
+    assert core.pid.kp == new_kp
+
+
+@given(
+    kp=gains,
+    new_kp=gains,
+    ki=st.floats(min_value=0.001, max_value=1.0),
+    setpoints=st.tuples(
+        st.floats(min_value=-1.0, max_value=1.0),
+        st.floats(min_value=-1.0, max_value=1.0),
+    ),
+    weight=weights,
+)
+def test_tunings_after_setpoint_change(
+    kp: float,
+    new_kp: float,
+    ki: float,
+    setpoints: tuple[float, float],
+    weight: float,
+) -> None:
+    """Test that new gains after a new setpoint act on the new setpoint."""
+    first, second = setpoints
+    cores = [_core(kp, ki, 0.0, setpoint_weight=weight) for _ in range(2)]
+    for core in cores:
+        core.start(0.0, math.nan, OUTPUT_MAX / 2)
+        core.cycle(0.0, math.nan, first, 1.0)
+        core.set_target(second)
+    assert cores[0].proportional_error() == pytest.approx(weight * second)
+    cores[0].set_tunings(new_kp, ki, 0.0)
+    retuned, kept = (core.cycle(0.0, math.nan, second, 1e-6) for core in cores)
+    # The new gain does not bump the output of the new setpoint
+    assert retuned == pytest.approx(kept, abs=CLOCK_TOLERANCE)
+
+
+@given(
+    kp=st.floats(min_value=0.0, max_value=2.0),
+    weight=weights,
+    step=st.floats(min_value=-10.0, max_value=10.0),
+)
+def test_setpoint_weight(kp: float, weight: float, step: float) -> None:
+    """Test that a setpoint step meets the weighted gain, a disturbance all."""
+    core = _core(kp, 0.0, 0.0, setpoint_weight=weight)
+    start = OUTPUT_MAX / 2
+    core.start(0.0, math.nan, start)
+    output = core.cycle(0.0, math.nan, step, 1.0)
+    assert output == pytest.approx(start + kp * weight * step)
+    # A disturbance of the same size moves the output with the full gain
+    disturbed = core.cycle(-step, math.nan, step, 1.0)
+    assert disturbed - output == pytest.approx(kp * step)
+
+
+@given(
+    ramp_rate=st.floats(min_value=0.001, max_value=10.0),
+    target=values,
+    elapsed=st.lists(steps, min_size=1, max_size=20),
+)
+def test_setpoint_ramp(
+    ramp_rate: float, target: float, elapsed: Sequence[float]
+) -> None:
+    """Test that the setpoint moves at the ramp rate, without passing the target."""
+    core = _core(1.0, 0.0, 0.0, ramp_rate=ramp_rate)
+    core.start(0.0, math.nan, 0.0)
+    assert core.pid.setpoint == 0.0
+    for step in elapsed:
+        before = core.pid.setpoint
+        core.advance_setpoint(target, step)
+        moved = core.pid.setpoint - before
+        assert abs(moved) <= ramp_rate * step * (1 + 1e-9)
+        assert abs(core.pid.setpoint) <= abs(target)
+
+
+def test_manual() -> None:
+    """Test that a stopped core computes nothing and keeps the output."""
+    core = _core(1.0, 1.0, 0.0)
+    core.start(0.0, math.nan, OUTPUT_MAX / 2)
+    core.stop()
+    assert core.cycle(0.0, math.nan, 10.0, 1.0) is None
+    assert core.pid.output == OUTPUT_MAX / 2
+
+
+def test_benchmark_cycle(record_property: pytest.RecordProperty) -> None:
+    """Benchmark one cycle of the core."""
+    core = _core(1.0, 0.1, 0.5, filter_n=1.0)
+    core.start(20.0, math.nan, OUTPUT_MAX / 2)
+    begin = time.perf_counter()
+    for index in range(BENCHMARK_CYCLES):
+        core.cycle(20.0 + math.sin(index / 100), math.nan, 21.0, 30.0)
+    per_cycle = (time.perf_counter() - begin) / BENCHMARK_CYCLES
+    record_property("seconds_per_cycle", per_cycle)
+    assert per_cycle < SECONDS_PER_CYCLE
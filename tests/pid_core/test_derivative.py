@@ -0,0 +1,57 @@
+"""Test the filtered derivative term of the pid_controller."""
+
+import pytest
+
+from pid_core.const import (
+    DERIVATIVE_ON_ERROR,
+    DERIVATIVE_ON_MEASUREMENT,
+)
+from pid_core.derivative import DerivativeTerm
+
+KD = 2.0
+DT = 1.0
+SETPOINT = 20.0
+
+
+def test_measurement_ignores_setpoint_step() -> None:
+    """Test that a setpoint step does not kick the derivative on measurement."""
+    term = DerivativeTerm(0.0, DERIVATIVE_ON_MEASUREMENT)
+    assert not term.active
+    term.update(KD, SETPOINT, 10.0, DT)
+    assert term.update(KD, SETPOINT + 10.0, 10.0, DT) == 0.0
+    # A rising measurement gives a negative term
+    assert term.update(KD, SETPOINT + 10.0, 11.0, DT) == -KD
+
+
+def test_error_follows_setpoint_step() -> None:
+    """Test that the derivative on error does see the setpoint step."""
+    term = DerivativeTerm(0.0, DERIVATIVE_ON_ERROR)
+    assert term.active
+    term.update(KD, SETPOINT, 10.0, DT)
+    assert term.update(KD, SETPOINT + 1.0, 10.0, DT) == KD
+
+
+def test_setpoint_weight() -> None:
+    """Test that a setpoint weight takes part of the setpoint step."""
+    weight = 0.5
+    term = DerivativeTerm(0.0, DERIVATIVE_ON_MEASUREMENT, weight)
+    assert term.active
+    term.update(KD, SETPOINT, 10.0, DT)
+    assert term.update(KD, SETPOINT + 1.0, 10.0, DT) == pytest.approx(KD * weight)
+    assert not DerivativeTerm(0.0, DERIVATIVE_ON_ERROR, 0.0).active
+
+
+def test_filter() -> None:
+    """Test that the filter spreads a jump over time and resets."""
+    filter_n = 1.0
+    term = DerivativeTerm(filter_n, DERIVATIVE_ON_MEASUREMENT)
+    assert term.active
+    term.update(KD, SETPOINT, 10.0, DT)
+    # Time constant 1 / N = 1 s equal to the cycle: half of the raw value
+    first = term.update(KD, SETPOINT, 11.0, DT)
+    assert first == pytest.approx(-KD / 2)
+    second = term.update(KD, SETPOINT, 11.0, DT)
+    assert second == pytest.approx(first / 2)
+
+    term.reset()
+    assert term.update(KD, SETPOINT, 50.0, DT) == 0.0
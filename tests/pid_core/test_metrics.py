@@ -0,0 +1,86 @@
+"""Test the control quality metrics of the pid_controller."""
+
+import math
+
+import pytest
+
+from pid_core.metrics import LoopMetrics
+
+CYCLE = 1.0
+PERIOD = 40.0
+
+
+def test_step_response() -> None:
+    """Test IAE, ISE, overshoot and settling time of a damped step response."""
+    metrics = LoopMetrics()
+    metrics.update(0.0, 0.0, CYCLE)
+    assert metrics.settling_time == 0.0
+
+    # Damped second order response to a step of 10
+    setpoint = 10.0
+    metrics.start_step(setpoint)
+    responses = [
+        setpoint
+        * (1 - math.exp(-k * CYCLE / 20) * math.cos(2 * math.pi * k * CYCLE / PERIOD))
+        for k in range(200)
+    ]
+    for k, response in enumerate(responses):
+        metrics.update(setpoint, response, CYCLE)
+        if k == 1:
+            assert metrics.settling_time is None
+
+    overshoot = 100.0 * (max(responses) - setpoint) / setpoint
+    last_outside = max(
+        k
+        for k, response in enumerate(responses)
+        if abs(setpoint - response) > 0.02 * setpoint
+    )
+    assert metrics.overshoot == pytest.approx(overshoot)
+    assert metrics.iae > 0
+    assert 0 < metrics.ise < metrics.iae * setpoint
+    assert metrics.settling_time == pytest.approx(last_outside * CYCLE)
+    assert metrics.oscillation_period is None
+
+
+def test_oscillation() -> None:
+    """Test detection of a sustained oscillation and its period."""
+    metrics = LoopMetrics()
+    setpoint = 10.0
+    for k in range(200):
+        time = k * CYCLE
+        metrics.update(setpoint, setpoint + math.sin(2 * math.pi * time / PERIOD), 1.0)
+    assert metrics.oscillation_period == pytest.approx(PERIOD, abs=2 * CYCLE)
+
+    # Settled loop: the oscillation is gone after a while
+    for _ in range(200):
+        metrics.update(setpoint, setpoint, CYCLE)
+    assert metrics.oscillation_period is None
+
+
+def test_setpoint_change_starts_step() -> None:
+    """Test that a new setpoint starts a new step, and the error still adds up."""
+    metrics = LoopMetrics()
+    metrics.update(10.0, 0.0, CYCLE)
+    metrics.update(10.0, 15.0, CYCLE)
+    assert metrics.overshoot == pytest.approx(50.0)
+    iae = metrics.iae
+    metrics.start_step(20.0)
+    metrics.update(20.0, 20.0, CYCLE)
+    assert metrics.iae == iae
+    assert metrics.overshoot == 0.0
+    assert metrics.settling_time == 0.0
+
+
+def test_ramp_is_one_step() -> None:
+    """Test that a setpoint moving every cycle is a single step to its target."""
+    metrics = LoopMetrics()
+    metrics.update(0.0, 0.0, CYCLE)
+    target = 10.0
+    metrics.start_step(target)
+    # The setpoint ramps up, the measurement follows one cycle behind
+    for k in range(1, 21):
+        setpoint = min(k * 1.0, target)
+        metrics.update(setpoint, setpoint - 1.0 if k <= target else target, CYCLE)
+    assert metrics.iae == pytest.approx(target * CYCLE)
+    assert metrics.overshoot == 0.0
+    assert metrics.settling_time == pytest.approx((target - 1) * CYCLE)
@@ -0,0 +1,97 @@
+"""Test the model predictive controller of the pid_controller."""
+
+import pytest
+
+from pid_core.mpc import (
+    ModelPredictiveController,
+    PlantModel,
+    solve,
+)
+
+OUTPUT_MAX = 100.0
+
+
+def _simulate(  # noqa: PLR0913
+    model: PlantModel,
+    cycle_time: float,
+    setpoint: float,
+    offset: float,
+    cycles: int,
+    solve_every: int = 1,
+) -> tuple[float, list[float]]:
+    """Run the MPC against a plant that matches the model, with an offset."""
+    controller = ModelPredictiveController(model, cycle_time, 20, 0.1)
+    pole, input_gain, delay = model.discretize(cycle_time)
+    measurement = 0.0
+    applied = [0.0] * (delay + 1)
+    outputs = []
+    output = 0.0
+    for cycle in range(cycles):
+        controller.observe(measurement, cycle_time)
+        if cycle % solve_every == 0:
+            # Otherwise the solve is still running: the output is held
+            output = solve(controller.problem(setpoint, 0.0, 0.0, OUTPUT_MAX))
+        controller.commit(output)
+        applied.append(output)
+        outputs.append(output)
+        measurement = pole * measurement + input_gain * applied[-1 - delay] + offset
+    return measurement, outputs
+
+
+@pytest.mark.parametrize("dead_time", [0.0, 30.0])
+def test_mpc_reaches_setpoint(dead_time: float) -> None:
+    """Test that the MPC regulates out a constant disturbance."""
+    model = PlantModel(gain=2.0, time_constant=60.0, dead_time=dead_time)
+    setpoint = 20.0
+    measurement, outputs = _simulate(model, 10.0, setpoint, 0.3, 100)
+    assert measurement == pytest.approx(setpoint, abs=0.01)
+    assert all(0.0 <= output <= OUTPUT_MAX for output in outputs)
+
+
+def test_mpc_slow_solver() -> None:
+    """Test that the estimate follows every cycle, also while a solve runs."""
+    model = PlantModel(gain=2.0, time_constant=60.0, dead_time=30.0)
+    setpoint = 20.0
+    measurement, _ = _simulate(model, 10.0, setpoint, 0.3, 150, solve_every=3)
+    assert measurement == pytest.approx(setpoint, abs=0.01)
+
+
+@pytest.mark.parametrize("dead_time", [0.0, 30.0])
+def test_mpc_deferred_cycles(dead_time: float) -> None:
+    """Test that the model steps over deferred cycles for the estimate."""
+    model = PlantModel(gain=2.0, time_constant=60.0, dead_time=dead_time)
+    cycle_time = 10.0
+    offset = 0.3
+    output = 10.0
+    pole, input_gain, _ = model.discretize(cycle_time)
+    controller = ModelPredictiveController(model, cycle_time, 20, 0.1)
+    measurement = 0.0
+    controller.observe(measurement, cycle_time)
+    controller.commit(output)
+    for _ in range(30):
+        # Two cycles deferred: the third runs over the elapsed time
+        for _ in range(3):
+            measurement = pole * measurement + input_gain * output + offset
+        controller.observe(measurement, 3 * cycle_time)
+        controller.commit(output)
+    problem = controller.problem(0.0, output, 0.0, OUTPUT_MAX)
+    assert problem.disturbance == pytest.approx(offset)
+    assert problem.measurement == measurement
+
+
+def test_mpc_respects_limits() -> None:
+    """Test that an unreachable setpoint saturates at the output limit."""
+    model = PlantModel(gain=1.0, time_constant=30.0)
+    setpoint = 500.0
+    measurement, outputs = _simulate(model, 10.0, setpoint, 0.0, 50)
+    assert outputs[-1] == pytest.approx(OUTPUT_MAX)
+    assert measurement < setpoint
+
+
+def test_discretize() -> None:
+    """Test conversion of the model to cycles."""
+    gain = 2.0
+    pole, input_gain, delay = PlantModel(gain, 0.0, 25.0).discretize(10.0)
+    assert pole == 0.0
+    assert input_gain == gain
+    assert delay == round(25.0 / 10.0)
@@ -0,0 +1,131 @@
+"""Test the headless replay of the pid_controller."""
+
+import io
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pid_core.replay import (
+    ReplayConfig,
+    main,
+    read_samples,
+    replay,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CYCLE_TIME = 30.0
+SETPOINT = 20.0
+
+WIDE = """timestamp,input1,setpoint
+2026-01-01T00:00:00+00:00,10,20
+2026-01-01T00:01:00+00:00,15,
+2026-01-01T00:02:00+00:00,unavailable,
+"""
+
+RECORDER = """entity_id,state,last_changed
+sensor.water,10,2026-01-01T00:00:00+00:00
+sensor.other,99,2026-01-01T00:00:00+00:00
+sensor.water,15,2026-01-01T00:01:00+00:00
+"""
+
+# As exported from the history panel: grouped by entity
+GROUPED = """entity_id,state,last_changed
+sensor.water,10,2026-01-01T00:00:00+00:00
+sensor.water,15,2026-01-01T00:02:00+00:00
+number.pid,20,2026-01-01T00:00:00+00:00
+number.pid,25,2026-01-01T00:01:00+00:00
+"""
+
+
+def test_read_wide() -> None:
+    """Test reading a wide CSV file, empty cells are not a change."""
+    samples = list(read_samples(io.StringIO(WIDE)))
+    assert [signal for _, signal, _ in samples] == [
+        "input1",
+        "setpoint",
+        "input1",
+        "input1",
+    ]
+    assert samples[1][2] == SETPOINT
+
+
+def test_read_recorder_export() -> None:
+    """Test reading a recorder export, only the mapped entities are read."""
+    samples = list(read_samples(io.StringIO(RECORDER), {"input1": "sensor.water"}))
+    assert [(signal, value) for _, signal, value in samples] == [
+        ("input1", 10.0),
+        ("input1", 15.0),
+    ]
+
+
+def test_read_grouped_export() -> None:
+    """Test that an export grouped by entity is replayed in time order."""
+    entities = {"input1": "sensor.water", "setpoint": "number.pid"}
+    samples = list(read_samples(io.StringIO(GROUPED), entities))
+    assert [(signal, value) for _, signal, value in samples] == [
+        ("input1", 10.0),
+        ("setpoint", 20.0),
+        ("setpoint", 25.0),
+        ("input1", 15.0),
+    ]
+    config = ReplayConfig(kp=1.0, ki=0.0, kd=0.0, cycle_time=CYCLE_TIME)
+    trace = io.StringIO()
+    result = replay(iter(samples), config, trace)
+
+    # Cycles at 0, 30, 60, 90 and 120 s
+    outputs = [float(row.split(",")[-1]) for row in trace.getvalue().split()[1:]]
+    assert outputs == [10.0, 10.0, 15.0, 15.0, 10.0]
+    assert result.skipped == 0
+
+
+def test_unordered_history() -> None:
+    """Test that a wide file out of time order is refused."""
+    history = "timestamp,input1,setpoint\n60,10,20\n0,15,20\n"
+    with pytest.raises(ValueError, match="not in time order"):
+        replay(read_samples(io.StringIO(history)), ReplayConfig())
+
+
+def test_read_without_time() -> None:
+    """Test that a file without time column is refused."""
+    with pytest.raises(ValueError, match="No time column"):
+        list(read_samples(io.StringIO("input1\n10\n")))
+
+
+def test_replay_kp() -> None:
+    """Test that the outputs follow the recorded inputs, in virtual time."""
+    config = ReplayConfig(kp=1.0, ki=0.0, kd=0.0, cycle_time=CYCLE_TIME)
+    trace = io.StringIO()
+    result = replay(read_samples(io.StringIO(WIDE)), config, trace)
+
+    # Cycles at 0, 30, 60, 90 and 120 s; the last input is unavailable
+    outputs = [float(row.split(",")[-1]) for row in trace.getvalue().split()[1:]]
+    assert outputs == [10.0, 10.0, 5.0, 5.0]
+    assert result.cycles == len(outputs)
+    assert result.skipped == 1
+    assert result.output_travel == pytest.approx(5.0)
+    assert result.metrics.iae > 0
+
+
+def test_main(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Test the command line."""
+    history = tmp_path / "history.csv"
+    history.write_text(RECORDER)
+    assert (
+        main(
+            [
+                str(history),
+                "--kp",
+                "1",
+                "--ki",
+                "0",
+                "--setpoint",
+                str(SETPOINT),
+                "--entity",
+                "input1=sensor.water",
+            ]
+        )
+        == 0
+    )
+    assert "cycles: 3" in capsys.readouterr().out
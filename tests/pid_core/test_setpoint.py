@@ -0,0 +1,34 @@
+"""Test the setpoint ramp and profiles of the pid_controller."""
+
+import pytest
+
+from pid_core.setpoint import SetpointProfile, ramp
+
+START = 1000.0
+
+
+def test_ramp() -> None:
+    """Test that the ramp limits the change of the setpoint."""
+    assert ramp(10.0, 20.0, 2.5) == pytest.approx(12.5)
+    assert ramp(20.0, 10.0, 2.5) == pytest.approx(17.5)
+    assert ramp(19.0, 20.0, 2.5) == pytest.approx(20.0)
+    assert ramp(float("nan"), 20.0, 2.5) == pytest.approx(20.0)
+
+
+def test_profile_interpolation() -> None:
+    """Test interpolation between the points of a profile."""
+    profile = SetpointProfile(START, [(3600.0, 21.0), (0.0, 18.0), (7200.0, 21.0)])
+    assert len(profile) == len([0.0, 3600.0, 7200.0])
+    assert profile.value(START - 10.0) == pytest.approx(18.0)
+    assert profile.value(START + 1800.0) == pytest.approx(19.5)
+    assert profile.value(START + 5000.0) == pytest.approx(21.0)
+    assert not profile.finished(START + 7199.0)
+    assert profile.finished(START + 7200.0)
+    assert profile.value(START + 9000.0) == pytest.approx(21.0)
+    assert profile.end == pytest.approx(START + 7200.0)
+
+
+def test_empty_profile() -> None:
+    """Test that a profile needs points."""
+    with pytest.raises(ValueError, match="at least one point"):
+        SetpointProfile(START, [])
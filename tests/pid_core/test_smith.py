@@ -0,0 +1,94 @@
+"""Test the Smith predictor of the pid_controller."""
+
+import math
+from collections import deque
+
+import pytest
+from dvg_pid_controller import PID_Controller
+
+from pid_core.core import ControllerCore
+from pid_core.mpc import PlantModel
+from pid_core.smith import SmithPredictor
+
+CYCLE_TIME = 10.0
+DEAD_TIME_CYCLES = 3
+# A slow process with a long transport delay, like a floor heating
+PLANT = PlantModel(gain=2.0, time_constant=300.0, dead_time=200.0)
+START = 20.0
+SETPOINT = 40.0
+# Gains that are far too aggressive for the dead time of the plant
+KP = 3.0
+KI = 0.01
+MAX_OVERSHOOT = 5.0
+
+
+def test_delay_buffer() -> None:
+    """Test that the delayed model output lags by the dead time in cycles."""
+    predictor = SmithPredictor(
+        PlantModel(1.0, 0.0, DEAD_TIME_CYCLES * CYCLE_TIME), CYCLE_TIME
+    )
+    predictor.reset(0.0)
+    corrections = []
+    for _ in range(DEAD_TIME_CYCLES + 2):
+        predictor.update(1.0)
+        corrections.append(predictor.correction)
+    # Without time constant the model follows at once; its delayed copy later
+    assert corrections == [1.0] * DEAD_TIME_CYCLES + [0.0, 0.0]
+    assert predictor.delayed_output == predictor.model_output == 1.0
+
+
+def test_no_dead_time() -> None:
+    """Test that without dead time there is nothing to correct."""
+    predictor = SmithPredictor(PlantModel(2.0, 60.0), CYCLE_TIME)
+    predictor.reset(10.0)
+    predictor.update(50.0)
+    assert predictor.correction == 0.0
+
+
+def test_catch_up() -> None:
+    """Test that deferred cycles advance the model with the held output."""
+    model = PlantModel(1.0, 20.0, DEAD_TIME_CYCLES * CYCLE_TIME)
+    every_cycle = SmithPredictor(model, CYCLE_TIME)
+    deferred = SmithPredictor(model, CYCLE_TIME)
+    every_cycle.reset(0.0)
+    deferred.reset(0.0)
+    for predictor in (every_cycle, deferred):
+        predictor.update(1.0)
+    for _ in range(3):
+        every_cycle.update(1.0)
+    deferred.catch_up(3 * CYCLE_TIME, 1.0)
+    deferred.update(1.0)
+    assert deferred.model_output == every_cycle.model_output
+    assert deferred.correction == every_cycle.correction
+    # A cycle on time has nothing to catch up
+    deferred.catch_up(CYCLE_TIME, 5.0)
+    assert deferred.model_output == every_cycle.model_output
+
+
+def _step_response(*, smith: bool) -> ControllerCore:
+    """Run a setpoint step on the plant; return the core with its metrics."""
+    pid = PID_Controller(KP, KI, 0.0)
+    pid.set_output_limits(0.0, 100.0)
+    core = ControllerCore(
+        pid, predictor=SmithPredictor(PLANT, CYCLE_TIME) if smith else None
+    )
+    pole, input_gain, delay = PLANT.discretize(CYCLE_TIME)
+    transport = deque([0.0] * delay)
+    measurement = START
+    core.start(measurement, math.nan, 0.0)
+    for _ in range(400):
+        transport.append(core.cycle(measurement, math.nan, SETPOINT, CYCLE_TIME))
+        measurement = (
+            START + pole * (measurement - START) + input_gain * transport.popleft()
+        )
+    return core
+
+
+def test_dead_time_compensation() -> None:
+    """Test that aggressive gains oscillate, unless the dead time is compensated."""
+    assert _step_response(smith=False).metrics.oscillation_period is not None
+
+    core = _step_response(smith=True)
+    assert core.metrics.oscillation_period is None
+    assert core.metrics.overshoot < MAX_OVERSHOOT
+    assert core.pid.last_error == pytest.approx(0.0, abs=1e-3)
@@ -15,16 +15,26 @@ from homeassistant.data_entry_flow import FlowResultType
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.pid_controller.const import (
+    CONF_DERIVATIVE_FILTER,
+    CONF_DERIVATIVE_ON,
     CONF_INPUT1,
     CONF_OUTPUT,
     CONF_PID_DIR,
+    CONF_PRIORITY,
+    CONF_SETPOINT_RAMP_RATE,
+    CONF_SETPOINT_WEIGHT_P,
     CONF_STEP,
     DEFAULT_CYCLE_TIME,
+    DEFAULT_DERIVATIVE_FILTER,
+    DEFAULT_DERIVATIVE_ON,
     DEFAULT_MODE,
     DEFAULT_PID_DIR,
     DEFAULT_PID_KD,
     DEFAULT_PID_KI,
     DEFAULT_PID_KP,
+    DEFAULT_PRIORITY,
+    DEFAULT_SETPOINT_RAMP_RATE,
+    DEFAULT_SETPOINT_WEIGHT_P,
     DOMAIN,
 )
 from custom_components.pid_controller.pid_shared.const import (
@@ -81,9 +91,14 @@ async def test_config_flow(hass: HomeAssistant, platform: str) -> None:  # noqa:
         CONF_PID_KP: DEFAULT_PID_KP,
         CONF_PID_KI: DEFAULT_PID_KI,
         CONF_PID_KD: DEFAULT_PID_KD,
+        CONF_DERIVATIVE_ON: DEFAULT_DERIVATIVE_ON,
+        CONF_DERIVATIVE_FILTER: DEFAULT_DERIVATIVE_FILTER,
+        CONF_SETPOINT_WEIGHT_P: DEFAULT_SETPOINT_WEIGHT_P,
+        CONF_PRIORITY: DEFAULT_PRIORITY,
         CONF_PID_DIR: DEFAULT_PID_DIR,
         CONF_MINIMUM: DEFAULT_MIN_VALUE,
         CONF_MAXIMUM: DEFAULT_MAX_VALUE,
+        CONF_SETPOINT_RAMP_RATE: DEFAULT_SETPOINT_RAMP_RATE,
         CONF_STEP: DEFAULT_STEP,
         CONF_MODE: DEFAULT_MODE,
     }
@@ -159,9 +174,14 @@ async def test_options(hass: HomeAssistant, platform: str) -> None:
         CONF_PID_KP: DEFAULT_PID_KP,
         CONF_PID_KI: DEFAULT_PID_KI,
         CONF_PID_KD: DEFAULT_PID_KD,
+        CONF_DERIVATIVE_ON: DEFAULT_DERIVATIVE_ON,
+        CONF_DERIVATIVE_FILTER: DEFAULT_DERIVATIVE_FILTER,
+        CONF_SETPOINT_WEIGHT_P: DEFAULT_SETPOINT_WEIGHT_P,
+        CONF_PRIORITY: DEFAULT_PRIORITY,
         CONF_PID_DIR: DEFAULT_PID_DIR,
         CONF_MINIMUM: DEFAULT_MIN_VALUE,
         CONF_MAXIMUM: DEFAULT_MAX_VALUE,
+        CONF_SETPOINT_RAMP_RATE: DEFAULT_SETPOINT_RAMP_RATE,
         CONF_STEP: DEFAULT_STEP,
         CONF_MODE: DEFAULT_MODE,
     }
@@ -174,9 +194,14 @@ async def test_options(hass: HomeAssistant, platform: str) -> None:
         CONF_PID_KP: DEFAULT_PID_KP,
         CONF_PID_KI: DEFAULT_PID_KI,
         CONF_PID_KD: DEFAULT_PID_KD,
+        CONF_DERIVATIVE_ON: DEFAULT_DERIVATIVE_ON,
+        CONF_DERIVATIVE_FILTER: DEFAULT_DERIVATIVE_FILTER,
+        CONF_SETPOINT_WEIGHT_P: DEFAULT_SETPOINT_WEIGHT_P,
+        CONF_PRIORITY: DEFAULT_PRIORITY,
         CONF_PID_DIR: DEFAULT_PID_DIR,
         CONF_MINIMUM: DEFAULT_MIN_VALUE,
         CONF_MAXIMUM: DEFAULT_MAX_VALUE,
+        CONF_SETPOINT_RAMP_RATE: DEFAULT_SETPOINT_RAMP_RATE,
         CONF_STEP: DEFAULT_STEP,
         CONF_MODE: DEFAULT_MODE,
     }
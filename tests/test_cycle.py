@@ -0,0 +1,42 @@
+"""Test the adaptive cycle time of the pid_controller."""
+
+import pytest
+
+from custom_components.pid_controller.cycle import PERIOD_GROWTH, AdaptiveCycle
+
+MINIMUM = 1.0
+MAXIMUM = 10.0
+ERROR_THRESHOLD = 1.0
+RATE_THRESHOLD = 0.1
+KEPT_PERIOD = 4.0
+
+
+@pytest.fixture(name="cycle")
+def _fixture_cycle() -> AdaptiveCycle:
+    """Return an adaptive cycle at its minimum period."""
+    return AdaptiveCycle(MINIMUM, MAXIMUM, ERROR_THRESHOLD, RATE_THRESHOLD)
+
+
+def test_settle_and_transient(cycle: AdaptiveCycle) -> None:
+    """Test that a settled loop slows down and a disturbance speeds it up."""
+    assert cycle.period == MINIMUM
+    assert cycle.update(0.1, MINIMUM) == MINIMUM * PERIOD_GROWTH
+    for _ in range(10):
+        cycle.update(0.1, cycle.period)
+    assert cycle.period == MAXIMUM
+
+    # A large error: back to the minimum period at once
+    assert cycle.update(5.0, MAXIMUM) == MINIMUM
+
+
+def test_rate_and_hysteresis(cycle: AdaptiveCycle) -> None:
+    """Test the rate threshold and the band in which the period is kept."""
+    cycle.update(0.0, MINIMUM)
+    # Small error changing fast: still a transient
+    assert cycle.update(0.4, MINIMUM) == MINIMUM
+    # Error between half and the full threshold: period is kept
+    cycle.period = KEPT_PERIOD
+    assert cycle.update(0.8, 100.0) == KEPT_PERIOD
+
+    cycle.speed_up()
+    assert cycle.period == MINIMUM
@@ -0,0 +1,74 @@
+"""Test the diagnostics of the pid_controller."""
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from homeassistant.const import ATTR_ENTITY_ID, CONF_NAME, SERVICE_TURN_ON
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pid_controller.const import (
+    CONF_INPUT1,
+    CONF_OUTPUT,
+    DOMAIN,
+)
+from custom_components.pid_controller.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.pid_controller.pid_shared.const import (
+    CONF_CYCLE_TIME,
+    CONF_PID_KI,
+    CONF_PID_KP,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+CYCLE_TIME = 0.01
+INPUT = 10.0
+MAXIMUM = 100.0
+
+
+async def test_config_entry_diagnostics(hass: HomeAssistant) -> None:
+    """Test that the diagnostics hold the regulator, outputs and last cycles."""
+    input_par = "sensor.input"
+    output_par = "input_number.output"
+    hass.states.async_set(input_par, str(INPUT))
+    hass.states.async_set(output_par, "0.0", {"min": 0, "max": MAXIMUM, "step": 1})
+    options = {
+        CONF_NAME: "My pid_controller",
+        CONF_INPUT1: input_par,
+        CONF_OUTPUT: output_par,
+        CONF_PID_KP: 1.0,
+        CONF_PID_KI: 0.0,
+        CONF_CYCLE_TIME: {"seconds": CYCLE_TIME},
+    }
+    config_entry = MockConfigEntry(
+        data={}, domain=DOMAIN, options=options, title="My pid_controller"
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: "number.my_pid_controller"},
+        blocking=True,
+    )
+    await asyncio.sleep(CYCLE_TIME * 5)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert diagnostics["config"] == options
+    (controller,) = diagnostics["controllers"]
+    assert controller["entity_id"] == "number.my_pid_controller"
+    assert controller["pid"]["in_auto"]
+    assert controller["pid"]["output_limit_max"] == MAXIMUM
+    assert controller["inputs"]["input1"] == input_par
+    (output,) = controller["outputs"]
+    assert output["entity_id"] == output_par
+    assert output["limits"] == [0, MAXIMUM, 1]
+    assert controller["timing"]["cycles"] > 0
+    assert controller["cycles"]
+    assert controller["cycles"][-1]["input1"] == INPUT
+    # Input 2 is not configured: NaN shows as None
+    assert controller["cycles"][-1]["input2"] is None
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,95 @@
+"""Test the load governor of the pid_controller."""
+
+import asyncio
+
+from custom_components.pid_controller.const import (
+    PRIORITY_CRITICAL,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+)
+from custom_components.pid_controller.governor import (
+    LAG_THRESHOLDS,
+    MAX_DEFERRALS,
+    PROBE_INTERVAL,
+    LoadGovernor,
+)
+
+NO_LAG = 0.0
+# A lag between the thresholds of normal and high priority
+HIGH_LAG = (LAG_THRESHOLDS[1] + LAG_THRESHOLDS[2]) / 2
+EXTREME_LAG = 10.0
+DEFERRED_BY_HIGH_LAG = 2
+
+
+def test_idle() -> None:
+    """Test that without lag or load every cycle runs."""
+    governor = LoadGovernor()
+    governor.record(NO_LAG, PROBE_INTERVAL)
+    assert governor.pressure == 0
+    assert governor.admit(PRIORITY_LOW, 0)
+    assert governor.deferred == 0
+
+
+def test_lag_defers_by_priority() -> None:
+    """Test that lag defers the lower priorities, never the critical ones."""
+    governor = LoadGovernor()
+    governor.record(HIGH_LAG, PROBE_INTERVAL)
+    assert not governor.admit(PRIORITY_LOW, 0)
+    assert not governor.admit(PRIORITY_NORMAL, 0)
+    assert governor.admit(PRIORITY_HIGH, 0)
+    assert governor.admit(PRIORITY_CRITICAL, 0)
+    # Low and normal priority
+    assert governor.deferred == DEFERRED_BY_HIGH_LAG
+
+    governor.record(EXTREME_LAG, PROBE_INTERVAL)
+    assert not governor.admit(PRIORITY_HIGH, 0)
+    assert governor.admit(PRIORITY_CRITICAL, 0)
+
+
+def test_lag_decays() -> None:
+    """Test that the pressure drops gradually once the lag is gone."""
+    governor = LoadGovernor()
+    governor.record(EXTREME_LAG, PROBE_INTERVAL)
+    pressures = []
+    for _ in range(12):
+        governor.record(NO_LAG, PROBE_INTERVAL)
+        pressures.append(governor.pressure)
+    assert pressures == sorted(pressures, reverse=True)
+    assert pressures[-1] == 0
+
+
+def test_cpu_budget() -> None:
+    """Test that controllers using too much of the loop defer low priority."""
+    governor = LoadGovernor()
+    governor.account(0.5 * PROBE_INTERVAL)
+    governor.record(NO_LAG, PROBE_INTERVAL)
+    assert not governor.admit(PRIORITY_LOW, 0)
+    assert governor.admit(PRIORITY_NORMAL, 0)
+    # The load is measured again over the next interval
+    governor.record(NO_LAG, PROBE_INTERVAL)
+    assert governor.admit(PRIORITY_LOW, 0)
+
+
+def test_no_starvation() -> None:
+    """Test that a deferred controller runs after a few deferrals anyway."""
+    governor = LoadGovernor()
+    governor.record(EXTREME_LAG, PROBE_INTERVAL)
+    admitted = [governor.admit(PRIORITY_LOW, deferrals) for deferrals in range(6)]
+    assert admitted == [False] * MAX_DEFERRALS + [True, True]
+
+
+async def test_probe() -> None:
+    """Test that the probe measures a blocked event loop."""
+    loop = asyncio.get_running_loop()
+    governor = LoadGovernor()
+    governor.start(loop)
+    # Block the loop past the probe, as a slow integration would
+    blocked_until = loop.time() + PROBE_INTERVAL + HIGH_LAG
+    while loop.time() < blocked_until:
+        pass
+    for _ in range(2):
+        await asyncio.sleep(0)
+    governor.stop()
+    assert governor.lag >= HIGH_LAG
+    assert not governor.admit(PRIORITY_NORMAL, 0)
@@ -0,0 +1,86 @@
+"""Test the output groups of the pid_controller."""
+
+import pytest
+
+from custom_components.pid_controller.const import (
+    COMBINE_AVERAGE,
+    COMBINE_MAX,
+    COMBINE_MIN,
+    COMBINE_SUM,
+)
+from custom_components.pid_controller.group import STALE_PERIODS, OutputGroup
+
+OUTPUT = "number.boiler"
+LOW = 20.0
+HIGH = 60.0
+PERIOD = 10.0
+
+
+@pytest.mark.parametrize(
+    ("function", "expected"),
+    [
+        (COMBINE_MAX, HIGH),
+        (COMBINE_MIN, LOW),
+        (COMBINE_SUM, LOW + HIGH),
+        (COMBINE_AVERAGE, (LOW * 1.0 + HIGH * 3.0) / 4.0),
+    ],
+)
+def test_combine(function: str, expected: float) -> None:
+    """Test that a full round of outputs is combined into one value."""
+    group = OutputGroup(OUTPUT, function)
+    group.add("zone_1", 1.0, PERIOD)
+    group.add("zone_2", 3.0, PERIOD)
+    group.activate("zone_1", 0.0)
+    group.activate("zone_2", 0.0)
+
+    # Enabled members take part in the first round before they report
+    assert group.submit("zone_1", LOW, PERIOD) is None
+    assert group.submit("zone_2", HIGH, PERIOD) == pytest.approx(expected)
+    assert group.submit("zone_1", LOW, 2 * PERIOD) is None
+
+
+def test_withdraw_and_remove() -> None:
+    """Test that disabled or removed members do not block the group."""
+    group = OutputGroup(OUTPUT, COMBINE_MAX)
+    group.add("zone_1", 1.0, PERIOD)
+    group.add("zone_2", 1.0, PERIOD)
+    # zone_2 is not enabled: zone_1 completes the rounds on its own
+    group.activate("zone_1", 0.0)
+    assert group.submit("zone_1", LOW, PERIOD) == LOW
+
+    # zone_2 reports, and is part of the rounds from now on
+    assert group.submit("zone_2", HIGH, PERIOD) is None
+    assert group.submit("zone_1", LOW, 2 * PERIOD) == HIGH
+    assert group.submit("zone_2", HIGH, 2 * PERIOD) is None
+    assert group.submit("zone_1", LOW, 3 * PERIOD) == HIGH
+
+    # zone_2 is turned off
+    group.withdraw("zone_2")
+    assert group.submit("zone_1", LOW, 4 * PERIOD) == LOW
+
+    group.remove("zone_2")
+    group.remove("zone_1")
+    assert not group
+
+
+def test_stale_member() -> None:
+    """Test that a member that stops reporting expires from the round."""
+    group = OutputGroup(OUTPUT, COMBINE_MAX)
+    group.add("zone_1", 1.0, PERIOD)
+    group.add("zone_2", 1.0, PERIOD)
+    group.activate("zone_1", 0.0)
+    group.activate("zone_2", 0.0)
+    assert group.submit("zone_1", LOW, PERIOD) is None
+    assert group.submit("zone_2", HIGH, PERIOD) == HIGH
+
+    # zone_2 lost its input: zone_1 waits for it up to STALE_PERIODS cycles
+    now = PERIOD
+    while now < (1 + STALE_PERIODS) * PERIOD:
+        now += PERIOD
+        assert group.submit("zone_1", LOW, now) is None
+    assert group.submit("zone_1", LOW, now + PERIOD) == LOW
+    assert group.submit("zone_1", LOW, now + 2 * PERIOD) == LOW
+
+    # Its next report brings zone_2 back into the round
+    assert group.submit("zone_2", HIGH, now + 2 * PERIOD) is None
+    assert group.submit("zone_1", LOW, now + 3 * PERIOD) == HIGH
@@ -0,0 +1,55 @@
+"""Test the health watchdog of the pid_controller."""
+
+import pytest
+
+from custom_components.pid_controller.const import (
+    PROBLEM_SATURATED,
+    PROBLEM_UNRESPONSIVE,
+)
+from custom_components.pid_controller.health import HealthMonitor
+
+RESPONSE_TIMEOUT = 60.0
+SATURATION_TIMEOUT = 3600.0
+
+
+@pytest.fixture(name="monitor")
+def _fixture_monitor() -> HealthMonitor:
+    """Return a healthy monitor."""
+    return HealthMonitor(RESPONSE_TIMEOUT, SATURATION_TIMEOUT)
+
+
+def test_unresponsive(monitor: HealthMonitor) -> None:
+    """Test that a write not reported back in time is a problem until it is."""
+    assert monitor.update(10.0, pending_since=0.0, saturated=False) == []
+    assert monitor.update(RESPONSE_TIMEOUT, pending_since=0.0, saturated=False) == [
+        (PROBLEM_UNRESPONSIVE, True)
+    ]
+    # Reported once, not again
+    assert monitor.update(90.0, pending_since=0.0, saturated=False) == []
+    assert monitor.problems == {PROBLEM_UNRESPONSIVE}
+
+    assert monitor.update(100.0, pending_since=None, saturated=False) == [
+        (PROBLEM_UNRESPONSIVE, False)
+    ]
+    assert not monitor.problems
+
+
+def test_saturated(monitor: HealthMonitor) -> None:
+    """Test that the saturation duration restarts when the output leaves a limit."""
+    monitor.update(0.0, pending_since=None, saturated=True)
+    monitor.update(1000.0, pending_since=None, saturated=False)
+    assert monitor.saturation_duration(1000.0) == 0.0
+
+    monitor.update(2000.0, pending_since=None, saturated=True)
+    assert monitor.update(5000.0, pending_since=None, saturated=True) == []
+    assert monitor.saturation_duration(5000.0) == pytest.approx(3000.0)
+    assert monitor.update(
+        2000.0 + SATURATION_TIMEOUT, pending_since=None, saturated=True
+    ) == [(PROBLEM_SATURATED, True)]
+
+
+def test_disabled() -> None:
+    """Test that a timeout of 0 disables a check."""
+    monitor = HealthMonitor(0.0, 0.0)
+    monitor.update(0.0, pending_since=0.0, saturated=True)
+    assert monitor.update(1e6, pending_since=0.0, saturated=True) == []
@@ -8,6 +8,7 @@ from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.pid_controller.const import (
+    ATTR_INPUT1,
     CONF_INPUT1,
     CONF_OUTPUT,
     DOMAIN,
@@ -63,3 +64,30 @@ async def test_setup_and_remove_config_entry(
     # Check the state and entity registry entry are removed
     assert hass.states.get(pid_controller_entity_id) is None
     assert registry.async_get(pid_controller_entity_id) is None
+
+
+async def test_rename_stored_in_config_entry(hass: HomeAssistant) -> None:
+    """Test that a renamed input is written to the options of the entry."""
+    input_par = "sensor.input"
+    renamed_par = "sensor.renamed"
+    registry = er.async_get(hass)
+    registry.async_get_or_create("sensor", "test", "input", suggested_object_id="input")
+    config_entry = MockConfigEntry(
+        data={},
+        domain=DOMAIN,
+        options={
+            CONF_OUTPUT: "number.output",
+            CONF_INPUT1: input_par,
+            CONF_NAME: "My pid_controller",
+        },
+        title="My pid_controller",
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    registry.async_update_entity(input_par, new_entity_id=renamed_par)
+    await hass.async_block_till_done()
+    assert config_entry.options[CONF_INPUT1] == renamed_par
+    state = hass.states.get("number.my_pid_controller")
+    assert state.attributes[ATTR_INPUT1] == renamed_par
@@ -0,0 +1,291 @@
+"""
+Load test of the pid_controller: hundreds of controllers on one event loop.
+
+Every controller regulates its own plant: a first order process that reads
+a number entity, the valve, and reports its temperature as a sensor state.
+The plants and valves run in process, so the test needs no external
+services. After a warmup, event loop lag, cycle jitter, state writes per
+second and memory growth are measured and checked against their budgets.
+The measurements are recorded as properties, e.g. with --junitxml.
+
+The budgets are wall-clock budgets, so the test is marked load and left out
+of the default run. Run it locally with: pytest -m load tests/test_load.py
+"""
+
+import asyncio
+import gc
+import math
+import time
+import tracemalloc
+from collections import Counter
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from homeassistant.components.number import ATTR_VALUE, NumberEntity
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CONF_NAME,
+    CONF_PLATFORM,
+    ENTITY_MATCH_ALL,
+    EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
+    Platform,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockPlatform, mock_platform
+
+from custom_components.pid_controller.const import (
+    ATTR_ENABLE,
+    CONF_INPUT1,
+    CONF_OUTPUT,
+    DATA_ENTITIES,
+    DOMAIN,
+    SERVICE_BULK_UPDATE,
+)
+from custom_components.pid_controller.pid_shared.const import (
+    CONF_CYCLE_TIME,
+    CONF_PID_KI,
+    CONF_PID_KP,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+    from custom_components.pid_controller.number import PidEntity
+
+pytestmark = pytest.mark.load
+
+CONTROLLERS = 200
+CYCLE_TIME = 0.2
+SETPOINT = 50.0
+WARMUP = 1.0
+WINDOW = 3.0
+PROBE_INTERVAL = 0.05
+# Plant: temperature = AMBIENT + GAIN * valve, with a time constant
+AMBIENT = 20.0
+GAIN = 0.5
+TIME_CONSTANT = 2.0
+PLANT = "sensor.plant"
+
+# Budgets; a regression beyond them fails the test
+MAX_LAG = 0.5
+MAX_MEAN_LAG = 0.05
+MAX_MEAN_JITTER = 0.05
+# Share of the cycles due in the window that must have run
+MIN_CYCLE_SHARE = 0.8
+# Every entity of a controller, the controller itself, its wear sensors and
+# its valve, writes at most once per cycle: an entity writing twice per
+# cycle exceeds it, also while the others write less
+MAX_WRITES_PER_CYCLE = 1
+BYTES_GROWTH_PER_CONTROLLER = 4096
+
+
+class PlantValve(NumberEntity):
+    """The output of a controller: a valve that only stores its position."""
+
+    _attr_should_poll = False
+    _attr_native_min_value = 0.0
+    _attr_native_max_value = 100.0
+    _attr_native_step = 0.1
+
+    def __init__(self, index: int) -> None:
+        """Initialize a closed valve."""
+        self._attr_name = f"valve {index}"
+        self._attr_native_value = 0.0
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Move the valve."""
+        self._attr_native_value = value
+        self.async_write_ha_state()
+
+
+class Plant:
+    """A first order process, reporting its temperature as a sensor state."""
+
+    __slots__ = ("entity_id", "reported", "temperature", "valve")
+
+    def __init__(self, index: int, valve: PlantValve) -> None:
+        """Initialize the plant at ambient temperature."""
+        self.entity_id = f"{PLANT}_{index}"
+        self.valve = valve
+        self.temperature = AMBIENT
+        self.reported = math.nan
+
+    @callback
+    def async_step(self, hass: HomeAssistant, elapsed: float) -> None:
+        """Advance the process; report it like a sensor, only when it changed."""
+        target = AMBIENT + GAIN * (self.valve.native_value or 0.0)
+        self.temperature += (target - self.temperature) * min(
+            elapsed / TIME_CONSTANT, 1.0
+        )
+        reported = round(self.temperature, 1)
+        if reported != self.reported:
+            self.reported = reported
+            hass.states.async_set(self.entity_id, str(reported))
+
+
+async def _async_probe_lag(lags: list[float]) -> None:
+    """Measure how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(loop.time() - start - PROBE_INTERVAL)
+
+
+async def _async_setup_load(hass: HomeAssistant) -> None:
+    """Set up the plants and their controllers, enabled at the setpoint."""
+    valves = [PlantValve(index) for index in range(CONTROLLERS)]
+    plants = [Plant(index, valve) for index, valve in enumerate(valves)]
+
+    async def _async_setup_valves(
+        _hass: HomeAssistant,
+        _config: Any,
+        async_add_entities: AddEntitiesCallback,
+        _discovery_info: Any = None,
+    ) -> None:
+        async_add_entities(valves)
+
+    mock_platform(
+        hass,
+        f"test.{Platform.NUMBER}",
+        MockPlatform(async_setup_platform=_async_setup_valves),
+    )
+    for plant in plants:
+        plant.async_step(hass, 0.0)
+    controllers = [
+        {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: f"zone {index}",
+            CONF_INPUT1: plant.entity_id,
+            CONF_OUTPUT: f"{Platform.NUMBER}.valve_{index}",
+            CONF_PID_KP: 2.0,
+            CONF_PID_KI: 0.5,
+            CONF_CYCLE_TIME: {"seconds": CYCLE_TIME},
+        }
+        for index, plant in enumerate(plants)
+    ]
+    assert await async_setup_component(hass, "homeassistant", {})
+    assert await async_setup_component(
+        hass,
+        Platform.NUMBER,
+        {Platform.NUMBER: [{CONF_PLATFORM: "test"}, *controllers]},
+    )
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_UPDATE,
+        {ATTR_ENTITY_ID: ENTITY_MATCH_ALL, ATTR_VALUE: SETPOINT, ATTR_ENABLE: True},
+        blocking=True,
+    )
+
+    @callback
+    def _async_step_plants(_now: Any) -> None:
+        for plant in plants:
+            plant.async_step(hass, CYCLE_TIME)
+
+    unsub = async_track_time_interval(
+        hass, _async_step_plants, timedelta(seconds=CYCLE_TIME)
+    )
+
+    @callback
+    def _async_stop_plants(_event: Event) -> None:
+        unsub()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_plants)
+
+
+def _cycles(controllers: list[PidEntity]) -> list[int]:
+    """Return the number of cycles run by each controller."""
+    return [controller.diagnostics()["timing"]["cycles"] for controller in controllers]
+
+
+def _controllers(hass: HomeAssistant) -> list[PidEntity]:
+    """Return the controller entities."""
+    return list(hass.data[DOMAIN][DATA_ENTITIES].values())
+
+
+async def _async_stop(hass: HomeAssistant) -> None:
+    """Stop Home Assistant, and with it the controllers and plants."""
+    await hass.services.async_call("homeassistant", "stop", None, blocking=True)
+
+
+async def test_load_timing(
+    hass: HomeAssistant, record_property: pytest.RecordProperty
+) -> None:
+    """Test event loop lag, cycle jitter and state writes under load."""
+    await _async_setup_load(hass)
+    controllers = _controllers(hass)
+    assert len(controllers) == CONTROLLERS
+    await asyncio.sleep(WARMUP)
+
+    writes: Counter[str] = Counter()
+
+    @callback
+    def _async_count_write(event: Event) -> None:
+        # The plants are the test's own sensors
+        if not event.data[ATTR_ENTITY_ID].startswith(PLANT):
+            writes[event.data[ATTR_ENTITY_ID]] += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _async_count_write)
+    cycles_before = _cycles(controllers)
+    window_start = time.time()
+    lags: list[float] = []
+    probe = hass.async_create_background_task(_async_probe_lag(lags), "lag probe")
+    await asyncio.sleep(WINDOW)
+    probe.cancel()
+    unsub()
+
+    cycles = [
+        after - before
+        for before, after in zip(cycles_before, _cycles(controllers), strict=True)
+    ]
+    # The intervals between the cycles of the window, from the cycle traces
+    jitters = [
+        abs(row["elapsed"] - CYCLE_TIME)
+        for controller in controllers
+        for row in controller.diagnostics()["cycles"]
+        if row["time"] > window_start
+    ]
+    # The busiest entity against the most cycles a controller ran; one more
+    # for a write of a cycle that started before the window
+    busiest = max(writes.values())
+    record_property("cycles_per_second", round(sum(cycles) / WINDOW))
+    record_property("max_lag", round(max(lags), 4))
+    record_property("mean_lag", round(sum(lags) / len(lags), 4))
+    record_property("mean_jitter", round(sum(jitters) / len(jitters), 4))
+    record_property("writes_per_second", round(writes.total() / WINDOW))
+    record_property("writes_per_cycle", round(busiest / max(cycles), 2))
+    await _async_stop(hass)
+
+    assert sum(cycles) >= MIN_CYCLE_SHARE * CONTROLLERS * WINDOW / CYCLE_TIME
+    assert max(lags) < MAX_LAG
+    assert sum(lags) / len(lags) < MAX_MEAN_LAG
+    assert sum(jitters) / len(jitters) < MAX_MEAN_JITTER
+    assert busiest <= MAX_WRITES_PER_CYCLE * max(cycles) + 1
+
+
+async def test_load_memory(
+    hass: HomeAssistant, record_property: pytest.RecordProperty
+) -> None:
+    """Test that running controllers do not accumulate memory."""
+    await _async_setup_load(hass)
+    await asyncio.sleep(WARMUP)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        await asyncio.sleep(WINDOW)
+        gc.collect()
+        # Only what was allocated in the window and is still held
+        grown = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    per_controller = grown / CONTROLLERS
+    record_property("bytes_growth_per_controller", round(per_controller))
+    await _async_stop(hass)
+
+    assert per_controller < BYTES_GROWTH_PER_CONTROLLER
@@ -0,0 +1,47 @@
+"""Benchmark the memory held by each pid_controller entity."""
+
+import gc
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from homeassistant.const import CONF_NAME, CONF_PLATFORM
+
+from custom_components.pid_controller.const import CONF_INPUT1, CONF_OUTPUT, DOMAIN
+from custom_components.pid_controller.number import PLATFORM_SCHEMA, PidEntity
+
+if TYPE_CHECKING:
+    import pytest
+
+CONTROLLERS = 500
+# Budget per controller, including the regulator of dvg_pid_controller
+BYTES_PER_CONTROLLER = 16384
+
+
+def test_bytes_per_controller(record_property: pytest.RecordProperty) -> None:
+    """Test that a controller stays within its memory budget."""
+    configs = [
+        PLATFORM_SCHEMA(
+            {
+                CONF_PLATFORM: DOMAIN,
+                CONF_NAME: f"zone_{index}",
+                # Shared inputs and outputs, as in a house with many zones
+                CONF_INPUT1: "sensor.outside_temperature",
+                CONF_OUTPUT: "number.boiler",
+            }
+        )
+        for index in range(CONTROLLERS)
+    ]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        entities = [PidEntity(config, None) for config in configs]
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    per_controller = used / len(entities)
+    record_property("bytes_per_controller", round(per_controller))
+    assert per_controller < BYTES_PER_CONTROLLER
+    # Entity ids are interned: all controllers share one string per entity
+    assert entities[0].output is entities[-1].output
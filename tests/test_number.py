@@ -2,10 +2,14 @@
 
 import asyncio
 import logging
+import re
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
+import voluptuous as vol
 from homeassistant.components.number import ATTR_VALUE, SERVICE_SET_VALUE
+from homeassistant.components.select import ATTR_OPTION, SERVICE_SELECT_OPTION
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     CONF_MAXIMUM,
@@ -14,19 +18,55 @@ from homeassistant.const import (
     CONF_PLATFORM,
     SERVICE_TURN_OFF,
     SERVICE_TURN_ON,
+    STATE_UNAVAILABLE,
     Platform,
 )
 from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import issue_registry as ir
 from homeassistant.setup import async_setup_component
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
 from custom_components.pid_controller.const import (
+    ATTR_ACTIVE_SETPOINT,
+    ATTR_CYCLE_PERIOD,
+    ATTR_ENABLE,
+    ATTR_IAE,
+    ATTR_OFFSET,
+    ATTR_OUTPUT,
+    ATTR_OVERRUNS,
+    ATTR_OVERSHOOT,
+    ATTR_PRESET,
+    ATTR_PROBLEMS,
+    ATTR_PROFILE,
+    ATTR_SETPOINT_PROFILE_END,
+    ATTR_SETTLING_TIME,
+    ATTR_SKIPPED_CYCLES,
     CONF_INPUT1,
     CONF_INPUT2,
+    CONF_MAX_CYCLE_TIME,
+    CONF_MIN_CYCLE_TIME,
+    CONF_MIN_MOVE,
     CONF_OUTPUT,
+    CONF_OVERRUN_POLICY,
     CONF_PID_DIR,
+    CONF_PRESETS,
+    CONF_SATURATION_TIMEOUT,
+    CONF_SETPOINT,
+    CONF_SETPOINT_RAMP_RATE,
+    CONF_SPLIT_RANGE,
     DOMAIN,
+    EVENT_HEALTH,
+    OVERRUN_QUEUE_LATEST,
+    OVERRUN_RUN,
+    OVERRUN_SKIP,
     PID_DIR_REVERSE,
+    PROBLEM_SATURATED,
+    SERVICE_BULK_UPDATE,
+    SERVICE_SET_KP,
+    SERVICE_SET_MANUAL_OUTPUT,
+    SERVICE_SET_PRESET,
+    SERVICE_SET_SETPOINT_PROFILE,
 )
 from custom_components.pid_controller.pid_shared.const import (
     CONF_CYCLE_TIME,
@@ -228,6 +268,11 @@ async def test_pid_controller_kp(hass: HomeAssistant, setup_comp: None) -> None:
     # Check if output is equal to 10, as Kp=1
     # and difference between in- and output is 10.
     assert hass.states.get(output_par).state == "10.0"
+    # The input does not move: error accumulates, no overshoot, not settled
+    attributes = hass.states.get(pid).attributes
+    assert attributes[ATTR_IAE] > 0
+    assert attributes[ATTR_OVERSHOOT] == 0
+    assert attributes[ATTR_SETTLING_TIME] is None
     await hass.services.async_call(
         "homeassistant",
         "stop",
@@ -734,6 +779,971 @@ async def test_bad_value(hass: HomeAssistant, setup_comp: None, caplog: None) ->
     )
 
 
+async def test_setpoint_ramp(hass: HomeAssistant, setup_comp: None) -> None:  # noqa: ARG001
+    """Test that a new setpoint is ramped from the process value."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01  # Cycle time in seconds
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+            CONF_SETPOINT_RAMP_RATE: 0.01,
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 20, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        "pid_controller",
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    # Sleep some cyles.
+    await asyncio.sleep(cycle_time * 3)
+    # The setpoint starts at the input value and crawls up, so the
+    # output stays (rounded) at 0, while the number shows the target.
+    assert hass.states.get(pid).state == "20.0"
+    assert hass.states.get(pid).attributes[ATTR_ACTIVE_SETPOINT] < 10.5  # noqa: PLR2004
+    assert hass.states.get(output_par).state == "0.0"
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_setpoint_profile(hass: HomeAssistant, setup_comp: None) -> None:  # noqa: ARG001
+    """Test loading a timed setpoint profile."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01  # Cycle time in seconds
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_SETPOINT_PROFILE,
+        {
+            ATTR_ENTITY_ID: pid,
+            ATTR_PROFILE: [
+                {ATTR_OFFSET: "00:00:00", ATTR_VALUE: 15},
+                {ATTR_OFFSET: "01:00:00", ATTR_VALUE: 25},
+            ],
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(pid).state == "15.0"
+    assert hass.states.get(pid).attributes[ATTR_SETPOINT_PROFILE_END] is not None
+
+    # Points outside the range of the number are refused
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_SETPOINT_PROFILE,
+            {
+                ATTR_ENTITY_ID: pid,
+                ATTR_PROFILE: [{ATTR_OFFSET: "00:10:00", ATTR_VALUE: 500}],
+            },
+            blocking=True,
+        )
+
+    # Setting a value ends the profile
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 20, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(pid).state == "20.0"
+    assert hass.states.get(pid).attributes[ATTR_SETPOINT_PROFILE_END] is None
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_output_bound_late_and_renamed(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+) -> None:
+    """Test an output that loads after the controller and is renamed later."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    renamed_par = "input_number.renamed"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01  # Cycle time in seconds
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+        }
+    }
+    # Controller first, without output
+    await _setup_controller(hass, config, input_par, None, 10.0, 0.0)
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(output_par) is None
+
+    # Now the output loads
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 20, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        "pid_controller",
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(output_par).state == "10.0"
+
+    # Rename the output; the controller follows without a reload
+    er.async_get(hass).async_update_entity(output_par, new_entity_id=renamed_par)
+    await hass.async_block_till_done()
+    hass.states.async_set(input_par, "15.0")
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(pid).attributes[ATTR_OUTPUT] == renamed_par
+    assert hass.states.get(renamed_par).state == "5.0"
+    # The YAML still has the old entity id: a repair asks to update it
+    assert ir.async_get(hass).async_get_issue(DOMAIN, f"renamed_{output_par}_{pid}")
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_output_written_on_change(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+) -> None:
+    """Test that an unchanged output is only rewritten after an external change."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01  # Cycle time in seconds
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 20.3, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        "pid_controller",
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 3)
+    # Quantized to the output step of 0.5, without float noise
+    assert hass.states.get(output_par).state == "10.5"
+
+    # Someone else moves the output: the controller writes it back
+    await hass.services.async_call(
+        "input_number",
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 3, ATTR_ENTITY_ID: output_par},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(output_par).state == "10.5"
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_set_manual_output(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+) -> None:
+    """Test manual output and the bumpless transfer back to automatic."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01  # Cycle time in seconds
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0.01,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 20, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        "pid_controller",
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(output_par).state == "10.0"
+
+    # Take over: the controller stops and the output is written once
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_MANUAL_OUTPUT,
+        {ATTR_VALUE: 30, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(output_par).state == "30.0"
+
+    # Not a number: refused
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_MANUAL_OUTPUT,
+            {ATTR_VALUE: "nan", ATTR_ENTITY_ID: pid},
+            blocking=True,
+        )
+
+    # Back to automatic: the output continues from 30 instead of jumping to 40
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(output_par).state == "30.0"
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_split_range(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+) -> None:
+    """Test one controller output split over a cooling and a heating valve."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    cooling_par = "input_number.cooling"
+    heating_par = "input_number.heating"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01  # Cycle time in seconds
+
+    hass.states.async_set(input_par, "10.0")
+    valve = {"min": 0, "max": 100, "step": 1, "initial": 0}
+    assert await async_setup_component(
+        hass,
+        "input_number",
+        {
+            "input_number": {
+                "output": {"min": -100, "max": 100, "step": 0.5, "initial": 0},
+                "cooling": valve,
+                "heating": valve,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+            CONF_SPLIT_RANGE: [
+                {CONF_OUTPUT: cooling_par, "start": -100, "end": 0, "reverse": True},
+                {CONF_OUTPUT: heating_par, "start": 0, "end": 100},
+            ],
+        }
+    }
+    assert await async_setup_component(hass, Platform.NUMBER, config)
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 20, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 3)
+    # Output 10: heating at 10 % of its range, cooling closed
+    assert hass.states.get(output_par).state == "10.0"
+    assert hass.states.get(heating_par).state == "10.0"
+    assert hass.states.get(cooling_par).state == "0.0"
+
+    # Too warm, output -20: heating closed, cooling opens
+    hass.states.async_set(input_par, "40.0")
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(heating_par).state == "0.0"
+    assert hass.states.get(cooling_par).state == "20.0"
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_adaptive_cycle(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+) -> None:
+    """Test that the cycle slows down when settled and speeds up on a new setpoint."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    min_cycle_time = 0.01
+    max_cycle_time = 0.05
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_MIN_CYCLE_TIME: {"seconds": min_cycle_time},
+            CONF_MAX_CYCLE_TIME: {"seconds": max_cycle_time},
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 10, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    # No error: the period grows to the maximum
+    await asyncio.sleep(max_cycle_time * 10)
+    assert hass.states.get(pid).attributes[ATTR_CYCLE_PERIOD] == max_cycle_time
+
+    # A setpoint step: back to the minimum period
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 20, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(min_cycle_time * 3)
+    assert hass.states.get(pid).attributes[ATTR_CYCLE_PERIOD] == min_cycle_time
+    assert hass.states.get(output_par).state == "10.0"
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_saturation_watchdog(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+) -> None:
+    """Test that a loop pinned at an output limit raises a repair issue."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01
+    saturation_timeout = 0.05
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+            CONF_SATURATION_TIMEOUT: {"seconds": saturation_timeout},
+            CONF_MAXIMUM: 1000,
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 0.0, 0.0)
+    events = []
+    hass.bus.async_listen(EVENT_HEALTH, events.append)
+    issue_id = f"{PROBLEM_SATURATED}_{pid}"
+
+    # The output of 500 is clipped at the maximum of the output of 100
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 500, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(saturation_timeout * 3)
+    assert hass.states.get(pid).attributes[ATTR_PROBLEMS] == [PROBLEM_SATURATED]
+    assert ir.async_get(hass).async_get_issue(DOMAIN, issue_id) is not None
+    assert [event.data["active"] for event in events] == [True]
+
+    # Back within the output range: the issue is cleared
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 50, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 5)
+    assert hass.states.get(pid).attributes[ATTR_PROBLEMS] == []
+    assert ir.async_get(hass).async_get_issue(DOMAIN, issue_id) is None
+    assert [event.data["active"] for event in events] == [True, False]
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_actuator_wear(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+) -> None:
+    """Test that small moves are held back and the wear shows in sensors."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+            CONF_MIN_MOVE: 5,
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 0.0, 0.0)
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 30, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 5)
+    assert hass.states.get(output_par).state == "30.0"
+
+    # A move of 1 is smaller than the minimum move
+    hass.states.async_set(input_par, "1.0")
+    await asyncio.sleep(cycle_time * 5)
+    assert hass.states.get(output_par).state == "30.0"
+
+    hass.states.async_set(input_par, "20.0")
+    await asyncio.sleep(cycle_time * 5)
+    assert hass.states.get(output_par).state == "10.0"
+    assert float(hass.states.get("sensor.pid_travel").state) == 30 + 20
+    assert hass.states.get("sensor.pid_reversals").state == "1"
+    assert hass.states.get("sensor.pid_writes_per_hour").state == "2"
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_set_preset(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+) -> None:
+    """Test switching presets by service and by the preset select."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    select = f"{Platform.SELECT}.pid_preset"
+    cycle_time = 0.01
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+            CONF_PRESETS: {
+                "comfort": {CONF_SETPOINT: 30, CONF_PID_KP: 2},
+                "eco": {CONF_SETPOINT: 20, CONF_MAXIMUM: 25},
+            },
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_PRESET,
+        {ATTR_PRESET: "comfort", ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 5)
+    state = hass.states.get(pid)
+    assert state.state == "30.0"
+    assert state.attributes[ATTR_PRESET] == "comfort"
+    # Kp=2 and the error is 20
+    assert hass.states.get(output_par).state == "40.0"
+    assert hass.states.get(select).state == "comfort"
+
+    await hass.services.async_call(
+        Platform.SELECT,
+        SERVICE_SELECT_OPTION,
+        {ATTR_OPTION: "eco", ATTR_ENTITY_ID: select},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 5)
+    state = hass.states.get(pid)
+    assert state.state == "20.0"
+    assert state.attributes["max"] == 25  # noqa: PLR2004
+    assert hass.states.get(select).state == "eco"
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_PRESET,
+            {ATTR_PRESET: "away", ATTR_ENTITY_ID: pid},
+            blocking=True,
+        )
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_preset_restores_configuration(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+) -> None:
+    """Test that limits and gains of a preset end with the next preset."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_MAXIMUM: 30,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+            CONF_PRESETS: {
+                "comfort": {CONF_SETPOINT: 21},
+                "away": {CONF_SETPOINT: 15, CONF_MAXIMUM: 16, CONF_PID_KP: 2},
+            },
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    for preset in ("away", "comfort"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_PRESET,
+            {ATTR_PRESET: preset, ATTR_ENTITY_ID: pid},
+            blocking=True,
+        )
+    await asyncio.sleep(cycle_time * 5)
+    state = hass.states.get(pid)
+    assert state.state == "21.0"
+    assert state.attributes["max"] == 30  # noqa: PLR2004
+    # The configured Kp=1 again, and the error is 11
+    assert hass.states.get(output_par).state == "11.0"
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+@pytest.mark.parametrize("policy", [OVERRUN_SKIP, OVERRUN_QUEUE_LATEST, OVERRUN_RUN])
+async def test_cycle_overrun(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+    policy: str,
+) -> None:
+    """Test that cycles never overlap, even when the output is slower."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01
+    # Number of writes running at the start of every write
+    concurrent = []
+    running = []
+
+    async def _slow_write(_adapter: object, value: float) -> None:
+        running.append(value)
+        concurrent.append(len(running))
+        await asyncio.sleep(cycle_time * 3)
+        running.remove(value)
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 0,
+            CONF_PID_KI: 10,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+            CONF_OVERRUN_POLICY: policy,
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 0.0, 0.0)
+    with patch(
+        "custom_components.pid_controller.output.InputNumberOutputAdapter"
+        ".async_set_value",
+        _slow_write,
+    ):
+        await hass.services.async_call(
+            Platform.NUMBER,
+            SERVICE_SET_VALUE,
+            {ATTR_VALUE: 10, ATTR_ENTITY_ID: pid},
+            blocking=True,
+        )
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_TURN_ON,
+            {ATTR_ENTITY_ID: pid},
+            blocking=True,
+        )
+        await asyncio.sleep(cycle_time * 20)
+        # The service call waits for the running cycle
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_TURN_OFF,
+            {ATTR_ENTITY_ID: pid},
+            blocking=True,
+        )
+    attributes = hass.states.get(pid).attributes
+    assert concurrent
+    assert max(concurrent) == 1
+    assert attributes[ATTR_OVERRUNS] > 0
+    if policy == OVERRUN_RUN:
+        assert attributes[ATTR_SKIPPED_CYCLES] == 0
+    elif policy == OVERRUN_SKIP:
+        assert attributes[ATTR_SKIPPED_CYCLES] == attributes[ATTR_OVERRUNS]
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_set_kp(hass: HomeAssistant, setup_comp: None) -> None:  # noqa: ARG001
+    """Test changing a gain while the controller runs."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01  # Cycle time in seconds
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 20, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        "pid_controller",
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_KP,
+        {ATTR_VALUE: 2, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    await asyncio.sleep(cycle_time * 3)
+    # Kp=2 and the error is 10
+    assert hass.states.get(output_par).state == "20.0"
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_set_kp_bumpless(
+    hass: HomeAssistant,
+    setup_comp: None,  # noqa: ARG001
+) -> None:
+    """Test that a new gain does not bump the output with integral action."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pid = f"{Platform.NUMBER}.pid"
+    cycle_time = 0.01
+
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: input_par,
+            CONF_OUTPUT: output_par,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0.001,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": cycle_time},
+        }
+    }
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 20, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    # The start is bumpless: the output stays where it was
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(output_par).state == "0.0"
+
+    # Without bumpless gains the output would jump by 10 to 10.0
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_KP,
+        {ATTR_VALUE: 2, ATTR_ENTITY_ID: pid},
+        blocking=True,
+    )
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(output_par).state == "0.0"
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
+async def test_bulk_update(hass: HomeAssistant, setup_comp: None) -> None:  # noqa: ARG001
+    """Test updating several controllers with one service call."""
+    input_par = "sensor.input1"
+    output_par = "input_number.output"
+    pids = [f"{Platform.NUMBER}.pid_1", f"{Platform.NUMBER}.pid_2"]
+    cycle_time = 0.01  # Cycle time in seconds
+
+    config = {
+        Platform.NUMBER: [
+            {
+                CONF_PLATFORM: DOMAIN,
+                CONF_NAME: name,
+                CONF_INPUT1: input_par,
+                CONF_OUTPUT: output_par,
+                CONF_PID_KP: 1,
+                CONF_PID_KI: 0,
+                CONF_PID_KD: 0,
+                CONF_CYCLE_TIME: {"seconds": cycle_time},
+            }
+            for name in ("pid_1", "pid_2")
+        ]
+    }
+    await _setup_controller(hass, config, input_par, output_par, 10.0, 0.0)
+
+    # A setpoint out of range for any target is refused for all of them
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BULK_UPDATE,
+            {ATTR_ENTITY_ID: pids, ATTR_VALUE: 500, CONF_PID_KP: 2},
+            blocking=True,
+        )
+    assert [hass.states.get(pid).state for pid in pids] == ["0.0", "0.0"]
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_UPDATE,
+        {ATTR_ENTITY_ID: "all", ATTR_VALUE: 15, CONF_PID_KP: 2, ATTR_ENABLE: True},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert [hass.states.get(pid).state for pid in pids] == ["15.0", "15.0"]
+    await asyncio.sleep(cycle_time * 3)
+    # Kp=2 and the error is 5
+    assert hass.states.get(output_par).state == "10.0"
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_UPDATE,
+        {ATTR_ENTITY_ID: pids, ATTR_ENABLE: False},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    # Unknown controllers and inputs without a value refuse the whole update
+    with pytest.raises(ServiceValidationError, match=re.escape(input_par)):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BULK_UPDATE,
+            {ATTR_ENTITY_ID: [*pids, input_par], ATTR_VALUE: 12},
+            blocking=True,
+        )
+    hass.states.async_set(input_par, STATE_UNAVAILABLE)
+    with pytest.raises(ServiceValidationError, match=re.escape(input_par)):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BULK_UPDATE,
+            {ATTR_ENTITY_ID: pids, ATTR_VALUE: 12, ATTR_ENABLE: True},
+            blocking=True,
+        )
+    assert [hass.states.get(pid).state for pid in pids] == ["15.0", "15.0"]
+    # Turning off needs no input
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BULK_UPDATE,
+        {ATTR_ENTITY_ID: pids, ATTR_ENABLE: False},
+        blocking=True,
+    )
+    hass.states.async_set(output_par, 0.0)
+    await asyncio.sleep(cycle_time * 3)
+    assert hass.states.get(output_par).state == "0.0"
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
+
+
 # Reload currently does not work!
 #
 # async def test_reload(hass: HomeAssistant, setup_comp) -> None:
@@ -0,0 +1,183 @@
+"""Test the output adapters of the pid_controller."""
+
+import math
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from dvg_pid_controller import Constants as PIDConst
+from dvg_pid_controller import PID_Controller
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+
+from custom_components.pid_controller.output import (
+    InputNumberOutputAdapter,
+    OutputAdapter,
+    OutputChannel,
+    OutputQuantizer,
+    SplitRange,
+    create_output_adapter,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+OUTPUT = "input_number.output"
+VALUE = 42.5
+
+
+@pytest.fixture(name="setup_output")
+async def _fixture_setup_output(hass: HomeAssistant) -> None:
+    """Set up an input_number to write to."""
+    assert await async_setup_component(
+        hass,
+        "input_number",
+        {"input_number": {"output": {"min": 0, "max": 100, "step": 0.5}}},
+    )
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize(
+    ("direct", "adapter"), [(True, InputNumberOutputAdapter), (False, OutputAdapter)]
+)
+async def test_write(
+    hass: HomeAssistant,
+    setup_output: None,  # noqa: ARG001
+    direct: bool,  # noqa: FBT001
+    adapter: type[OutputAdapter],
+) -> None:
+    """Test that both the direct and the service path write the output."""
+    output = create_output_adapter(hass, OUTPUT, "input_number", direct=direct)
+    assert type(output) is adapter
+
+    await output.async_set_value(VALUE)
+    await hass.async_block_till_done()
+    assert float(hass.states.get(OUTPUT).state) == VALUE
+
+
+async def test_unknown_domain(hass: HomeAssistant) -> None:
+    """Test that domains without a direct adapter use the service path."""
+    output = create_output_adapter(hass, "climate.boiler", "climate")
+    assert type(output) is OutputAdapter
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (12.3, 12.3),
+        (12.34, 12.3),
+        (0.1 + 0.2, 0.3),
+        (-5.0, 0.0),
+        (150.0, 100.0),
+    ],
+)
+def test_quantize(value: float, expected: float) -> None:
+    """Test that values are snapped to the step grid without float noise."""
+    quantizer = OutputQuantizer(0.0, 100.0, 0.1)
+    assert quantizer.quantize(value) == expected
+    assert repr(quantizer.quantize(value)) == repr(expected)
+
+
+@pytest.mark.parametrize("value", [math.nan, math.inf])
+def test_quantize_not_finite(value: float) -> None:
+    """Test that values that are not a number are refused."""
+    with pytest.raises(ValueError, match="not a finite number"):
+        OutputQuantizer(0.0, 100.0, 0.1).quantize(value)
+
+
+def test_quantize_regulator_output() -> None:
+    """Test that the numpy scalar computed by the regulator is quantized."""
+    pid = PID_Controller(1.0, 0.0, 0.0)
+    pid.set_output_limits(0.0, 100.0)
+    pid.setpoint = VALUE
+    pid.set_mode(PIDConst.AUTOMATIC, 0.0, 0.0)
+    assert pid.compute(0.0)
+    assert isinstance(pid.output, np.float64)
+    assert OutputQuantizer(0.0, 100.0, 0.5).quantize(pid.output) == VALUE
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(-10.0, 100.0), (0.0, 100.0), (25.0, 50.0), (50.0, 0.0), (80.0, 0.0)],
+)
+def test_split_range_reversed(value: float, expected: float) -> None:
+    """Test that the lower half of the controller output drives a reversed valve."""
+    split = SplitRange(0.0, 50.0, reverse=True)
+    assert split.scale(value, 0.0, 100.0) == pytest.approx(expected)
+
+
+async def test_channel_pending(
+    hass: HomeAssistant,
+    setup_output: None,  # noqa: ARG001
+) -> None:
+    """Test that a write is pending until the entity reports it back."""
+    channel = OutputChannel(OUTPUT, direct=False)
+    channel.bind(hass, hass.states.get(OUTPUT))
+    channel.track(hass.states.get(OUTPUT))
+
+    await channel.async_write(VALUE)
+    assert channel.pending_since is not None
+    await hass.async_block_till_done()
+    channel.track(hass.states.get(OUTPUT))
+    assert channel.pending_since is None
+
+    # The entity already reports the value: nothing to wait for
+    channel.value = None
+    await channel.async_write(VALUE)
+    assert channel.pending_since is None
+
+
+async def test_channel_publish(
+    hass: HomeAssistant,
+    setup_output: None,  # noqa: ARG001
+) -> None:
+    """Test that published values are quantized and the entity is a mirror."""
+    channel = OutputChannel(OUTPUT, direct=True)
+    channel.bind(hass, hass.states.get(OUTPUT))
+    channel.track(hass.states.get(OUTPUT))
+    published: list[float] = []
+
+    async def _publish(value: float) -> None:
+        published.append(value)
+
+    channel.publish = _publish
+    await channel.async_write(VALUE + 0.2, mirror=False)
+    await channel.async_write(VALUE, mirror=False)
+    # Rounded to the step of the entity, and the same value is sent once
+    assert published == [VALUE]
+    assert float(hass.states.get(OUTPUT).state) != VALUE
+
+    # The entity lags behind the published value: not a change by others
+    channel.track(hass.states.get(OUTPUT))
+    await channel.async_write(VALUE, mirror=True)
+    await hass.async_block_till_done()
+    assert published == [VALUE]
+    assert float(hass.states.get(OUTPUT).state) == VALUE
+
+
+async def test_channel_failed_write(
+    hass: HomeAssistant,
+    setup_output: None,  # noqa: ARG001
+) -> None:
+    """Test that a value that failed to write is sent again."""
+    channel = OutputChannel(OUTPUT, direct=True)
+    channel.bind(hass, hass.states.get(OUTPUT))
+    channel.track(hass.states.get(OUTPUT))
+    written: list[float] = []
+
+    async def _fail(_value: float) -> None:
+        raise HomeAssistantError
+
+    async def _write(value: float) -> None:
+        written.append(value)
+
+    channel.adapter = Mock(async_set_value=_fail)
+    with pytest.raises(HomeAssistantError):
+        await channel.async_write(VALUE)
+    assert channel.value is None
+    assert channel.wear.travel == 0
+
+    channel.adapter = Mock(async_set_value=_write)
+    await channel.async_write(VALUE)
+    assert written == [VALUE]
@@ -0,0 +1,46 @@
+"""Test the presets of the pid_controller."""
+
+import pytest
+import voluptuous as vol
+from homeassistant.const import CONF_MAXIMUM, CONF_MINIMUM
+
+from custom_components.pid_controller.const import CONF_SETPOINT
+from custom_components.pid_controller.pid_shared.const import CONF_PID_KI
+from custom_components.pid_controller.preset import Preset, parse_presets
+
+
+def test_parse_presets() -> None:
+    """Test that a preset holds only what it sets."""
+    presets = parse_presets(
+        {
+            "comfort": {CONF_SETPOINT: "21"},
+            "eco": {CONF_SETPOINT: 18, CONF_PID_KI: 0.5, CONF_MAXIMUM: 19},
+        }
+    )
+    assert presets["comfort"] == Preset(setpoint=21.0)
+    assert presets["eco"] == Preset(setpoint=18.0, ki=0.5, maximum=19.0)
+    assert parse_presets(None) == {}
+
+
+def test_preset_over_configuration() -> None:
+    """Test that what a preset does not set is taken from the configuration."""
+    configured = Preset(kp=1.0, ki=0.1, kd=0.0, minimum=0.0, maximum=30.0)
+    preset = Preset(setpoint=15.0, kp=2.0, maximum=16.0)
+    assert preset.over(configured) == Preset(15.0, 2.0, 0.1, 0.0, 0.0, 16.0)
+    assert Preset(setpoint=21.0).over(configured) == Preset(
+        21.0, 1.0, 0.1, 0.0, 0.0, 30.0
+    )
+
+
+@pytest.mark.parametrize(
+    "preset",
+    [
+        {},
+        {CONF_PID_KI: -1},
+        {CONF_MINIMUM: 20, CONF_MAXIMUM: 10},
+    ],
+)
+def test_invalid_preset(preset: dict) -> None:
+    """Test that empty presets, negative gains and empty limits are refused."""
+    with pytest.raises(vol.Invalid):
+        parse_presets({"away": preset})
@@ -0,0 +1,42 @@
+"""Test the cycle trace of the pid_controller."""
+
+import math
+
+import pytest
+
+from custom_components.pid_controller.trace import COLUMNS, CycleTrace
+
+LENGTH = 3
+CYCLES = 5
+
+
+def test_rows_oldest_first() -> None:
+    """Test that the trace keeps the last cycles, oldest first."""
+    trace = CycleTrace(LENGTH)
+    assert trace.rows() == []
+    for cycle in range(CYCLES):
+        trace.record(cycle, 1.0 + cycle, 20.0, math.nan, 21.0, cycle * 10.0)
+    rows = trace.rows()
+    assert [row["time"] for row in rows] == [2.0, 3.0, 4.0]
+    assert set(rows[0]) == set(COLUMNS)
+    # An input not configured is None
+    assert rows[-1]["input2"] is None
+    assert rows[-1]["output"] == pytest.approx(40.0)
+
+
+def test_statistics() -> None:
+    """Test the statistics of the cycle durations and intervals."""
+    trace = CycleTrace(LENGTH)
+    assert trace.statistics()["duration_mean"] is None
+    assert trace.statistics()["interval_min"] is None
+    for cycle in range(CYCLES):
+        trace.record(cycle, 1.0 + cycle, 20.0, 0.0, 21.0, 0.0)
+        trace.time_cycle(0.01 * (cycle + 1))
+    statistics = trace.statistics()
+    assert statistics["cycles"] == CYCLES
+    assert statistics["duration_mean"] == pytest.approx(0.03)
+    assert statistics["duration_max"] == pytest.approx(0.05)
+    # The intervals of all cycles, not only those kept
+    assert statistics["interval_mean"] == pytest.approx(3.0)
+    assert statistics["interval_min"] == pytest.approx(1.0)
+    assert statistics["interval_max"] == pytest.approx(5.0)
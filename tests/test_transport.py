@@ -0,0 +1,119 @@
+"""Test the MQTT fast path of the pid_controller."""
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from homeassistant.components.number import ATTR_VALUE, SERVICE_SET_VALUE
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CONF_NAME,
+    CONF_PLATFORM,
+    SERVICE_TURN_ON,
+    Platform,
+)
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+
+from custom_components.pid_controller.const import (
+    CONF_INPUT1,
+    CONF_INPUT1_TOPIC,
+    CONF_MAX_AGE,
+    CONF_MIRROR_INTERVAL,
+    CONF_MQTT,
+    CONF_OUTPUT,
+    CONF_OUTPUT_TOPIC,
+    DOMAIN,
+)
+from custom_components.pid_controller.pid_shared.const import (
+    CONF_CYCLE_TIME,
+    CONF_PID_KD,
+    CONF_PID_KI,
+    CONF_PID_KP,
+)
+from custom_components.pid_controller.transport import MirrorRate
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+INPUT = "sensor.boiler_temperature"
+OUTPUT = "input_number.output"
+PID = f"{Platform.NUMBER}.pid"
+INPUT_TOPIC = "boiler/temperature"
+OUTPUT_TOPIC = "boiler/valve/set"
+CYCLE_TIME = 0.01
+QOS = 0
+RETAIN = False
+
+
+def test_mirror_rate() -> None:
+    """Test that the mirror is due once per interval."""
+    mirror = MirrorRate(10.0)
+    assert mirror.due(0.0)
+    assert not mirror.due(5.0)
+    assert mirror.due(10.0)
+    assert not mirror.due(19.0)
+
+
+async def test_mqtt_fast_path(hass: HomeAssistant, mqtt_mock: MqttMockHAClient) -> None:
+    """Test that inputs and output go over MQTT, the entities only mirrored."""
+    assert await async_setup_component(hass, "homeassistant", {})
+    hass.states.async_set(INPUT, "0.0")
+    assert await async_setup_component(
+        hass,
+        "input_number",
+        {"input_number": {"output": {"min": 0, "max": 100, "step": 0.5}}},
+    )
+    config = {
+        Platform.NUMBER: {
+            CONF_PLATFORM: DOMAIN,
+            CONF_NAME: "pid",
+            CONF_INPUT1: INPUT,
+            CONF_OUTPUT: OUTPUT,
+            CONF_PID_KP: 1,
+            CONF_PID_KI: 0,
+            CONF_PID_KD: 0,
+            CONF_CYCLE_TIME: {"seconds": CYCLE_TIME},
+            CONF_MQTT: {
+                CONF_INPUT1_TOPIC: INPUT_TOPIC,
+                CONF_OUTPUT_TOPIC: OUTPUT_TOPIC,
+                CONF_MIRROR_INTERVAL: {"hours": 1},
+                CONF_MAX_AGE: {"seconds": CYCLE_TIME * 10},
+            },
+        }
+    }
+    assert await async_setup_component(hass, Platform.NUMBER, config)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        Platform.NUMBER,
+        SERVICE_SET_VALUE,
+        {ATTR_VALUE: 30, ATTR_ENTITY_ID: PID},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: PID},
+        blocking=True,
+    )
+    # Nothing received on the topic yet: the state of the sensor is used
+    await asyncio.sleep(CYCLE_TIME * 3)
+    mqtt_mock.async_publish.assert_called_with(OUTPUT_TOPIC, "30.0", QOS, RETAIN)
+    assert hass.states.get(OUTPUT).state == "30.0"
+
+    async_fire_mqtt_message(hass, INPUT_TOPIC, "20")
+    await asyncio.sleep(CYCLE_TIME * 3)
+    mqtt_mock.async_publish.assert_called_with(OUTPUT_TOPIC, "10.0", QOS, RETAIN)
+    # The output entity is not mirrored again within the interval
+    assert hass.states.get(OUTPUT).state == "30.0"
+
+    # The topic went silent: past the max age the sensor is used again
+    await asyncio.sleep(CYCLE_TIME * 15)
+    mqtt_mock.async_publish.assert_called_with(OUTPUT_TOPIC, "30.0", QOS, RETAIN)
+    await hass.services.async_call(
+        "homeassistant",
+        "stop",
+        None,
+        blocking=True,
+    )
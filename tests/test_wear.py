@@ -0,0 +1,67 @@
+"""Test the actuator wear accounting of the pid_controller."""
+
+import pytest
+
+from custom_components.pid_controller.wear import ActuatorWear
+
+MINIMUM = 0.0
+MAXIMUM = 100.0
+MIN_MOVE = 2.0
+HYSTERESIS = 5.0
+HOUR = 3600.0
+MINUTE = 60.0
+# Up, down and up again
+REVERSALS = 2
+
+
+def test_travel_and_reversals() -> None:
+    """Test that travel and reversals are counted from the first position."""
+    wear = ActuatorWear()
+    values = (10.0, 20.0, 30.0, 25.0, 25.0, 40.0)
+    for now, value in enumerate(values):
+        wear.record(value, now)
+    # 10 -> 30 -> 25 -> 40, the first write only sets the position
+    assert wear.travel == pytest.approx(20.0 + 5.0 + 15.0)
+    assert wear.reversals == REVERSALS
+    assert wear.writes == len(values)
+
+
+def test_writes_per_hour() -> None:
+    """Test that writes count for one hour, one write per minute here."""
+    wear = ActuatorWear()
+    last = 89 * MINUTE
+    for minute in range(90):
+        wear.record(float(minute), minute * MINUTE)
+    assert wear.writes_per_hour(last) == HOUR / MINUTE
+    assert wear.writes_per_hour(last + HOUR / 2) == HOUR / MINUTE / 2
+    assert wear.writes_per_hour(last + 2 * HOUR) == 0
+
+
+def test_all_moves_admitted_by_default() -> None:
+    """Test that without wear-minimizing mode every move goes through."""
+    wear = ActuatorWear()
+    wear.record(50.0, 0.0)
+    assert wear.admit(50.1, MINIMUM, MAXIMUM)
+
+
+def test_min_move() -> None:
+    """Test that small moves are held back, except to a limit."""
+    wear = ActuatorWear(min_move=MIN_MOVE)
+    assert wear.admit(1.0, MINIMUM, MAXIMUM)
+    wear.record(1.0, 0.0)
+    assert not wear.admit(2.0, MINIMUM, MAXIMUM)
+    assert wear.admit(3.0, MINIMUM, MAXIMUM)
+    # Closing fully always goes
+    assert wear.admit(MINIMUM, MINIMUM, MAXIMUM)
+
+
+def test_reversal_hysteresis() -> None:
+    """Test that a reversal must be larger than the hysteresis."""
+    wear = ActuatorWear(hysteresis=HYSTERESIS)
+    wear.record(40.0, 0.0)
+    wear.record(50.0, 1.0)
+    # Onwards in the same direction: any move
+    assert wear.admit(51.0, MINIMUM, MAXIMUM)
+    # Back: only beyond the hysteresis
+    assert not wear.admit(47.0, MINIMUM, MAXIMUM)
+    assert wear.admit(45.0, MINIMUM, MAXIMUM)